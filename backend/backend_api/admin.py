@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Person, Item, Receipt
+from .models import CategoryGroup, Person, Item, Receipt
+from .services import category_groups, response_cache
 
 
 @admin.register(Person)
@@ -15,6 +16,12 @@ class ItemAdmin(admin.ModelAdmin):
     search_fields = ("description",)  # Wyszukiwanie po opisie
     list_filter = ("category",)  # Filtracja po kategorii
     filter_horizontal = ("owners",)  # Interfejs do zarządzania relacją ManyToMany
+    raw_id_fields = ("receipt",)  # Paragon wybierany po id (bez listy wszystkich)
+
+
+class ItemInline(admin.TabularInline):
+    model = Item
+    extra = 0  # Pozycje paragonu edytowane bezpośrednio w jego widoku
 
 
 @admin.register(Receipt)
@@ -34,4 +41,29 @@ class ReceiptAdmin(admin.ModelAdmin):
         "transaction_type",
         "payment_date",
     )  # Filtry po typie transakcji i dacie
-    filter_horizontal = ("items",)  # Interfejs do zarządzania relacją ManyToMany
+    inlines = [ItemInline]  # Pozycje przez klucz obcy Item.receipt
+
+
+@admin.register(CategoryGroup)
+class CategoryGroupAdmin(admin.ModelAdmin):
+    list_display = ("group_set", "name", "category", "position")
+    list_filter = ("group_set", "name")
+    list_editable = ("position",)
+
+    # grupy są cache'owane w procesie, a odpowiedzi analityk w cache'u –
+    # po zmianie czyścimy jedno i drugie
+    def _changed(self):
+        category_groups.invalidate()
+        response_cache.get_cache().clear()
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self._changed()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self._changed()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        self._changed()
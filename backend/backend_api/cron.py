@@ -1,5 +1,6 @@
 import yfinance as yf
 from .models import Instrument
+from .services import item_gc
 
 
 def update_instruments_prices():
@@ -10,3 +11,8 @@ def update_instruments_prices():
         if price is not None:
             instrument.current_price = price
             instrument.save()
+
+
+def collect_orphan_items():
+    # partiami, żeby nocny job nie blokował bazy przy dużych zaległościach
+    item_gc.collect_orphans(max_batches=20)
@@ -1,5 +1,12 @@
+from datetime import date
+
 from django_filters import rest_framework as filters
 from .models import Item, Receipt
+from .services import owner_mask, periods
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
 
 
 class ItemFilter(filters.FilterSet):
@@ -13,7 +20,7 @@ class ItemFilter(filters.FilterSet):
 class ReceiptFilter(filters.FilterSet):
     # owners = filters.CharFilter(field_name="items__owner", lookup_expr="exact")
     id = filters.NumberFilter(field_name="id", lookup_expr="exact")
-    owners = filters.BaseInFilter(field_name="items__owners__id", lookup_expr="in")
+    owners = NumberInFilter(method="filter_owners")
     payer = filters.CharFilter(field_name="payer", lookup_expr="exact")
     shop = filters.CharFilter(field_name="shop", lookup_expr="icontains")
     day = filters.NumberFilter(field_name="payment_date", lookup_expr="day")
@@ -27,6 +34,31 @@ class ReceiptFilter(filters.FilterSet):
     )
     category = filters.BaseInFilter(field_name="items__category", lookup_expr="in")
 
+    def filter_queryset(self, queryset):
+        # year/month/day → półotwarty zakres po payment_date zamiast
+        # wyciągania części daty z kolumny (które omija indeks)
+        data = self.form.cleaned_data
+        year, month, day = (data.get(key) for key in ("year", "month", "day"))
+        if year is not None:
+            try:
+                if month is not None and day is not None:
+                    day_start = date(int(year), int(month), int(day))
+                    period = periods.custom(day_start, day_start)
+                    data["day"] = None
+                elif month is not None:
+                    period = periods.monthly(int(year), int(month))
+                else:
+                    period = periods.yearly(int(year))
+            except (ValueError, OverflowError):
+                return queryset.none()
+            queryset = queryset.filter(period.q())
+            data["year"] = data["month"] = None
+        return super().filter_queryset(queryset)
+
+    def filter_owners(self, queryset, name, value):
+        # EXISTS po masce ownerów zamiast joinu przez Item.owners
+        return owner_mask.receipts_with_owner(queryset, [int(v) for v in value])
+
     class Meta:
         model = Receipt
         fields = [
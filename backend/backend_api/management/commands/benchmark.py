@@ -0,0 +1,79 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend_api.services import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Mierzy endpointy API (p50/p95, liczba zapytań, szczyt pamięci) "
+        "i porównuje z baseline JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Pomiary czasu na endpoint."
+        )
+        parser.add_argument(
+            "--only", nargs="*", default=None, help="Nazwy tras do zmierzenia."
+        )
+        parser.add_argument(
+            "--with-cache",
+            action="store_true",
+            help="Nie wyłączaj cache odpowiedzi analityk.",
+        )
+        parser.add_argument("--output", help="Zapisz wynik jako JSON (baseline).")
+        parser.add_argument("--baseline", help="Porównaj z wcześniejszym wynikiem.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Dopuszczalny wzrost p95 i pamięci (ułamek, domyślnie 0.2).",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Zakończ błędem, gdy porównanie wykryje regresję.",
+        )
+
+    def handle(self, *args, **options):
+        result = benchmark.run(
+            repeat=options["repeat"],
+            only=options["only"],
+            with_cache=options["with_cache"],
+        )
+
+        self.stdout.write(
+            f"{'endpoint':<28}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'queries':>9}{'peak KiB':>10}"
+        )
+        for name, row in result["endpoints"].items():
+            self.stdout.write(
+                f"{name:<28}{row['status']:>7}{row['p50_ms']:>10.2f}"
+                f"{row['p95_ms']:>10.2f}{row['queries']:>9}{row['peak_kib']:>10.1f}"
+            )
+        for name, reason in result["skipped"].items():
+            self.stdout.write(f"{name:<28} pominięto: {reason}")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            self.stdout.write(f"Zapisano {options['output']}")
+
+        if not options["baseline"]:
+            return
+        with open(options["baseline"], encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = benchmark.compare(baseline, result, options["tolerance"])
+        for r in regressions:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"REGRESJA {r['endpoint']} {r['metric']}: "
+                    f"{r['baseline']} → {r['current']}"
+                )
+            )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("Brak regresji względem baseline."))
+        elif options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} regresji względem baseline")
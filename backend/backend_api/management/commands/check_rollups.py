@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from backend_api.services import prefix_sums, rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Porównuje rollupy miesięczne z surowymi tabelami Receipt/Item "
+        "i sumy narastające z ledgerem udziałów."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Ile rozbieżności wypisać."
+        )
+
+    def handle(self, *args, **options):
+        mismatches = rollup.diff_against_raw()
+        prefix_mismatches = prefix_sums.diff_against_ledger()
+        if not mismatches and not prefix_mismatches:
+            self.stdout.write(self.style.SUCCESS("Rollupy są spójne."))
+            return
+
+        for row in mismatches[: options["limit"]]:
+            self.stdout.write(
+                "owner={owner_id} {year}-{month:02d} {category}/{transaction_type}: "
+                "oczekiwano {expected}, jest {actual}".format(**row)
+            )
+        for row in prefix_mismatches[: options["limit"]]:
+            self.stdout.write(
+                "owner={owner_id} {day} narastająco: "
+                "oczekiwano {expected}, jest {actual}".format(**row)
+            )
+        total = len(mismatches) + len(prefix_mismatches)
+        raise CommandError(f"Znaleziono {total} rozbieżności.")
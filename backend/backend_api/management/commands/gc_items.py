@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from backend_api.services import item_gc
+
+
+class Command(BaseCommand):
+    help = "Usuwa pozycje (Item) bez paragonu i raportuje pozycje bez właścicieli."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=item_gc.GC_BATCH_SIZE,
+            help="Ile pozycji usuwać w jednej transakcji.",
+        )
+        parser.add_argument(
+            "--max-batches", type=int, default=None, help="Limit liczby partii."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Tylko raport, bez usuwania."
+        )
+        parser.add_argument(
+            "--sample", type=int, default=20, help="Ile przykładowych id wypisać."
+        )
+
+    def handle(self, *args, **options):
+        for name, data in item_gc.report(sample=options["sample"]).items():
+            self.stdout.write(f"{name}: {data['count']} {data['sample']}")
+
+        if options["dry_run"]:
+            return
+        batches = item_gc.collect_orphans(
+            batch_size=options["batch_size"], max_batches=options["max_batches"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Usunięto {sum(batches)} sierot w {len(batches)} partiach."
+            )
+        )
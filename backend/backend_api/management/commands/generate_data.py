@@ -0,0 +1,49 @@
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand
+
+from backend_api.services import synthetic
+
+HELP = {
+    "years": "Ile lat danych wygenerować.",
+    "owners": "Liczba osób (każda jest płatnikiem i ownerem).",
+    "receipts_per_month": "Paragony na osobę w miesiącu.",
+    "items_per_receipt": "Pozycje na paragon wydatku.",
+    "invests_per_month": "Operacje inwestycyjne w miesiącu.",
+    "start_year": "Pierwszy rok danych.",
+    "seed": "Ziarno generatora – ten sam seed daje te same dane.",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generuje deterministyczne dane syntetyczne (osoby, paragony, pozycje, "
+        "inwestycje) do benchmarków."
+    )
+
+    def add_arguments(self, parser):
+        for field in fields(synthetic.Volume):
+            parser.add_argument(
+                "--" + field.name.replace("_", "-"),
+                type=int,
+                default=field.default,
+                help=HELP[field.name],
+            )
+
+    def handle(self, *args, **options):
+        volume = synthetic.Volume(
+            **{field.name: options[field.name] for field in fields(synthetic.Volume)}
+        )
+        self.stdout.write(
+            f"Generuję {volume.receipts} paragonów / ~{volume.items} pozycji "
+            f"(seed={volume.seed})..."
+        )
+
+        def progress(year, month, counts):
+            if month == 12 and options["verbosity"] >= 1:
+                self.stdout.write(f"  {year}: {counts['receipts']} paragonów")
+
+        counts = synthetic.generate(volume, progress=progress)
+        self.stdout.write(
+            self.style.SUCCESS(", ".join(f"{k}: {v}" for k, v in counts.items()))
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend_api.services import ledger, owner_mask, prefix_sums, rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Przebudowuje od zera rollupy miesięczne i sumy narastające "
+        "(opcjonalnie także ledger udziałów)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--with-shares",
+            action="store_true",
+            help="Najpierw przebuduj maski ownerów i ledger ItemShare z surowych tabel.",
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        if options["with_shares"]:
+            masks = owner_mask.refresh_all()
+            self.stdout.write(f"Maski ownerów: {masks} poprawionych pozycji")
+            shares = ledger.rebuild_all_shares()
+            self.stdout.write(f"ItemShare: {shares} wierszy")
+        rows = rollup.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"MonthlyRollup: {rows} wierszy"))
+        rows = prefix_sums.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"DailyPrefixSum: {rows} wierszy"))
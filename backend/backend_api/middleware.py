@@ -0,0 +1,148 @@
+# backend_api/middleware.py
+
+import cProfile
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from backend_api.services import metrics, profiling
+
+slow_logger = logging.getLogger("backend_api.slow_requests")
+
+
+class _SqlTimer:
+    """`connection.execute_wrapper` sumujący czas zapytań (bez parametrów)."""
+
+    __slots__ = ("elapsed", "statements")
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            took = time.perf_counter() - start
+            self.elapsed += took
+            self.statements.append((took, sql))
+
+
+class RequestMetricsMiddleware:
+    """
+    Mierzy każde żądanie: czas całkowity, czas i liczbę zapytań SQL, rozmiar
+    odpowiedzi (services/metrics.py). Żądania wolniejsze niż
+    SLOW_REQUEST_MS trafiają do logu razem z najdłuższymi zapytaniami.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", True):
+            return self.get_response(request)
+
+        timer = _SqlTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else "<unresolved>"
+        if response.streaming:
+            size = int(response.get("Content-Length") or 0)
+        else:
+            size = len(response.content)
+        metrics.observe(
+            view,
+            request.method,
+            response.status_code,
+            duration,
+            timer.elapsed,
+            len(timer.statements),
+            size,
+        )
+
+        threshold = getattr(settings, "SLOW_REQUEST_MS", 500)
+        if threshold is not None and duration * 1000 >= threshold:
+            self._log_slow(request, view, response, duration, timer)
+        return response
+
+    def _log_slow(self, request, view, response, duration, timer):
+        top = sorted(timer.statements, key=lambda row: row[0], reverse=True)
+        lines = [
+            f"{took * 1000:.1f} ms  {sql[:500]}"
+            for took, sql in top[: getattr(settings, "SLOW_REQUEST_TOP_SQL", 5)]
+        ]
+        slow_logger.warning(
+            "Wolne żądanie %s %s (%s) → %s: %.0f ms, SQL %d zapytań / %.0f ms\n%s",
+            request.method,
+            request.get_full_path(),
+            view,
+            response.status_code,
+            duration * 1000,
+            len(timer.statements),
+            timer.elapsed * 1000,
+            "\n".join(lines),
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Profilowanie widoku na życzenie: przy PROFILING_ENABLED zalogowany
+    użytkownik z is_staff dodaje `?_profile=1` albo nagłówek `X-Profile: 1`.
+    Widok wykonuje się pod cProfile, profil trafia do bufora na dysku
+    (services/profiling.py), a jego id wraca w nagłówku `X-Profile-Id`.
+    Musi stać po AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self._requested(request):
+            return None
+
+        timer = _SqlTimer()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = profiler.runcall(view_func, request, *view_args, **view_kwargs)
+            # DRF renderuje odpowiedź dopiero w middleware – liczymy to do profilu
+            if hasattr(response, "render") and not response.is_rendered:
+                profiler.runcall(response.render)
+        total = time.perf_counter() - start
+
+        match = request.resolver_match
+        response["X-Profile-Id"] = profiling.save(
+            profiler,
+            {
+                "view": match.view_name if match else None,
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+                "queries": len(timer.statements),
+            },
+            sql=timer.elapsed,
+            total=total,
+        )
+        return response
+
+    @staticmethod
+    def _requested(request) -> bool:
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            return False
+        if (
+            request.GET.get("_profile") != "1"
+            and request.headers.get("X-Profile") != "1"
+        ):
+            return False
+        user = getattr(request, "user", None)
+        return bool(user and user.is_active and user.is_staff)
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.4 on 2026-10-18 17:26
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_item_shares(apps, schema_editor):
+    Receipt = apps.get_model("backend_api", "Receipt")
+    ItemShare = apps.get_model("backend_api", "ItemShare")
+
+    rows = []
+    for receipt in Receipt.objects.prefetch_related("items__owners").iterator(
+        chunk_size=500
+    ):
+        for item in receipt.items.all():
+            owners = list(item.owners.all())
+            if not owners:
+                continue
+            share = (Decimal(item.value) / len(owners)).quantize(Decimal("0.000001"))
+            for owner in owners:
+                rows.append(
+                    ItemShare(
+                        receipt_id=receipt.id,
+                        item_id=item.id,
+                        owner_id=owner.id,
+                        share=share,
+                        payment_date=receipt.payment_date,
+                        category=item.category,
+                        transaction_type=receipt.transaction_type,
+                    )
+                )
+        if len(rows) >= 500:
+            ItemShare.objects.bulk_create(rows)
+            rows = []
+    ItemShare.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend_api', '0027_instrument_remove_transaction_investment_wallet_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemShare',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('share', models.DecimalField(decimal_places=6, max_digits=20)),
+                ('payment_date', models.DateField()),
+                ('category', models.CharField(choices=[('fuel', 'Paliwo'), ('car_expenses', 'Wydatki na samochód'), ('fastfood', 'Fast Food'), ('alcohol', 'Alkohol'), ('food_drinks', 'Picie & jedzenie'), ('chemistry', 'Chemia'), ('clothes', 'Ubrania'), ('electronics_games', 'Elektornika & gry'), ('tickets_entrance', 'Bilety & wejściówki'), ('delivery', 'Dostawa'), ('other_shopping', 'Inne zakupy'), ('flat_bills', 'Rachunki za mieszkanie'), ('monthly_subscriptions', 'Miesięczne subskrypcje'), ('other_cyclical_expenses', 'Inne cykliczne wydatki'), ('investments_savings', 'Inwestycje & oszczędności'), ('other', 'Inne'), ('for_study', 'Na studia'), ('work_income', 'Przychód z pracy'), ('family_income', 'Przychód od rodziny'), ('investments_income', 'Przychód z inwestycji'), ('money_back', 'Zwrot pieniędzy'), ('last_month_balance', 'Saldo z poprzedniego miesiąca')], max_length=255)),
+                ('transaction_type', models.CharField(choices=[('expense', 'Expense'), ('income', 'Income')], max_length=255)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shares', to='backend_api.item')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shares', to='backend_api.person')),
+                ('receipt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shares', to='backend_api.receipt')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', 'transaction_type', 'payment_date'], name='itemshare_owner_tx_date'), models.Index(fields=['payment_date', 'transaction_type', 'category'], name='itemshare_date_tx_cat')],
+                'constraints': [models.UniqueConstraint(fields=('receipt', 'item', 'owner'), name='unique_item_share')],
+            },
+        ),
+        migrations.RunPython(backfill_item_shares, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,119 @@
+# Generated by Django 6.0.4 on 2026-10-18 17:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_rollups(apps, schema_editor):
+    ItemShare = apps.get_model("backend_api", "ItemShare")
+    MonthlyRollup = apps.get_model("backend_api", "MonthlyRollup")
+
+    rows = (
+        ItemShare.objects.annotate(
+            year=ExtractYear("payment_date"), month=ExtractMonth("payment_date")
+        )
+        .values("owner_id", "year", "month", "category", "transaction_type")
+        .annotate(total=Sum("share"), share_count=Count("id"))
+        .order_by()
+    )
+    MonthlyRollup.objects.bulk_create(
+        [MonthlyRollup(**row) for row in rows], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0028_itemshare"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("fuel", "Paliwo"),
+                            ("car_expenses", "Wydatki na samochód"),
+                            ("fastfood", "Fast Food"),
+                            ("alcohol", "Alkohol"),
+                            ("food_drinks", "Picie & jedzenie"),
+                            ("chemistry", "Chemia"),
+                            ("clothes", "Ubrania"),
+                            ("electronics_games", "Elektornika & gry"),
+                            ("tickets_entrance", "Bilety & wejściówki"),
+                            ("delivery", "Dostawa"),
+                            ("other_shopping", "Inne zakupy"),
+                            ("flat_bills", "Rachunki za mieszkanie"),
+                            ("monthly_subscriptions", "Miesięczne subskrypcje"),
+                            ("other_cyclical_expenses", "Inne cykliczne wydatki"),
+                            ("investments_savings", "Inwestycje & oszczędności"),
+                            ("other", "Inne"),
+                            ("for_study", "Na studia"),
+                            ("work_income", "Przychód z pracy"),
+                            ("family_income", "Przychód od rodziny"),
+                            ("investments_income", "Przychód z inwestycji"),
+                            ("money_back", "Zwrot pieniędzy"),
+                            ("last_month_balance", "Saldo z poprzedniego miesiąca"),
+                        ],
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "transaction_type",
+                    models.CharField(
+                        choices=[("expense", "Expense"), ("income", "Income")],
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=6, default=0, max_digits=20),
+                ),
+                ("share_count", models.PositiveIntegerField(default=0)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="backend_api.person",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["year", "transaction_type"], name="rollup_year_tx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "owner",
+                            "year",
+                            "month",
+                            "category",
+                            "transaction_type",
+                        ),
+                        name="unique_monthly_rollup",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.4 on 2026-10-18 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0030_dataversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="receipt",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="backend_api.receipt",
+            ),
+        ),
+    ]
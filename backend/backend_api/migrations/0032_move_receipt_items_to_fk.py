@@ -0,0 +1,78 @@
+# Generated by Django 6.0.4 on 2026-10-18 18:05
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def move_items_to_fk(apps, schema_editor):
+    """
+    Przepisuje powiązania z tabeli Receipt.items na Item.receipt.
+    Pozycja przypięta do kilku paragonów zostaje sklonowana (razem z
+    ownerami i udziałami z ledgera), pozycje bez paragonu są usuwane.
+    """
+    Item = apps.get_model("backend_api", "Item")
+    ItemShare = apps.get_model("backend_api", "ItemShare")
+    Receipt = apps.get_model("backend_api", "Receipt")
+    ReceiptItems = Receipt.items.through
+    ItemOwners = Item.owners.through
+
+    first, extra = {}, []
+    links = ReceiptItems.objects.order_by("item_id", "receipt_id").values_list(
+        "item_id", "receipt_id"
+    )
+    for item_id, receipt_id in links.iterator(chunk_size=BATCH_SIZE):
+        if item_id in first:
+            extra.append((item_id, receipt_id))
+        else:
+            first[item_id] = receipt_id
+
+    Item.objects.bulk_update(
+        [Item(id=item_id, receipt_id=rid) for item_id, rid in first.items()],
+        ["receipt"],
+        batch_size=BATCH_SIZE,
+    )
+
+    for item_id, receipt_id in extra:
+        item = Item.objects.get(id=item_id)
+        owner_ids = list(
+            ItemOwners.objects.filter(item_id=item_id).values_list(
+                "person_id", flat=True
+            )
+        )
+        item.pk = None
+        item.receipt_id = receipt_id
+        item.save()
+        ItemOwners.objects.bulk_create(
+            [ItemOwners(item_id=item.id, person_id=pk) for pk in owner_ids]
+        )
+        ItemShare.objects.filter(receipt_id=receipt_id, item_id=item_id).update(
+            item_id=item.id
+        )
+
+    Item.objects.filter(receipt__isnull=True).delete()
+
+
+def move_items_to_m2m(apps, schema_editor):
+    Item = apps.get_model("backend_api", "Item")
+    Receipt = apps.get_model("backend_api", "Receipt")
+    ReceiptItems = Receipt.items.through
+
+    ReceiptItems.objects.bulk_create(
+        [
+            ReceiptItems(receipt_id=receipt_id, item_id=item_id)
+            for item_id, receipt_id in Item.objects.values_list("id", "receipt_id")
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0031_item_receipt"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_items_to_fk, move_items_to_m2m),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.4 on 2026-10-18 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0032_move_receipt_items_to_fk"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="receipt",
+            name="items",
+        ),
+        migrations.AlterField(
+            model_name="item",
+            name="receipt",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="items",
+                to="backend_api.receipt",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["receipt", "category"], name="item_receipt_category_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.4 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0033_remove_receipt_items"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="owner_mask",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="owner_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
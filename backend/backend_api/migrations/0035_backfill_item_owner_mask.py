@@ -0,0 +1,37 @@
+# Generated by Django 6.0.4 on 2026-10-18 18:40
+
+from collections import defaultdict
+
+from django.db import migrations
+
+MASK_BITS = 63
+BATCH_SIZE = 500
+
+
+def backfill_owner_masks(apps, schema_editor):
+    Item = apps.get_model("backend_api", "Item")
+
+    owners = defaultdict(set)
+    links = Item.owners.through.objects.values_list("item_id", "person_id")
+    for item_id, person_id in links.iterator(chunk_size=BATCH_SIZE):
+        owners[item_id].add(person_id)
+
+    rows = []
+    for item_id, person_ids in owners.items():
+        mask = 0
+        for pid in person_ids:
+            if 1 <= pid <= MASK_BITS:
+                mask |= 1 << (pid - 1)
+        rows.append(Item(id=item_id, owner_mask=mask, owner_count=len(person_ids)))
+    Item.objects.bulk_update(rows, ["owner_mask", "owner_count"], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0034_item_owner_mask"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_owner_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.4 on 2026-10-18 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0035_backfill_item_owner_mask"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                fields=["payment_date", "transaction_type"], name="receipt_date_tx"
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.4 on 2026-10-18 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0036_receipt_date_tx_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["category", "receipt"], name="item_category_receipt"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                fields=["transaction_type", "payment_date"], name="receipt_tx_date"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                fields=["payer", "payment_date"], name="receipt_payer_date"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recentshop",
+            index=models.Index(fields=["-last_used"], name="recentshop_last_used"),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 6.0.4 on 2026-10-18 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0037_query_plan_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryGroup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("group_set", models.CharField(max_length=50)),
+                ("name", models.CharField(max_length=50)),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("fuel", "Paliwo"),
+                            ("car_expenses", "Wydatki na samochód"),
+                            ("fastfood", "Fast Food"),
+                            ("alcohol", "Alkohol"),
+                            ("food_drinks", "Picie & jedzenie"),
+                            ("chemistry", "Chemia"),
+                            ("clothes", "Ubrania"),
+                            ("electronics_games", "Elektornika & gry"),
+                            ("tickets_entrance", "Bilety & wejściówki"),
+                            ("delivery", "Dostawa"),
+                            ("other_shopping", "Inne zakupy"),
+                            ("flat_bills", "Rachunki za mieszkanie"),
+                            ("monthly_subscriptions", "Miesięczne subskrypcje"),
+                            ("other_cyclical_expenses", "Inne cykliczne wydatki"),
+                            ("investments_savings", "Inwestycje & oszczędności"),
+                            ("other", "Inne"),
+                            ("for_study", "Na studia"),
+                            ("work_income", "Przychód z pracy"),
+                            ("family_income", "Przychód od rodziny"),
+                            ("investments_income", "Przychód z inwestycji"),
+                            ("money_back", "Zwrot pieniędzy"),
+                            ("last_month_balance", "Saldo z poprzedniego miesiąca"),
+                        ],
+                        max_length=255,
+                    ),
+                ),
+                ("position", models.PositiveSmallIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["group_set", "position", "name", "category"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("group_set", "name", "category"),
+                        name="unique_category_group",
+                    )
+                ],
+            },
+        ),
+    ]
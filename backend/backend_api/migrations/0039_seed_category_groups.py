@@ -0,0 +1,78 @@
+# Generated by Django 6.0.4 on 2026-10-18 19:05
+
+from django.db import migrations
+
+# kopia services.category_groups.DEFAULTS z chwili migracji
+GROUPS = {
+    "spending-ratio": {
+        "invest": ["investments_savings"],
+        "spending": ["fuel", "car_expenses", "food_drinks", "chemistry", "flat_bills"],
+        "fun": [
+            "fastfood",
+            "alcohol",
+            "clothes",
+            "electronics_games",
+            "tickets_entrance",
+            "delivery",
+            "other_shopping",
+            "monthly_subscriptions",
+            "other_cyclical_expenses",
+            "other",
+        ],
+    },
+    "bar-shops": {
+        "expense": [
+            "fuel",
+            "car_expenses",
+            "fastfood",
+            "alcohol",
+            "food_drinks",
+            "chemistry",
+            "clothes",
+            "electronics_games",
+            "tickets_entrance",
+            "delivery",
+            "other_shopping",
+            "flat_bills",
+            "monthly_subscriptions",
+            "other_cyclical_expenses",
+            "investments_savings",
+            "other",
+        ],
+        "income": [
+            "for_study",
+            "work_income",
+            "family_income",
+            "investments_income",
+            "money_back",
+            "other",
+        ],
+    },
+}
+
+
+def seed_groups(apps, schema_editor):
+    CategoryGroup = apps.get_model("backend_api", "CategoryGroup")
+    CategoryGroup.objects.bulk_create(
+        CategoryGroup(group_set=group_set, name=name, category=category, position=pos)
+        for group_set, groups in GROUPS.items()
+        for pos, (name, categories) in enumerate(groups.items())
+        for category in categories
+    )
+
+
+def drop_groups(apps, schema_editor):
+    apps.get_model("backend_api", "CategoryGroup").objects.filter(
+        group_set__in=list(GROUPS)
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0038_category_group"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_groups, drop_groups),
+    ]
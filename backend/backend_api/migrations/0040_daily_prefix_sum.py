@@ -0,0 +1,85 @@
+# Generated by Django 6.0.4 on 2026-10-18 18:07
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_prefix_sums(apps, schema_editor):
+    ItemShare = apps.get_model("backend_api", "ItemShare")
+    DailyPrefixSum = apps.get_model("backend_api", "DailyPrefixSum")
+
+    rows = (
+        ItemShare.objects.exclude(category="last_month_balance")
+        .values("owner_id", "payment_date", "transaction_type")
+        .annotate(total=Sum("share"))
+        .order_by("owner_id", "payment_date")
+    )
+    prefix, running = {}, {}
+    for row in rows:
+        owner_id = row["owner_id"]
+        expense, income = running.get(owner_id, (Decimal(0), Decimal(0)))
+        if row["transaction_type"] == "expense":
+            expense += row["total"]
+        else:
+            income += row["total"]
+        running[owner_id] = (expense, income)
+        prefix[(owner_id, row["payment_date"])] = (expense, income)
+    DailyPrefixSum.objects.bulk_create(
+        [
+            DailyPrefixSum(owner_id=owner_id, day=day, expense=e, income=i)
+            for (owner_id, day), (e, i) in prefix.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0039_seed_category_groups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPrefixSum",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "expense",
+                    models.DecimalField(decimal_places=6, default=0, max_digits=20),
+                ),
+                (
+                    "income",
+                    models.DecimalField(decimal_places=6, default=0, max_digits=20),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="prefix_sums",
+                        to="backend_api.person",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("owner", "day"), name="unique_prefix_sum"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_prefix_sums, migrations.RunPython.noop),
+    ]
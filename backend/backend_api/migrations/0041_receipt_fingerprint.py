@@ -0,0 +1,57 @@
+# Generated by Django 6.0.4 on 2026-10-18 18:10
+
+import hashlib
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # kopia services/fingerprints.of_data z chwili migracji
+    Receipt = apps.get_model("backend_api", "Receipt")
+    Item = apps.get_model("backend_api", "Item")
+
+    items = defaultdict(list)
+    for receipt_id, category, value in Item.objects.values_list(
+        "receipt_id", "category", "value"
+    ):
+        items[receipt_id].append(
+            f"{category}={Decimal(value).quantize(Decimal('0.01'))}"
+        )
+
+    receipts = []
+    for receipt in Receipt.objects.only(
+        "id", "shop", "payment_date", "payer_id", "transaction_type"
+    ).iterator(chunk_size=500):
+        parts = [
+            " ".join(str(receipt.shop).split()).lower(),
+            receipt.payment_date.isoformat(),
+            str(receipt.payer_id),
+            receipt.transaction_type,
+        ] + sorted(items[receipt.id])
+        receipt.fingerprint = hashlib.blake2b(
+            "\x1f".join(parts).encode(), digest_size=16
+        ).hexdigest()
+        receipts.append(receipt)
+    Receipt.objects.bulk_update(receipts, ["fingerprint"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0040_daily_prefix_sum"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="receipt",
+            name="fingerprint",
+            field=models.CharField(blank=True, default="", max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(fields=["fingerprint"], name="receipt_fingerprint"),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.4 on 2026-10-18 18:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_api", "0041_receipt_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.CharField(max_length=64)),
+                ("key", models.CharField(max_length=255)),
+                ("request_hash", models.CharField(max_length=32)),
+                ("status_code", models.PositiveSmallIntegerField(null=True)),
+                (
+                    "content_type",
+                    models.CharField(blank=True, default="", max_length=100),
+                ),
+                ("body", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["created_at"], name="idempotency_created")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("scope", "key"), name="unique_idempotency_key"
+                    )
+                ],
+            },
+        ),
+    ]
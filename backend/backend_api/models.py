@@ -50,6 +50,23 @@ class Item(models.Model):
     # owners = models.JSONField(blank=False, default=list)
     owners = models.ManyToManyField(Person, related_name="items")
     description = models.CharField(max_length=255)
+    # pozycja należy do dokładnie jednego paragonu (dawniej M2M Receipt.items)
+    receipt = models.ForeignKey(
+        "Receipt", on_delete=models.CASCADE, related_name="items"
+    )
+    # bit (id - 1) każdego ownera i ich liczba – filtrowanie bez joinu po M2M
+    # (utrzymywane przez services.owner_mask przy każdym zapisie paragonu)
+    owner_mask = models.BigIntegerField(default=0)
+    owner_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["receipt", "category"], name="item_receipt_category_idx"
+            ),
+            # category__in bez zawężenia po paragonie (bar_shops, filtr category)
+            models.Index(fields=["category", "receipt"], name="item_category_receipt"),
+        ]
 
     def __str__(self):
         return self.description
@@ -72,17 +89,217 @@ class Receipt(models.Model):
 
     shop = models.CharField(max_length=255)
     transaction_type = models.CharField(max_length=255, choices=TRANSACTION_CHOICES)
-    items = models.ManyToManyField(Item, related_name="receipts")
     payment_date = models.DateField()
+    # odcisk treści (services/fingerprints.py) – wykrywanie duplikatów
+    fingerprint = models.CharField(max_length=32, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["fingerprint"], name="receipt_fingerprint"),
+            # zakresy dat (payment_date >= od AND < do) z typem transakcji
+            models.Index(
+                fields=["payment_date", "transaction_type"], name="receipt_date_tx"
+            ),
+            # równość na typie + zakres dat (bar_persons, filtr transaction_type)
+            models.Index(
+                fields=["transaction_type", "payment_date"], name="receipt_tx_date"
+            ),
+            # filtr payer + okres; sortowanie listy po dacie
+            models.Index(fields=["payer", "payment_date"], name="receipt_payer_date"),
+        ]
 
     def __str__(self):
         return f"Receipt {self.id}"
 
 
+class ItemShare(models.Model):
+    """
+    Zdenormalizowany udział właściciela w pozycji paragonu (value / liczba ownerów).
+    Jeden wiersz na (paragon, pozycja, właściciel) – odświeżany przy każdym zapisie.
+    """
+
+    receipt = models.ForeignKey(
+        Receipt, on_delete=models.CASCADE, related_name="shares"
+    )
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="shares")
+    owner = models.ForeignKey(Person, on_delete=models.CASCADE, related_name="shares")
+    share = models.DecimalField(max_digits=20, decimal_places=6)
+    payment_date = models.DateField()
+    category = models.CharField(max_length=255, choices=Item.CATEGORY_CHOICES)
+    transaction_type = models.CharField(
+        max_length=255, choices=Receipt.TRANSACTION_CHOICES
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["receipt", "item", "owner"], name="unique_item_share"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["owner", "transaction_type", "payment_date"],
+                name="itemshare_owner_tx_date",
+            ),
+            models.Index(
+                fields=["payment_date", "transaction_type", "category"],
+                name="itemshare_date_tx_cat",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Share {self.item_id} -> {self.owner_id}: {self.share}"
+
+
+class MonthlyRollup(models.Model):
+    """
+    Zagregowane udziały: owner × rok-miesiąc × kategoria × typ transakcji.
+    Aktualizowane przyrostowo (delta) przy każdym zapisie paragonu.
+    """
+
+    owner = models.ForeignKey(Person, on_delete=models.CASCADE, related_name="rollups")
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    category = models.CharField(max_length=255, choices=Item.CATEGORY_CHOICES)
+    transaction_type = models.CharField(
+        max_length=255, choices=Receipt.TRANSACTION_CHOICES
+    )
+    total = models.DecimalField(max_digits=20, decimal_places=6, default=0)
+    share_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "year", "month", "category", "transaction_type"],
+                name="unique_monthly_rollup",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["year", "transaction_type"], name="rollup_year_tx"),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.owner_id} {self.year}-{self.month:02d} "
+            f"{self.category}/{self.transaction_type}: {self.total}"
+        )
+
+
+class DailyPrefixSum(models.Model):
+    """
+    Narastające udziały ownera od początku danych do `day` włącznie
+    (bez salda z poprzedniego miesiąca). Wiersz tylko dla dni z ruchem –
+    wartość na dowolny dzień to ostatni wiersz nie późniejszy niż on.
+    Aktualizowane przyrostowo od zmienionego dnia w przód.
+    """
+
+    owner = models.ForeignKey(
+        Person, on_delete=models.CASCADE, related_name="prefix_sums"
+    )
+    day = models.DateField()
+    expense = models.DecimalField(max_digits=20, decimal_places=6, default=0)
+    income = models.DecimalField(max_digits=20, decimal_places=6, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "day"], name="unique_prefix_sum"),
+        ]
+
+    def __str__(self):
+        return f"{self.owner_id} {self.day}: -{self.expense} +{self.income}"
+
+
+class DataVersion(models.Model):
+    """
+    Licznik wersji danych dla (rok, miesiąc) – podbijany przy każdym zapisie
+    paragonu z tego miesiąca. Klucz cache'y i ETagów analityki.
+    """
+
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    version = models.PositiveIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["year", "month"], name="unique_data_version"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} v{self.version}"
+
+    @property
+    def token(self):
+        return f"{self.version}.{int(self.changed_at.timestamp() * 1_000_000)}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Zapamiętana odpowiedź na żądanie z nagłówkiem `Idempotency-Key`
+    (services/idempotency.py). `status_code` NULL = żądanie w toku.
+    Wiersze starsze niż IDEMPOTENCY_TTL są usuwane.
+    """
+
+    scope = models.CharField(max_length=64)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=32)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    body = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "key"], name="unique_idempotency_key"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"], name="idempotency_created"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key} -> {self.status_code}"
+
+
+class CategoryGroup(models.Model):
+    """
+    Przypisanie kategorii do nazwanej grupy w zestawie, np. zestaw
+    "spending-ratio" z grupami invest / spending / fun albo "bar-shops"
+    z grupami expense / income. Czytane przez services.category_groups
+    (cache w procesie); `position` ustala kolejność grup w odpowiedzi.
+    """
+
+    group_set = models.CharField(max_length=50)
+    name = models.CharField(max_length=50)
+    category = models.CharField(max_length=255, choices=Item.CATEGORY_CHOICES)
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["group_set", "name", "category"],
+                name="unique_category_group",
+            ),
+        ]
+        ordering = ["group_set", "position", "name", "category"]
+
+    def __str__(self):
+        return f"{self.group_set}/{self.name}: {self.category}"
+
+
 class RecentShop(models.Model):
     name = models.CharField(max_length=255, unique=True)
     last_used = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # podpowiedzi: ORDER BY last_used DESC LIMIT 10 bez sortowania
+            models.Index(fields=["-last_used"], name="recentshop_last_used"),
+        ]
+
     def save(self, *args, **kwargs):
         self.name = self.name.strip().lower()
         super().save(*args, **kwargs)
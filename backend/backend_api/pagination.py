@@ -0,0 +1,95 @@
+import base64
+from datetime import date
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class ReceiptKeysetPagination(BasePagination):
+    """
+    Paginacja kursorem po kluczu (payment_date, id).
+
+    Kursor koduje ostatni zwrócony klucz, więc kolejna strona to
+    `WHERE (payment_date, id) > kursor` – bez OFFSET i stabilnie przy
+    dopisywaniu nowych paragonów. Włączana parametrem `cursor` lub `page_size`;
+    bez nich lista zwracana jest w całości (zgodność z frontendem).
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 100
+    max_page_size = 1000
+    invalid_cursor_message = "Niepoprawny kursor"
+
+    def is_requested(self, request) -> bool:
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    @staticmethod
+    def encode_cursor(position) -> str:
+        day, pk = position
+        raw = f"{day.isoformat()}|{pk}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            day, pk = raw.split("|")
+            return date.fromisoformat(day), int(pk)
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        queryset = queryset.order_by("payment_date", "id")
+        if position is not None:
+            day, pk = position
+            queryset = queryset.filter(
+                Q(payment_date__gt=day) | Q(payment_date=day, id__gt=pk)
+            )
+
+        # jeden wiersz więcej mówi, czy jest następna strona
+        page = list(queryset[: size + 1])
+        self.next_position = None
+        if len(page) > size:
+            page = page[:size]
+            self.next_position = (page[-1].payment_date, page[-1].id)
+        return page
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.utils.timezone import now
 
 from rest_framework import serializers
@@ -13,6 +14,7 @@ from .models import (
     Instrument,
     WalletSnapshot,
 )
+from .services import items_deleted, owner_mask, receipts_saved
 
 
 # Serializator dla PersonPayer
@@ -37,6 +39,7 @@ class ItemSerializer(serializers.ModelSerializer):
             "description",
             "quantity",
             "owners",
+            "receipt",
         ]
 
     def create(self, validated_data):
@@ -54,11 +57,203 @@ class ItemSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ReceiptSerializer(serializers.ModelSerializer):
-    payer = serializers.PrimaryKeyRelatedField(
-        queryset=Person.objects.filter(payer=True)
+class PersonIdField(serializers.PrimaryKeyRelatedField):
+    """
+    Id osoby bez zapytania per wartość – istnienie sprawdza zbiorczo
+    `ReceiptSerializer` (jedno zapytanie na cały request).
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class ReceiptItemSerializer(ItemSerializer):
+    # przy edycji paragonu id wskazuje istniejącą pozycję do uzgodnienia
+    id = serializers.IntegerField(required=False)
+    owners = PersonIdField(many=True, queryset=Person.objects.all())
+
+    class Meta(ItemSerializer.Meta):
+        # paragon wynika z zagnieżdżenia
+        fields = [f for f in ItemSerializer.Meta.fields if f != "receipt"]
+
+
+def validate_persons(receipts_attrs):
+    """
+    Jedno zapytanie o wszystkich płatników i ownerów z listy paragonów.
+    Podmienia id płatnika na obiekt Person (ownerzy zostają jako id).
+    """
+    ids = set()
+    for attrs in receipts_attrs:
+        if "payer" in attrs:
+            ids.add(attrs["payer"])
+        for item in attrs.get("items", []):
+            ids.update(item.get("owners", []))
+    persons = Person.objects.in_bulk(ids)
+
+    errors = []
+    for attrs in receipts_attrs:
+        error = {}
+        payer = persons.get(attrs.get("payer"))
+        if "payer" in attrs and (payer is None or not payer.payer):
+            error["payer"] = [f'Niepoprawny płatnik "{attrs["payer"]}".']
+        missing = sorted(
+            {
+                pk
+                for item in attrs.get("items", [])
+                for pk in item.get("owners", [])
+                if pk not in persons
+            }
+        )
+        if missing:
+            error["items"] = [f"Nieznani właściciele: {missing}."]
+        errors.append(error)
+        if payer is not None:
+            attrs["payer"] = payer
+    return errors
+
+
+def write_receipt_items(pairs):
+    """
+    Zapisuje pozycje dla listy (paragon, items_data) hurtowo:
+    bulk_create Itemów oraz wierszy tabeli łączącej owners.
+    Zwraca utworzone pozycje.
+    """
+    items, owner_ids = [], []
+    for receipt, items_data in pairs:
+        for item_data in items_data:
+            data = dict(item_data)
+            data.pop("id", None)
+            owners = list(dict.fromkeys(data.pop("owners", [])))
+            owner_ids.append(owners)
+            items.append(
+                Item(
+                    receipt=receipt,
+                    owner_mask=owner_mask.mask_of(owners),
+                    owner_count=len(owners),
+                    **data,
+                )
+            )
+    Item.objects.bulk_create(items)
+
+    Item.owners.through.objects.bulk_create(
+        [
+            Item.owners.through(item_id=item.id, person_id=pk)
+            for item, owners in zip(items, owner_ids)
+            for pk in owners
+        ]
+    )
+    return items
+
+
+ITEM_FIELDS = ("category", "value", "description", "quantity")
+
+
+def reconcile_items(receipt, items_data):
+    """
+    Uzgadnia pozycje paragonu z listą z requestu po id: zmienione pola
+    zapisuje jednym bulk_update, nowe tworzy, brakujące usuwa.
+    Zwraca raport zmian.
+    """
+    existing = {item.id: item for item in receipt.items.prefetch_related("owners")}
+    edited, edited_fields, new, owner_updates = [], set(), [], {}
+    for item_data in items_data:
+        data = dict(item_data)
+        item = existing.pop(data.pop("id", None), None)
+        if item is None:
+            new.append(data)
+            continue
+
+        # brak "owners" w częściowym PATCH – ownerzy zostają bez zmian
+        has_owners = "owners" in data
+        owners = list(dict.fromkeys(data.pop("owners", [])))
+        fields = [f for f in ITEM_FIELDS if f in data and getattr(item, f) != data[f]]
+        for field in fields:
+            setattr(item, field, data[field])
+        if has_owners and {owner.id for owner in item.owners.all()} != set(owners):
+            owner_updates[item.id] = owners
+            item.owner_mask = owner_mask.mask_of(owners)
+            item.owner_count = len(owners)
+            fields += ["owner_mask", "owner_count"]
+        if fields:
+            edited.append(item)
+            edited_fields.update(fields)
+
+    if edited:
+        Item.objects.bulk_update(edited, sorted(edited_fields))
+    if owner_updates:
+        Item.owners.through.objects.filter(item_id__in=owner_updates).delete()
+        Item.owners.through.objects.bulk_create(
+            [
+                Item.owners.through(item_id=pk, person_id=owner)
+                for pk, owners in owner_updates.items()
+                for owner in owners
+            ]
+        )
+
+    removed = sorted(existing)
+    items_deleted(removed)
+    created = write_receipt_items([(receipt, new)]) if new else []
+
+    return {
+        "created": sorted(item.id for item in created),
+        "updated": sorted(item.id for item in edited),
+        "deleted": removed,
+    }
+
+
+def touch_recent_shops(shops):
+    """Aktualizuje RecentShop dla nazw sklepów – stała liczba zapytań."""
+    names = {shop.strip().lower() for shop in shops if shop and shop.strip()}
+    if not names:
+        return
+    existing = set(
+        RecentShop.objects.filter(name__in=names).values_list("name", flat=True)
+    )
+    RecentShop.objects.filter(name__in=existing).update(last_used=now())
+    RecentShop.objects.bulk_create([RecentShop(name=n) for n in names - existing])
+
+
+def with_items(receipt_ids):
+    """Paragony z pozycjami i ownerami w 3 zapytaniach (do odpowiedzi API)."""
+    return list(
+        Receipt.objects.filter(id__in=receipt_ids)
+        .order_by("id")
+        .prefetch_related("items__owners")
     )
-    items = ItemSerializer(many=True)
+
+
+class ReceiptListSerializer(serializers.ListSerializer):
+    """Lista paragonów w jednym requeście – jedna transakcja, zapis hurtowy."""
+
+    def validate(self, attrs):
+        errors = validate_persons(attrs)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    @transaction.atomic
+    def create(self, validated_data):
+        items_data = [attrs.pop("items", []) for attrs in validated_data]
+        receipts = Receipt.objects.bulk_create(
+            [Receipt(**attrs) for attrs in validated_data]
+        )
+        touch_recent_shops(r.shop for r in receipts)
+        write_receipt_items(zip(receipts, items_data))
+
+        ids = [r.id for r in receipts]
+        receipts_saved(ids)
+        by_id = {r.id: r for r in with_items(ids)}
+        return [by_id[pk] for pk in ids]
+
+
+class ReceiptSerializer(serializers.ModelSerializer):
+    payer = PersonIdField(queryset=Person.objects.filter(payer=True))
+    items = ReceiptItemSerializer(many=True)
 
     class Meta:
         model = Receipt
@@ -71,58 +266,48 @@ class ReceiptSerializer(serializers.ModelSerializer):
             "transaction_type",
             "items",
         ]
-
+        list_serializer_class = ReceiptListSerializer
+
+    def validate(self, attrs):
+        # w liście waliduje ReceiptListSerializer – jedno zapytanie dla wszystkich
+        if isinstance(self.parent, serializers.ListSerializer):
+            return attrs
+        errors = validate_persons([attrs])[0]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop("items", [])
         receipt = Receipt.objects.create(**validated_data)
+        touch_recent_shops([receipt.shop])
+        write_receipt_items([(receipt, items_data)])
 
-        shop_name = validated_data.get("shop", "").strip().lower()
-        if shop_name:
-            recent_shop, created = RecentShop.objects.get_or_create(name=shop_name)
-            if not created:
-                recent_shop.last_used = now()
-                recent_shop.save()
-
-        for item_data in items_data:
-            item_data["owners"] = [
-                owner.id if isinstance(owner, Person) else owner
-                for owner in item_data.get("owners", [])
-            ]
-            item_serializer = ItemSerializer(data=item_data)
-            item_serializer.is_valid(raise_exception=True)
-            item = item_serializer.save()
-            receipt.items.add(item)
-
-            # self.update_item_prediction(item, receipt.shop.lower())
-
-        return receipt
+        receipts_saved([receipt.id])
+        return with_items([receipt.id])[0]
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        items_data = validated_data.pop("items", [])
-        # Aktualizacja pozostałych pól obiektu Receipt
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        # Czyścimy poprzednie pozycje
-        instance.items.clear()
-
-        # Przetwarzamy listę pozycji
-        for item_data in items_data:
-            # Konwertujemy właścicieli – upewniamy się, że przekazujemy klucze główne
-            item_data["owners"] = [
-                owner.id if hasattr(owner, "id") else owner
-                for owner in item_data.get("owners", [])
-            ]
-            item_serializer = ItemSerializer(data=item_data)
-            item_serializer.is_valid(raise_exception=True)
-            item = item_serializer.save()
-            instance.items.add(item)
+        items_data = validated_data.pop("items", None)
+        # zapisujemy paragon tylko, gdy zmieniło się któreś z jego pól
+        fields = [
+            attr
+            for attr, value in validated_data.items()
+            if getattr(instance, attr) != value
+        ]
+        for attr in fields:
+            setattr(instance, attr, validated_data[attr])
+        if fields:
+            instance.save(update_fields=fields)
 
-            # Używamy instance.shop, a nie niezdefiniowanego receipt
-            # self.update_item_prediction(item, instance.shop.lower())
+        # PATCH bez "items" nie rusza pozycji
+        self.item_changes = {"created": [], "updated": [], "deleted": []}
+        if items_data is not None:
+            self.item_changes = reconcile_items(instance, items_data)
 
-        return instance
+        receipts_saved([instance.id])
+        return with_items([instance.id])[0]
 
     def update_item_prediction(self, item, shop_name):
         """
@@ -146,6 +331,26 @@ class ReceiptSerializer(serializers.ModelSerializer):
         prediction.save()
 
 
+class ReceiptSummarySerializer(serializers.ModelSerializer):
+    """Paragon bez zagnieżdżonych pozycji – suma i liczba pozycji z adnotacji SQL."""
+
+    total = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    item_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Receipt
+        fields = [
+            "id",
+            "save_date",
+            "payment_date",
+            "payer",
+            "shop",
+            "transaction_type",
+            "total",
+            "item_count",
+        ]
+
+
 class ItemPredictionSerializer(serializers.ModelSerializer):
     item_description = serializers.CharField(source="item.description", read_only=True)
     shop_name = serializers.CharField(source="shop.name", read_only=True)
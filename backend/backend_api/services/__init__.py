@@ -0,0 +1,2 @@
+# backend_api/services/__init__.py
+from .sync import receipts_saved, receipts_deleted, items_deleted
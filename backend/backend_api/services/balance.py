@@ -0,0 +1,174 @@
+# backend_api/services/balance.py
+"""
+Saldo miesiąc po miesiącu dla zakresu miesięcy.
+
+`series` liczy to samo co GET /balance/ dla pojedynczego miesiąca, ale
+dla całego zakresu w dwóch zapytaniach: jedno GROUP BY (rok, miesiąc, typ)
+po rollupach i jedno po zapisanych saldach (`last_month_balance` na
+pierwszy dzień kolejnego miesiąca). `close` dopisuje brakujące salda
+hurtem – bulk_create paragonów, pozycji i ownerów w jednej transakcji.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Mapping, Optional
+
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from backend_api.models import Item, ItemShare, MonthlyRollup, Person, Receipt
+from backend_api.services import owner_mask
+from backend_api.services.sync import receipts_saved
+
+BALANCE_CATEGORY = "last_month_balance"
+BALANCE_LABEL = "Saldo z poprzedniego miesiąca"
+
+
+def _closing_day(year: int, month: int) -> date:
+    return date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+
+def _months_q(months) -> Q:
+    """(rok, miesiąc) jako `year = r AND month IN (...)` – jeden warunek na rok."""
+    by_year: Dict[int, List[int]] = {}
+    for year, month in months:
+        by_year.setdefault(year, []).append(month)
+    q = Q()
+    for year, months_of_year in by_year.items():
+        q |= Q(year=year, month__in=months_of_year)
+    return q
+
+
+def series(owner_ids: List[int], period) -> List[Dict]:
+    """
+    Saldo wyliczone vs zapisane dla każdego miesiąca okresu; wpisy jak
+    w GET /balance/ (computed_balance, create, saved_balance, difference,
+    saved_item_id) plus year/month.
+    """
+    months = period.months()
+    totals: Dict[tuple, Dict[str, Decimal]] = {}
+    rows = (
+        MonthlyRollup.objects.filter(_months_q(months), owner_id__in=owner_ids)
+        .exclude(category=BALANCE_CATEGORY)
+        .values("year", "month", "transaction_type")
+        .annotate(total=Sum("total"))
+        .order_by()
+    )
+    for row in rows:
+        totals.setdefault((row["year"], row["month"]), {})[row["transaction_type"]] = (
+            row["total"]
+        )
+
+    closing = {_closing_day(y, m): (y, m) for y, m in months}
+    saved: Dict[tuple, Dict] = {}
+    saved_rows = (
+        ItemShare.objects.filter(
+            transaction_type="income",
+            category=BALANCE_CATEGORY,
+            payment_date__in=list(closing),
+            owner_id__in=owner_ids,
+        )
+        .order_by("payment_date", "receipt_id")
+        .values("payment_date", "item_id", "share")
+    )
+    for row in saved_rows:
+        # pierwszy zapis dnia wygrywa – jak `.first()` w GET /balance/
+        saved.setdefault(closing[row["payment_date"]], row)
+
+    result = []
+    for year, month in months:
+        month_totals = totals.get((year, month), {})
+        computed = round(
+            float(month_totals.get("income") or 0)
+            - float(month_totals.get("expense") or 0),
+            2,
+        )
+        entry = {
+            "year": year,
+            "month": month,
+            "computed_balance": computed,
+            "create": (year, month) not in saved,
+        }
+        saved_row = saved.get((year, month))
+        if saved_row is not None:
+            saved_share = round(float(saved_row["share"]), 2)
+            entry.update(
+                {
+                    "saved_balance": saved_share,
+                    "difference": round(computed - saved_share, 2),
+                    "saved_item_id": saved_row["item_id"],
+                }
+            )
+        result.append(entry)
+    return result
+
+
+@transaction.atomic
+def close(
+    owner_ids: List[int],
+    period,
+    values: Optional[Mapping[tuple, Decimal]] = None,
+) -> List[Dict]:
+    """
+    Zapisuje saldo zamykające dla miesięcy okresu, które go jeszcze nie mają.
+    Wartość: `values[(rok, miesiąc)]` albo saldo wyliczone. Płatnik to
+    pierwszy owner, ownerzy pozycji to wszyscy podani – jak zapis z frontendu.
+    Zwraca utworzone wpisy (year, month, value, receipt_id, item_id).
+    """
+    values = values or {}
+    missing = [entry for entry in series(owner_ids, period) if entry["create"]]
+    if not missing:
+        return []
+
+    today = date.today()
+    payer = Person(id=owner_ids[0])
+    receipts = Receipt.objects.bulk_create(
+        [
+            Receipt(
+                save_date=today,
+                payment_date=_closing_day(entry["year"], entry["month"]),
+                payer=payer,
+                shop=BALANCE_LABEL,
+                transaction_type="income",
+            )
+            for entry in missing
+        ]
+    )
+    items = Item.objects.bulk_create(
+        [
+            Item(
+                receipt=receipt,
+                save_date=today,
+                category=BALANCE_CATEGORY,
+                value=Decimal(
+                    str(
+                        values.get(
+                            (entry["year"], entry["month"]),
+                            entry["computed_balance"],
+                        )
+                    )
+                ),
+                description=BALANCE_LABEL,
+                quantity=1,
+                owner_mask=owner_mask.mask_of(owner_ids),
+                owner_count=len(owner_ids),
+            )
+            for entry, receipt in zip(missing, receipts)
+        ]
+    )
+    links = Item.owners.through
+    links.objects.bulk_create(
+        [links(item_id=item.id, person_id=pid) for item in items for pid in owner_ids]
+    )
+    receipts_saved([receipt.id for receipt in receipts])
+
+    return [
+        {
+            "year": entry["year"],
+            "month": entry["month"],
+            "value": float(item.value),
+            "receipt_id": receipt.id,
+            "item_id": item.id,
+        }
+        for entry, receipt, item in zip(missing, receipts, items)
+    ]
@@ -0,0 +1,271 @@
+# backend_api/services/benchmark.py
+"""
+Benchmark endpointów API przez klienta testowego Django.
+
+Dla każdej trasy z `backend_api/urls.py`, która obsługuje GET, mierzy
+p50/p95 czasu odpowiedzi, liczbę zapytań SQL i szczyt alokacji pamięci
+(tracemalloc). Wynik to słownik gotowy do zapisania jako baseline JSON;
+`compare` wskazuje regresje względem poprzedniego przebiegu.
+"""
+
+import math
+import platform
+import time
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils import timezone
+
+import backend_api.urls
+from backend_api.models import (
+    Instrument,
+    Invest,
+    Item,
+    Person,
+    Receipt,
+    WalletSnapshot,
+)
+
+SCHEMA_VERSION = 1
+
+# trasy z parametrem w ścieżce → model, z którego bierzemy pierwszy obiekt
+DETAIL_OBJECTS = {
+    "person-detail": Person,
+    "item-detail": Item,
+    "instrument-detail": Instrument,
+    "invest-detail": Invest,
+    "walletsnapshot-detail": WalletSnapshot,
+    "receipt-update": Receipt,
+}
+# trasy, których nie da się sensownie zmierzyć GET-em
+SKIP = {
+    "balance-patch": "tylko PATCH",
+    "profile-detail": "id profilu z dysku",
+    "profile-dump": "id profilu z dysku",
+}
+
+
+def routes() -> List[Tuple[str, object]]:
+    """(nazwa, widok) każdej nazwanej trasy; warianty z sufiksem formatu pomijane."""
+    found, seen = [], set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                if pattern.name not in seen:
+                    seen.add(pattern.name)
+                    found.append((pattern.name, pattern.callback))
+
+    walk(backend_api.urls.urlpatterns)
+    return found
+
+
+def _allows_get(callback) -> bool:
+    actions = getattr(callback, "actions", None)
+    if actions is not None:  # ViewSet z routera
+        return "get" in actions
+    cls = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+    return cls is None or hasattr(cls, "get")
+
+
+def default_params() -> Dict[str, object]:
+    """Parametry analityk dopasowane do danych: ostatni miesiąc, pierwszy owner."""
+    last = Receipt.objects.order_by("-payment_date").values("payment_date").first()
+    day = last["payment_date"] if last else timezone.localdate()
+    owner = Person.objects.filter(owner=True).order_by("id").first()
+    owners = [owner.id] if owner else []
+    return {
+        "year": day.year,
+        "month": day.month,
+        "period": "monthly",
+        "owners[]": owners,
+        "owners": owners[0] if owners else "",
+        "transactionType": "expense",
+    }
+
+
+def build_requests(only: Optional[Iterable[str]] = None) -> List[Dict]:
+    """Lista żądań do zmierzenia: {name, url, params} albo {name, skipped}."""
+    only = set(only or ())
+    params = default_params()
+    analytics = {
+        key: params[key]
+        for key in ("year", "month", "period", "owners[]", "transactionType")
+    }
+    query = {
+        "fetch-line-sums": analytics,
+        "fetch-bar-persons": analytics,
+        "fetch-bar-shops": analytics,
+        "fetch-pie-categories": analytics,
+        "fetch-dashboard": analytics,
+        "balance": analytics,
+        "spending-ratio": analytics,
+        "balance-series": {
+            "owners[]": params["owners[]"],
+            "from": f"{params['year']}-01",
+            "to": f"{params['year']}-{params['month']:02d}",
+        },
+        "receipt-create": {"year": params["year"], "month": params["month"]},
+        "recent-shop-search": {"q": "lid"},
+        "item-predictions": {"q": "foo"},
+    }
+
+    result = []
+    for name, callback in routes():
+        if only and name not in only:
+            continue
+        if name in SKIP:
+            result.append({"name": name, "skipped": SKIP[name]})
+            continue
+        if not _allows_get(callback):
+            result.append({"name": name, "skipped": "brak GET"})
+            continue
+        kwargs = {}
+        if name in DETAIL_OBJECTS:
+            model = DETAIL_OBJECTS[name]
+            kwargs["pk"] = model.objects.values_list("id", flat=True).first()
+            if kwargs["pk"] is None:
+                result.append({"name": name, "skipped": "brak danych"})
+                continue
+        result.append(
+            {
+                "name": name,
+                "url": reverse(name, kwargs=kwargs),
+                "params": query.get(name, {}),
+            }
+        )
+    return result
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentyl metodą najbliższej rangi."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(client: Client, url: str, params: Dict, repeat: int) -> Dict:
+    client.get(url, params)  # rozgrzewka (importy, cache ORM)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, params)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # przy DEBUG=True log zapytań jest ograniczony – pełny log nic by nie zliczył
+    reset_queries()
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url, params)
+    # od razu – kolejne żądanie (request_started) czyści log zapytań
+    queries = len(ctx)
+
+    # osobny przebieg – tracemalloc spowalnia, nie może psuć czasów
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    client.get(url, params)
+    _, peak = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+
+    return {
+        "status": response.status_code,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "queries": queries,
+        "peak_kib": round(max(peak - base, 0) / 1024, 1),
+    }
+
+
+def run(
+    repeat: int = 20, only: Optional[Iterable[str]] = None, with_cache: bool = False
+) -> Dict:
+    """
+    Mierzy wszystkie trasy. Domyślnie z wyłączonym cache odpowiedzi
+    analityk – inaczej p50 mierzyłby tylko trafienia w cache.
+    """
+    client = Client(HTTP_HOST="localhost")
+    endpoints, skipped = {}, {}
+    cache_enabled = with_cache and getattr(settings, "ANALYTICS_CACHE_ENABLED", True)
+    with override_settings(ANALYTICS_CACHE_ENABLED=cache_enabled):
+        for spec in build_requests(only):
+            if "skipped" in spec:
+                skipped[spec["name"]] = spec["skipped"]
+                continue
+            endpoints[spec["name"]] = {
+                "url": spec["url"],
+                **measure(client, spec["url"], spec["params"], repeat),
+            }
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        "repeat": repeat,
+        "analytics_cache": cache_enabled,
+        "data": {
+            "receipts": Receipt.objects.count(),
+            "items": Item.objects.count(),
+            "persons": Person.objects.count(),
+        },
+        "endpoints": endpoints,
+        "skipped": skipped,
+    }
+
+
+def compare(
+    baseline: Dict, current: Dict, tolerance: float = 0.2, min_delta_ms: float = 1.0
+) -> List[Dict]:
+    """
+    Regresje względem baseline: p95 i pamięć powyżej tolerancji, każde
+    dodatkowe zapytanie SQL. Endpointy spoza baseline są pomijane.
+    """
+    regressions = []
+    for name, now in current.get("endpoints", {}).items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        checks = [
+            (
+                "queries",
+                before["queries"],
+                now["queries"],
+                now["queries"] > before["queries"],
+            ),
+            (
+                "p95_ms",
+                before["p95_ms"],
+                now["p95_ms"],
+                now["p95_ms"] > before["p95_ms"] * (1 + tolerance)
+                and now["p95_ms"] - before["p95_ms"] > min_delta_ms,
+            ),
+            (
+                "peak_kib",
+                before["peak_kib"],
+                now["peak_kib"],
+                now["peak_kib"] > before["peak_kib"] * (1 + tolerance),
+            ),
+        ]
+        for metric, old, new, failed in checks:
+            if failed:
+                regressions.append(
+                    {
+                        "endpoint": name,
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                    }
+                )
+    return regressions
@@ -0,0 +1,102 @@
+# backend_api/services/category_groups.py
+"""
+Grupy kategorii jako dane (model CategoryGroup) z cache'em w procesie.
+
+Zestaw "spending-ratio" dzieli wydatki na invest / spending / fun,
+zestaw "bar-shops" to domyślne kategorie wydatków i przychodów wykresu
+sklepów. Wpisy są cache'owane per proces na CATEGORY_GROUPS_TTL sekund;
+zapis z panelu admina czyści cache od razu (pozostałe workery odświeżą
+się po TTL). Pusty zestaw w bazie → wartości domyślne z DEFAULTS.
+"""
+
+import threading
+import time
+from typing import Dict, Tuple
+
+from django.conf import settings
+
+from backend_api.models import CategoryGroup
+
+SPENDING_RATIO = "spending-ratio"
+BAR_SHOPS = "bar-shops"
+
+Groups = Dict[str, Tuple[str, ...]]
+
+DEFAULTS: Dict[str, Groups] = {
+    SPENDING_RATIO: {
+        "invest": ("investments_savings",),
+        "spending": ("fuel", "car_expenses", "food_drinks", "chemistry", "flat_bills"),
+        "fun": (
+            "fastfood",
+            "alcohol",
+            "clothes",
+            "electronics_games",
+            "tickets_entrance",
+            "delivery",
+            "other_shopping",
+            "monthly_subscriptions",
+            "other_cyclical_expenses",
+            "other",
+        ),
+    },
+    BAR_SHOPS: {
+        "expense": (
+            "fuel",
+            "car_expenses",
+            "fastfood",
+            "alcohol",
+            "food_drinks",
+            "chemistry",
+            "clothes",
+            "electronics_games",
+            "tickets_entrance",
+            "delivery",
+            "other_shopping",
+            "flat_bills",
+            "monthly_subscriptions",
+            "other_cyclical_expenses",
+            "investments_savings",
+            "other",
+        ),
+        "income": (
+            "for_study",
+            "work_income",
+            "family_income",
+            "investments_income",
+            "money_back",
+            "other",
+        ),
+    },
+}
+
+_lock = threading.Lock()
+# zestaw → (monotonic czas wczytania, grupy)
+_cache: Dict[str, Tuple[float, Groups]] = {}
+
+
+def groups(group_set: str) -> Groups:
+    """{nazwa grupy: (kategorie, ...)} w kolejności `position`."""
+    ttl = getattr(settings, "CATEGORY_GROUPS_TTL", 300)
+    with _lock:
+        hit = _cache.get(group_set)
+    if hit is not None and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+
+    loaded: Dict[str, list] = {}
+    rows = CategoryGroup.objects.filter(group_set=group_set).values_list(
+        "name", "category"
+    )
+    for name, category in rows:
+        loaded.setdefault(name, []).append(category)
+    result = {name: tuple(cats) for name, cats in loaded.items()}
+    if not result:
+        result = dict(DEFAULTS.get(group_set, {}))
+
+    with _lock:
+        _cache[group_set] = (time.monotonic(), result)
+    return result
+
+
+def invalidate() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,255 @@
+# backend_api/services/columnar.py
+"""
+Kolumnowy silnik analityki oparty o NumPy.
+
+Pozycje okresu pobierane są jednym zapytaniem `values_list` (Receipt →
+pozycje i ownerzy, LEFT JOIN – paragony bez pozycji też wracają, bo ich
+płatnik pojawia się w bar-persons) i zamieniane na płaskie tablice: data (ordinal), kod kategorii,
+typ transakcji, wartość w groszach i maska bitowa ownerów. Sumy dzienne/miesięczne, per kategoria
+i per płatnik liczone są wektorowo (`bincount`/`cumsum`).
+
+Udział liczony jest w mikrozłotych i zaokrąglany jak Decimal.quantize
+(half-even), więc wyniki zgadzają się z ledgerem co do grosza.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+from backend_api.models import Item, Receipt
+
+CATEGORIES = [code for code, _ in Item.CATEGORY_CHOICES]
+CATEGORY_CODES = {code: idx for idx, code in enumerate(CATEGORIES)}
+LAST_MONTH_BALANCE = CATEGORY_CODES["last_month_balance"]
+TX_CODES = {"expense": 0, "income": 1}
+
+MASK_BITS = 64
+GROSZ_TO_MICRO = 10_000
+MICRO = 1_000_000
+
+
+class MaskOverflow(Exception):
+    """Więcej osób w okresie niż bitów maski – użyj ścieżki SQL."""
+
+
+def enabled() -> bool:
+    """Czy widoki mają liczyć przez silnik NumPy (settings.ANALYTICS_ENGINE)."""
+    return getattr(settings, "ANALYTICS_ENGINE", "sql") == "numpy"
+
+
+def load_period(year: int, month: Optional[int] = None) -> "PeriodColumns":
+    """Kolumny dla miesiąca albo całego roku."""
+    if month is None:
+        return PeriodColumns(date(year, 1, 1), date(year + 1, 1, 1))
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return PeriodColumns(date(year, month, 1), end)
+
+
+class PeriodColumns:
+    """Pozycje paragonów z okresu [start, end) jako tablice kolumnowe."""
+
+    def __init__(self, start: date, end: date):
+        self.start, self.end = start, end
+        rows = list(
+            Receipt.objects.filter(
+                payment_date__gte=start, payment_date__lt=end
+            ).values_list(
+                "id",
+                "items__id",
+                "payment_date",
+                "transaction_type",
+                "payer_id",
+                "items__category",
+                "items__value",
+                "items__owners__id",
+            )
+        )
+        self._build(rows)
+
+    def _build(self, all_rows):
+        rows = [r for r in all_rows if r[1] is not None]
+        # paragony bez pozycji – tylko płatnik i typ (dla listy płatników)
+        empty = [r for r in all_rows if r[1] is None and r[4] is not None]
+        empty_payers = np.fromiter((r[4] for r in empty), np.int64, len(empty))
+        n = len(rows)
+        receipt_ids = np.fromiter((r[0] for r in rows), np.int64, n)
+        item_ids = np.fromiter((r[1] for r in rows), np.int64, n)
+        dates = np.fromiter((r[2].toordinal() for r in rows), np.int64, n)
+        months = np.fromiter((r[2].month for r in rows), np.int64, n)
+        tx = np.fromiter((TX_CODES[r[3]] for r in rows), np.int8, n)
+        payers = np.fromiter((r[4] for r in rows), np.int64, n)
+        cats = np.fromiter((CATEGORY_CODES[r[5]] for r in rows), np.int64, n)
+        grosze = np.fromiter((int(r[6] * 100) for r in rows), np.int64, n)
+        owners = np.fromiter(
+            (r[7] if r[7] is not None else -1 for r in rows), np.int64, n
+        )
+
+        # osoby (ownerzy i płatnicy) → gęsty indeks bitu w masce
+        self.persons = np.unique(
+            np.concatenate([owners[owners >= 0], payers, empty_payers])
+        )
+        if len(self.persons) > MASK_BITS:
+            raise MaskOverflow(f"{len(self.persons)} osób > {MASK_BITS} bitów")
+
+        # jeden wiersz na (paragon, pozycja); maska = OR bitów ownerów
+        keys = (receipt_ids << 32) | item_ids
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        owner_bits = np.zeros(n, np.uint64)
+        has_owner = owners >= 0
+        owner_bits[has_owner] = np.left_shift(
+            np.uint64(1),
+            np.searchsorted(self.persons, owners[has_owner]).astype(np.uint64),
+        )
+        mask = np.zeros(len(first), np.uint64)
+        np.bitwise_or.at(mask, inverse, owner_bits)
+
+        self.receipt = receipt_ids[first]
+        self.date = dates[first]
+        self.month = months[first]
+        self.tx = tx[first]
+        self.category = cats[first]
+        self.grosze = grosze[first]
+        self.payer = np.searchsorted(self.persons, payers[first])
+        self.mask = mask
+        self.empty_payer = np.searchsorted(self.persons, empty_payers)
+        self.empty_tx = np.fromiter((TX_CODES[r[3]] for r in empty), np.int8)
+        self.owner_count = np.bitwise_count(mask).astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.rint(self.grosze * GROSZ_TO_MICRO / self.owner_count)
+        self.share = np.where(self.owner_count > 0, share, 0).astype(np.int64)
+
+    # --- pomocnicze ---
+
+    def bits_of(self, person_ids: Iterable[int]) -> np.uint64:
+        bits = np.uint64(0)
+        for pid in person_ids:
+            idx = np.searchsorted(self.persons, pid)
+            if idx < len(self.persons) and self.persons[idx] == pid:
+                bits |= np.uint64(1) << np.uint64(idx)
+        return bits
+
+    @staticmethod
+    def _to_pln(micro) -> float:
+        return round(float(micro) / MICRO, 2)
+
+    # --- agregacje ---
+
+    def cumulative(self, owner_id: int, granularity: str = "daily") -> List[Dict]:
+        """Kumulowane wydatki/przychody ownera (dziennie w miesiącu lub miesięcznie)."""
+        bit = self.bits_of([owner_id])
+        sel = ((self.mask & bit) != 0) & (self.category != LAST_MONTH_BALANCE)
+        if granularity == "daily":
+            index = self.date - self.start.toordinal()
+            size = self.end.toordinal() - self.start.toordinal()
+        else:
+            index = self.month - 1
+            size = 12
+
+        curves = {}
+        for name, code in TX_CODES.items():
+            pick = sel & (self.tx == code)
+            daily = np.bincount(index[pick], weights=self.share[pick], minlength=size)
+            curves[name] = np.cumsum(daily)
+
+        results = []
+        for i in range(size):
+            if granularity == "daily":
+                day = date.fromordinal(self.start.toordinal() + i).isoformat()
+            else:
+                day = f"{self.start.year}-{i + 1:02d}-01"
+            results.append(
+                {
+                    "day": day,
+                    "expense": self._to_pln(curves["expense"][i]),
+                    "income": self._to_pln(curves["income"][i]),
+                }
+            )
+        return results
+
+    def category_totals(
+        self, owner_ids: Iterable[int], transaction_type: Optional[str] = None
+    ) -> Dict[str, float]:
+        """Suma udziałów wybranych ownerów per kategoria (wszyscy, gdy brak)."""
+        owner_ids = list(owner_ids)
+        if owner_ids:
+            held = np.bitwise_count(self.mask & self.bits_of(owner_ids))
+        else:
+            held = self.owner_count
+        weights = self.share * held.astype(np.int64)
+        sel = (held > 0) & (self.category != LAST_MONTH_BALANCE)
+        if transaction_type in TX_CODES:
+            sel &= self.tx == TX_CODES[transaction_type]
+        totals = np.bincount(
+            self.category[sel], weights=weights[sel], minlength=len(CATEGORIES)
+        )
+        return {
+            CATEGORIES[code]: self._to_pln(total)
+            for code, total in enumerate(totals)
+            if np.any(sel & (self.category == code))
+        }
+
+    def payer_sums(
+        self,
+        payer_ids: Iterable[int] = (),
+        categories: Iterable[str] = (),
+        num_top: int = 3,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Wydatki per płatnik: "shared" (płatnik wśród >1 ownerów)
+        i "not own" (płatnik spoza ownerów), z paragonami i top outlierami.
+        """
+        expense = self.tx == TX_CODES["expense"]
+        empty_expense = self.empty_tx == TX_CODES["expense"]
+        if payer_ids:
+            wanted = np.searchsorted(self.persons, list(payer_ids))
+            wanted = [
+                idx
+                for idx, pid in zip(wanted, payer_ids)
+                if idx < len(self.persons) and self.persons[idx] == pid
+            ]
+            expense &= np.isin(self.payer, wanted)
+            empty_expense &= np.isin(self.empty_payer, wanted)
+
+        # paragony (wszystkie pozycje) → suma do wyboru outlierów
+        receipt_ids, receipt_index = np.unique(self.receipt, return_inverse=True)
+        receipt_totals = np.bincount(receipt_index, weights=self.grosze)
+
+        counted = expense & (self.category != LAST_MONTH_BALANCE)
+        if categories:
+            codes = [CATEGORY_CODES.get(c, -1) for c in categories]
+            counted &= np.isin(self.category, codes)
+        payer_bit = np.left_shift(np.uint64(1), self.payer.astype(np.uint64))
+        payer_in = (self.mask & payer_bit) != 0
+        buckets = {
+            "shared_expenses": counted & payer_in & (self.owner_count > 1),
+            "not_own_expenses": counted & ~payer_in,
+        }
+
+        # płatnicy z paragonów bez pozycji też są na liście (z zerami)
+        payers = np.unique(
+            np.concatenate([self.payer[expense], self.empty_payer[empty_expense]])
+        )
+        result = {}
+        for name, sel in buckets.items():
+            sums = np.bincount(
+                self.payer[sel], weights=self.grosze[sel], minlength=len(self.persons)
+            )
+            rows = []
+            for p in payers:
+                pick = sel & (self.payer == p)
+                ids = np.unique(self.receipt[pick])
+                idx = np.searchsorted(receipt_ids, ids)
+                order = np.argsort(-receipt_totals[idx], kind="stable")
+                rows.append(
+                    {
+                        "payer": int(self.persons[p]),
+                        "expense_sum": float(sums[p]) / 100,
+                        "receipt_ids": [int(i) for i in ids],
+                        "top_outlier_receipts": [int(i) for i in ids[order][:num_top]],
+                    }
+                )
+            rows.sort(key=lambda r: r["expense_sum"], reverse=True)
+            result[name] = rows
+        return result
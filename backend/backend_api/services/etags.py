@@ -0,0 +1,54 @@
+# backend_api/services/etags.py
+"""
+Silne ETagi dla odpowiedzi analitycznych i listy paragonów.
+ETag wylicza się z tokenów wersji danych – bez wykonywania właściwego zapytania.
+"""
+
+import hashlib
+
+from django.http import HttpResponseNotModified
+
+
+def normalized_params(query_params) -> str:
+    """
+    Parametry zapytania w kanonicznej postaci: klucze posortowane, wartości
+    powtórzonego klucza w kolejności z żądania – widoki czytają np. pierwszego
+    z `owners[]`, więc `owners[]=2&owners[]=1` to inna odpowiedź.
+    """
+    parts = []
+    for key in sorted(query_params.keys()):
+        for value in query_params.getlist(key):
+            parts.append(f"{key}={value}")
+    return "&".join(parts)
+
+
+def fingerprint(endpoint: str, query_params, token: str) -> str:
+    raw = "|".join([endpoint, normalized_params(query_params), token])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def make_etag(fingerprint_hex: str) -> str:
+    return f'"{fingerprint_hex}"'
+
+
+def matches(request, etag: str) -> bool:
+    """Czy nagłówek If-None-Match klienta zawiera ten ETag (lub `*`)."""
+    header = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if not header:
+        return False
+    candidates = {c.strip() for c in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def tag(response, etag: str):
+    """
+    Dokleja ETag; `no-cache` każe przeglądarce zawsze rewalidować
+    (sama wyśle If-None-Match i dostanie 304 bez ciała).
+    """
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(etag: str) -> HttpResponseNotModified:
+    return tag(HttpResponseNotModified(), etag)
@@ -0,0 +1,164 @@
+# backend_api/services/fingerprints.py
+"""
+Odcisk treści paragonu do wykrywania duplikatów.
+
+Hash (blake2b, 16 bajtów → 32 znaki hex) z: znormalizowanej nazwy sklepu
+(małe litery, pojedyncze spacje), daty, płatnika, typu transakcji
+i posortowanych par (kategoria, wartość). Trzymany w indeksowanej kolumnie
+`Receipt.fingerprint` i odświeżany w `receipts_saved` / `items_deleted`,
+więc każda ścieżka zapisu go aktualizuje. Tworzenie i import liczą go
+z danych przed zapisem (`of_data`), żeby ostrzec albo odrzucić duplikat.
+"""
+
+import hashlib
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db.models import Count
+
+from backend_api.models import Item, Receipt
+
+MODES = ("allow", "warn", "reject")
+REFRESH_BATCH_SIZE = 500
+CENT = Decimal("0.01")
+
+
+def mode(value: str = "") -> str:
+    """Tryb z parametru `duplicates` albo domyślny z settings; ValueError gdy nieznany."""
+    chosen = value or getattr(settings, "RECEIPT_DUPLICATES", "allow")
+    if chosen not in MODES:
+        raise ValueError(f"duplicates: {' | '.join(MODES)}")
+    return chosen
+
+
+def of_data(
+    shop: str,
+    payment_date,
+    payer_id: int,
+    transaction_type: str,
+    items: Iterable[Tuple[str, Decimal]],
+) -> str:
+    """Odcisk z pól paragonu i par (kategoria, wartość) jego pozycji."""
+    parts = [
+        " ".join(str(shop).split()).lower(),
+        payment_date.isoformat(),
+        str(payer_id),
+        transaction_type,
+    ]
+    parts += sorted(
+        f"{category}={Decimal(value).quantize(CENT)}" for category, value in items
+    )
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def of_attrs(attrs: Dict) -> str:
+    """Odcisk ze zwalidowanych danych ReceiptSerializer (payer jako Person albo id)."""
+    payer = attrs["payer"]
+    return of_data(
+        attrs["shop"],
+        attrs["payment_date"],
+        getattr(payer, "pk", payer),
+        attrs["transaction_type"],
+        [(item["category"], item["value"]) for item in attrs.get("items", [])],
+    )
+
+
+def refresh(receipt_ids: Iterable[int]) -> int:
+    """Przelicza odciski paragonów (2 zapytania + zapis zmienionych)."""
+    ids = {rid for rid in receipt_ids if rid is not None}
+    if not ids:
+        return 0
+    items = defaultdict(list)
+    for receipt_id, category, value in Item.objects.filter(
+        receipt_id__in=ids
+    ).values_list("receipt_id", "category", "value"):
+        items[receipt_id].append((category, value))
+
+    stale = []
+    for receipt in Receipt.objects.filter(id__in=ids).only(
+        "id", "shop", "payment_date", "payer_id", "transaction_type", "fingerprint"
+    ):
+        fp = of_data(
+            receipt.shop,
+            receipt.payment_date,
+            receipt.payer_id,
+            receipt.transaction_type,
+            items[receipt.id],
+        )
+        if fp != receipt.fingerprint:
+            receipt.fingerprint = fp
+            stale.append(receipt)
+    Receipt.objects.bulk_update(stale, ["fingerprint"], batch_size=REFRESH_BATCH_SIZE)
+    return len(stale)
+
+
+def existing(fingerprints: Iterable[str]) -> Dict[str, List[int]]:
+    """{odcisk: [id paragonów]} dla odcisków, które już są w bazie – jedno zapytanie."""
+    found = defaultdict(list)
+    rows = (
+        Receipt.objects.filter(fingerprint__in=set(fingerprints))
+        .order_by("id")
+        .values_list("fingerprint", "id")
+    )
+    for fp, receipt_id in rows:
+        found[fp].append(receipt_id)
+    return dict(found)
+
+
+def find(fingerprints: List[str]) -> List[Dict]:
+    """
+    Raport duplikatów dla listy odcisków nowych paragonów: `duplicate_of` –
+    id paragonów z bazy, `duplicate_of_index` – wcześniejsza pozycja tej
+    samej listy. Tylko pozycje z duplikatem; jedno zapytanie.
+    """
+    found = existing(fingerprints)
+    first_index: Dict[str, int] = {}
+    report = []
+    for index, fp in enumerate(fingerprints):
+        entry = {"index": index, "duplicate_of": found.get(fp, [])}
+        if fp in first_index:
+            entry["duplicate_of_index"] = first_index[fp]
+        first_index.setdefault(fp, index)
+        if entry["duplicate_of"] or "duplicate_of_index" in entry:
+            report.append(entry)
+    return report
+
+
+def duplicates() -> List[Dict]:
+    """
+    Grupy paragonów o tym samym odcisku (po indeksie fingerprint) – jedno
+    zapytanie: paragony, których odcisk występuje więcej niż raz.
+    """
+    repeated = (
+        Receipt.objects.exclude(fingerprint="")
+        .values("fingerprint")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values("fingerprint")
+    )
+    groups: Dict[str, Dict] = {}
+    rows = (
+        Receipt.objects.filter(fingerprint__in=repeated)
+        .order_by("fingerprint", "id")
+        .values(
+            "id", "fingerprint", "payment_date", "payer", "shop", "transaction_type"
+        )
+    )
+    for row in rows:
+        group = groups.setdefault(
+            row["fingerprint"],
+            {
+                "fingerprint": row["fingerprint"],
+                "payment_date": row["payment_date"],
+                "payer": row["payer"],
+                "shop": row["shop"],
+                "transaction_type": row["transaction_type"],
+                "count": 0,
+                "receipt_ids": [],
+            },
+        )
+        group["count"] += 1
+        group["receipt_ids"].append(row["id"])
+    return list(groups.values())
@@ -0,0 +1,183 @@
+# backend_api/services/idempotency.py
+"""
+Nagłówek `Idempotency-Key` dla zapisów (tworzenie paragonów, saldo, import).
+
+Pierwsze żądanie z kluczem zakłada wiersz IdempotencyKey (status NULL =
+w toku) – unikalne (scope, key) sprawia, że przy równoległych ponowieniach
+wygrywa dokładnie jedno. Po odpowiedzi < 500 wiersz dostaje status i treść;
+kolejne żądania z tym kluczem dostają ją z powrotem bez dotykania
+Receipt/Item (nagłówek `Idempotent-Replayed: true`). Ponowienie w trakcie
+→ 409, ten sam klucz z inną treścią → 422. Błąd 5xx / wyjątek zwalnia
+klucz, żeby klient mógł spróbować jeszcze raz. Klucz w toku starszy niż
+IDEMPOTENCY_CLAIM_TIMEOUT sekund (proces padł w trakcie) przejmuje kolejne
+ponowienie. Klucze starsze niż IDEMPOTENCY_TTL sekund są usuwane przy
+zakładaniu nowych.
+"""
+
+import functools
+import hashlib
+import json
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from rest_framework.response import Response
+
+from backend_api.models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+CLAIM_ATTEMPTS = 3
+
+
+def ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_TTL", 60 * 60 * 24))
+
+
+def claim_timeout() -> timedelta:
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_CLAIM_TIMEOUT", 60))
+
+
+def request_hash(request) -> str:
+    """Hash metody, ścieżki, parametrów, danych i przesłanych plików."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{request.method} {request.path}".encode())
+    digest.update(json.dumps(sorted(request.query_params.lists())).encode())
+    data = request.data
+    if hasattr(data, "lists"):  # QueryDict z formularza
+        data = {name: values for name, values in data.lists()}
+    digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+    for name in sorted(request.FILES):
+        upload = request.FILES[name]
+        digest.update(name.encode())
+        for chunk in upload.chunks():
+            digest.update(chunk)
+        upload.seek(0)
+    return digest.hexdigest()
+
+
+def evict_expired() -> int:
+    """Usuwa klucze starsze niż TTL; zwraca liczbę usuniętych."""
+    deleted, _ = IdempotencyKey.objects.filter(
+        created_at__lt=timezone.now() - ttl()
+    ).delete()
+    return deleted
+
+
+def claim(scope: str, key: str, fingerprint: str) -> Optional[IdempotencyKey]:
+    """
+    Zakłada klucz w toku i zwraca None; gdy klucz już jest – zwraca
+    istniejący wiersz. Przeterminowany wiersz jest zastępowany, a porzucony
+    w toku (to samo żądanie, starszy niż claim_timeout) – przejmowany.
+    """
+    evict_expired()
+    for _ in range(CLAIM_ATTEMPTS):
+        try:
+            # savepoint: przegrany wyścig nie psuje zewnętrznej transakcji
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    scope=scope, key=key, request_hash=fingerprint
+                )
+            return None
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+            if record is not None and _abandoned(record, fingerprint):
+                # warunkowy UPDATE – z równoległych ponowień przejmuje jedno
+                if IdempotencyKey.objects.filter(
+                    pk=record.pk,
+                    status_code__isnull=True,
+                    created_at=record.created_at,
+                ).update(created_at=timezone.now()):
+                    return None
+                continue
+            if record is not None:
+                return record
+            # zwolniony w międzyczasie (5xx u zwycięzcy) – próbujemy jeszcze raz
+    raise IntegrityError(f"Nie udało się zająć klucza {scope}:{key}")
+
+
+def _abandoned(record: IdempotencyKey, fingerprint: str) -> bool:
+    return (
+        record.status_code is None
+        and record.request_hash == fingerprint
+        and record.created_at < timezone.now() - claim_timeout()
+    )
+
+
+def _body(response) -> str:
+    if isinstance(response, Response):
+        return json.dumps(response.data, cls=DjangoJSONEncoder)
+    return response.content.decode(response.charset or "utf-8")
+
+
+def replay(record: IdempotencyKey) -> HttpResponse:
+    response = HttpResponse(
+        record.body, status=record.status_code, content_type=record.content_type
+    )
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(scope: str) -> Callable:
+    """
+    Dekorator widoku zapisu (funkcja DRF lub metoda APIView). Bez nagłówka
+    `Idempotency-Key` widok działa jak dotąd.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(a for a in args if hasattr(a, "query_params"))
+            key = request.headers.get(HEADER)
+            if not key:
+                return view(*args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return JsonResponse(
+                    {"detail": f"{HEADER}: max {MAX_KEY_LENGTH} znaków."}, status=400
+                )
+
+            fingerprint = request_hash(request)
+            record = claim(scope, key, fingerprint)
+            if record is not None:
+                if record.request_hash != fingerprint:
+                    return JsonResponse(
+                        {"detail": f"{HEADER} użyty już z innym żądaniem."},
+                        status=422,
+                    )
+                if record.status_code is None:
+                    response = JsonResponse(
+                        {"detail": "Żądanie z tym kluczem jest w toku."}, status=409
+                    )
+                    response["Retry-After"] = "1"
+                    return response
+                return replay(record)
+
+            pending = IdempotencyKey.objects.filter(scope=scope, key=key)
+            try:
+                response = view(*args, **kwargs)
+            except BaseException:
+                # także SystemExit przy timeoucie workera – klucz wraca do puli
+                pending.delete()
+                raise
+            if response.status_code >= 500:
+                pending.delete()
+                return response
+
+            pending.update(
+                status_code=response.status_code,
+                content_type=(
+                    "application/json"
+                    if isinstance(response, Response)
+                    else response.get("Content-Type", "")
+                ),
+                body=_body(response),
+            )
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,77 @@
+# backend_api/services/item_gc.py
+"""
+Sprzątanie i kontrola spójności tabeli Item.
+
+Wszystkie wyszukiwania to anti-joiny (`NOT EXISTS`), więc koszt nie zależy
+od liczby pozycji w Pythonie. Sieroty usuwane są partiami, żeby nie trzymać
+długich blokad przy dużych zaległościach.
+
+Od migracji na `Item.receipt` (FK) pozycja ma zawsze dokładnie jeden
+paragon – sierotą może być już tylko wiersz z wiszącym `receipt_id`
+(np. po ręcznych zmianach w bazie z wyłączonymi kluczami obcymi).
+"""
+
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from backend_api.models import Item, Receipt
+
+GC_BATCH_SIZE = 500
+
+ItemOwners = Item.owners.through
+
+
+def orphan_items():
+    """Pozycje, których paragon nie istnieje."""
+    return Item.objects.filter(
+        ~Exists(Receipt.objects.filter(pk=OuterRef("receipt_id")))
+    )
+
+
+def ownerless_items():
+    """Pozycje bez żadnego właściciela (nie trafiają do ledgera udziałów)."""
+    return Item.objects.filter(
+        ~Exists(ItemOwners.objects.filter(item_id=OuterRef("pk")))
+    )
+
+
+def report(sample: int = 20) -> Dict[str, Dict]:
+    """Liczniki (i przykładowe id) każdej kategorii niespójności."""
+    checks = {
+        "orphan_items": orphan_items().order_by("id").values_list("id", flat=True),
+        "ownerless_items": ownerless_items()
+        .order_by("id")
+        .values_list("id", flat=True),
+    }
+    return {
+        name: {"count": ids.count(), "sample": list(ids[:sample])}
+        for name, ids in checks.items()
+    }
+
+
+def collect_orphans(
+    batch_size: int = GC_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    dry_run: bool = False,
+) -> List[int]:
+    """
+    Usuwa sieroty partiami po `batch_size` (najwyżej `max_batches` partii).
+    Zwraca liczby usuniętych pozycji per partia; przy `dry_run` tylko liczy.
+    """
+    if dry_run:
+        return [orphan_items().count()]
+
+    deleted = []
+    while max_batches is None or len(deleted) < max_batches:
+        with transaction.atomic():
+            ids = list(
+                orphan_items().order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            # Exists liczony ponownie – pozycja przypięta w międzyczasie zostaje
+            _, per_model = orphan_items().filter(id__in=ids).delete()
+        deleted.append(per_model.get(Item._meta.label, 0))
+    return deleted
@@ -0,0 +1,76 @@
+# backend_api/services/ledger.py
+from decimal import Decimal
+from typing import Iterable, List
+
+from backend_api.models import ItemShare, Receipt
+
+SHARE_QUANTUM = Decimal("0.000001")
+LEDGER_BATCH_SIZE = 500
+
+
+def compute_share(value, owners_count: int) -> Decimal:
+    """Udział jednego właściciela w pozycji (value / liczba ownerów)."""
+    if not owners_count:
+        return Decimal(0)
+    return (Decimal(value) / owners_count).quantize(SHARE_QUANTUM)
+
+
+def build_receipt_shares(receipt: Receipt) -> List[ItemShare]:
+    """
+    Buduje (bez zapisu) wiersze ledgera dla paragonu.
+    Zakłada prefetch `items__owners` – nie wykonuje dodatkowych zapytań.
+    """
+    rows = []
+    for item in receipt.items.all():
+        owners = list(item.owners.all())
+        share = compute_share(item.value, len(owners))
+        for owner in owners:
+            rows.append(
+                ItemShare(
+                    receipt_id=receipt.id,
+                    item_id=item.id,
+                    owner_id=owner.id,
+                    share=share,
+                    payment_date=receipt.payment_date,
+                    category=item.category,
+                    transaction_type=receipt.transaction_type,
+                )
+            )
+    return rows
+
+
+def rebuild_shares(receipt_ids: Iterable[int]) -> int:
+    """
+    Przelicza ledger udziałów dla podanych paragonów (delete + bulk insert).
+    Zwraca liczbę zapisanych wierszy.
+    """
+    ids = {rid for rid in receipt_ids if rid is not None}
+    if not ids:
+        return 0
+
+    ItemShare.objects.filter(receipt_id__in=ids).delete()
+
+    receipts = Receipt.objects.filter(id__in=ids).prefetch_related("items__owners")
+    rows = []
+    for receipt in receipts:
+        rows.extend(build_receipt_shares(receipt))
+
+    ItemShare.objects.bulk_create(rows, batch_size=LEDGER_BATCH_SIZE)
+    return len(rows)
+
+
+def drop_shares(receipt_ids: Iterable[int]) -> None:
+    """Usuwa wiersze ledgera dla paragonów (np. przed ich usunięciem)."""
+    ids = {rid for rid in receipt_ids if rid is not None}
+    if ids:
+        ItemShare.objects.filter(receipt_id__in=ids).delete()
+
+
+def rebuild_all_shares(batch_size: int = LEDGER_BATCH_SIZE) -> int:
+    """Przebudowuje cały ledger od zera (np. po ręcznych zmianach w adminie)."""
+    ItemShare.objects.all().delete()
+    total = 0
+    ids = list(Receipt.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(ids), batch_size):
+        total += rebuild_shares(ids[start : start + batch_size])
+    return total
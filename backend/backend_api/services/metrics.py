@@ -0,0 +1,135 @@
+# backend_api/services/metrics.py
+"""
+Metryki żądań HTTP trzymane w pamięci procesu.
+
+`RequestMetricsMiddleware` po każdym żądaniu wywołuje `observe` z czasem
+całkowitym, czasem SQL, liczbą zapytań i rozmiarem odpowiedzi. Wartości
+trafiają do histogramów per (widok, metoda); `render` zwraca je w formacie
+tekstowym Prometheusa (/api/debug/metrics). Liczniki są per proces – przy
+kilku workerach każdy ma własne.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Tuple
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# nazwa metryki → (opis, granice kubełków)
+HISTOGRAMS = {
+    "http_request_duration_seconds": (
+        "Czas obsługi żądania (wall time).",
+        DURATION_BUCKETS,
+    ),
+    "http_request_db_seconds": (
+        "Łączny czas zapytań SQL w żądaniu.",
+        DURATION_BUCKETS,
+    ),
+    "http_request_queries": ("Liczba zapytań SQL w żądaniu.", QUERY_BUCKETS),
+    "http_response_size_bytes": ("Rozmiar odpowiedzi w bajtach.", SIZE_BUCKETS),
+}
+
+
+class Histogram:
+    """Skumulowany histogram w stylu Prometheusa (kubełki `le` + sum + count)."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # ostatni kubełek to +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        rows, running = [], 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            running += count
+            rows.append((str(bound), running))
+        return rows
+
+
+_lock = threading.Lock()
+# (metryka, widok, metoda) → Histogram
+_histograms: Dict[Tuple[str, str, str], Histogram] = {}
+# (widok, metoda, status) → liczba odpowiedzi
+_responses: Counter = Counter()
+
+
+def observe(
+    view: str,
+    method: str,
+    status: int,
+    duration: float,
+    db_time: float,
+    queries: int,
+    size: int,
+) -> None:
+    values = {
+        "http_request_duration_seconds": duration,
+        "http_request_db_seconds": db_time,
+        "http_request_queries": queries,
+        "http_response_size_bytes": size,
+    }
+    with _lock:
+        for name, value in values.items():
+            key = (name, view, method)
+            histogram = _histograms.get(key)
+            if histogram is None:
+                histogram = _histograms[key] = Histogram(HISTOGRAMS[name][1])
+            histogram.observe(value)
+        _responses[(view, method, str(status))] += 1
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _responses.clear()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    """Wszystkie metryki w formacie tekstowym Prometheusa 0.0.4."""
+    with _lock:
+        snapshot = {
+            key: (h.cumulative(), h.sum, h.count) for key, h in _histograms.items()
+        }
+        responses = dict(_responses)
+
+    lines = [
+        "# HELP http_responses_total Liczba odpowiedzi per widok, metoda i status.",
+        "# TYPE http_responses_total counter",
+    ]
+    for (view, method, status), count in sorted(responses.items()):
+        lines.append(
+            f'http_responses_total{{view="{_label(view)}",method="{method}",'
+            f'status="{status}"}} {count}'
+        )
+
+    for name, (help_text, _) in HISTOGRAMS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (metric, view, method), (buckets, total, count) in sorted(snapshot.items()):
+            if metric != name:
+                continue
+            labels = f'view="{_label(view)}",method="{method}"'
+            for bound, running in buckets:
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {running}')
+            lines.append(f"{name}_sum{{{labels}}} {_number(total)}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,97 @@
+# backend_api/services/outliers.py
+"""
+Top-N paragonów (outlierów) per płatnik jednym zapytaniem SQL.
+
+Paragon wchodzi do koszyka płatnika, gdy ma co najmniej jedną liczoną
+pozycję (bez "last_month_balance", opcjonalnie tylko z wybranych
+kategorii):
+  - "shared"  – płatnik jest jednym z >1 ownerów pozycji,
+  - "not_own" – płatnik nie jest ownerem pozycji.
+Ranking idzie po sumie wszystkich pozycji paragonu (malejąco, remis → id),
+`ROW_NUMBER() OVER (PARTITION BY płatnik, koszyk ORDER BY suma DESC)`.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.db.models import Exists, F, OuterRef, Q, Sum, Window
+from django.db.models.functions import RowNumber
+
+from backend_api.models import Item, Receipt
+
+DEFAULT_TOP = 3
+MAX_TOP = 50
+BUCKETS = ("shared", "not_own")
+
+
+def _counted_items(categories: Iterable[str]):
+    items = Item.objects.filter(receipt_id=OuterRef("pk")).exclude(
+        category="last_month_balance"
+    )
+    if categories:
+        items = items.filter(category__in=list(categories))
+    return items
+
+
+def top_receipts(
+    period,
+    payer_ids: Iterable[int] = (),
+    categories: Iterable[str] = (),
+    num_top: int = DEFAULT_TOP,
+) -> Dict[str, Dict[int, List[int]]]:
+    """
+    {"shared": {payer_id: [receipt_id, ...]}, "not_own": {...}} – najwyżej
+    `num_top` paragonów wydatków z okresu na płatnika i koszyk.
+    """
+    if num_top <= 0:
+        return {bucket: {} for bucket in BUCKETS}
+
+    payer_owns = Item.owners.through.objects.filter(
+        item_id=OuterRef("pk"), person_id=OuterRef(OuterRef("payer_id"))
+    )
+    counted = _counted_items(categories)
+
+    receipts = Receipt.objects.filter(
+        period.q(), transaction_type="expense", payer__isnull=False
+    )
+    if payer_ids:
+        receipts = receipts.filter(payer_id__in=list(payer_ids))
+
+    ranked = (
+        receipts.annotate(
+            total=Sum("items__value"),
+            shared=Exists(counted.filter(Exists(payer_owns), owner_count__gt=1)),
+            not_own=Exists(counted.filter(~Exists(payer_owns))),
+        )
+        .annotate(
+            shared_rank=Window(
+                RowNumber(),
+                partition_by=[F("payer_id"), F("shared")],
+                order_by=[F("total").desc(), F("id").asc()],
+            ),
+            not_own_rank=Window(
+                RowNumber(),
+                partition_by=[F("payer_id"), F("not_own")],
+                order_by=[F("total").desc(), F("id").asc()],
+            ),
+        )
+        # partycje "poza koszykiem" też dostają numery – odsiewane niżej
+        .filter(Q(shared_rank__lte=num_top) | Q(not_own_rank__lte=num_top))
+        .values_list(
+            "id", "payer_id", "shared", "shared_rank", "not_own", "not_own_rank"
+        )
+    )
+
+    result = {bucket: defaultdict(list) for bucket in BUCKETS}
+    for receipt_id, payer_id, shared, shared_rank, not_own, not_own_rank in ranked:
+        if shared and shared_rank <= num_top:
+            result["shared"][payer_id].append((shared_rank, receipt_id))
+        if not_own and not_own_rank <= num_top:
+            result["not_own"][payer_id].append((not_own_rank, receipt_id))
+    return {
+        bucket: {
+            payer: [receipt_id for _, receipt_id in sorted(pairs)]
+            for payer, pairs in by_payer.items()
+        }
+        for bucket, by_payer in result.items()
+    }
@@ -0,0 +1,102 @@
+# backend_api/services/owner_mask.py
+"""
+Maska bitowa ownerów pozycji: bit (id - 1) ustawiony dla każdego ownera.
+
+`Item.owner_mask` i `Item.owner_count` pozwalają filtrować po ownerach
+wyrażeniem `owner_mask & maska != 0` bez joinu przez tabelę M2M.
+Maska mieści osoby o id 1..63 (BigInteger ze znakiem); gdy istnieje osoba
+o większym id, `usable()` zwraca False i widoki wracają do joinu po M2M.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable
+
+from django.db.models import BigIntegerField, Exists, F, Max, OuterRef, Value
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
+
+from backend_api.models import Item, Person, Receipt
+
+MASK_BITS = 63
+REFRESH_BATCH_SIZE = 500
+
+
+def bit(person_id: int) -> int:
+    return 1 << (person_id - 1) if 1 <= person_id <= MASK_BITS else 0
+
+
+def mask_of(person_ids: Iterable[int]) -> int:
+    mask = 0
+    for pid in person_ids:
+        mask |= bit(pid)
+    return mask
+
+
+def usable(person_ids: Iterable[int] = ()) -> bool:
+    """Czy maska opisuje wszystkich ownerów (i wszystkie podane id)."""
+    if any(not 1 <= pid <= MASK_BITS for pid in person_ids):
+        return False
+    top = Person.objects.aggregate(top=Max("id"))["top"] or 0
+    return top <= MASK_BITS
+
+
+def has_owner(owner_ids: Iterable[int], prefix: str = ""):
+    """Wyrażenie: pozycja ma któregoś z ownerów (`prefix` np. "items__")."""
+    return GreaterThan(F(f"{prefix}owner_mask").bitand(mask_of(owner_ids)), 0)
+
+
+def payer_is_owner(prefix: str = "items__", payer: str = "payer_id"):
+    """
+    Wyrażenie per wiersz: płatnik paragonu jest ownerem pozycji, czyli
+    `owner_mask & (1 << (payer_id - 1)) != 0`. Tylko gdy `usable()`.
+    """
+    payer_bit = Cast(Value(1), BigIntegerField()).bitleftshift(F(payer) - 1)
+    return GreaterThan(F(f"{prefix}owner_mask").bitand(payer_bit), 0)
+
+
+def receipts_with_owner(queryset, owner_ids: Iterable[int]):
+    """
+    Paragony z co najmniej jedną pozycją wybranych ownerów – `EXISTS`
+    zamiast joinu Receipt → Item → owners i `.distinct()`.
+    """
+    owner_ids = list(owner_ids)
+    if not usable(owner_ids):
+        return queryset.filter(items__owners__id__in=owner_ids).distinct()
+    return queryset.filter(
+        Exists(Item.objects.filter(has_owner(owner_ids), receipt_id=OuterRef("pk")))
+    )
+
+
+def refresh(receipt_ids: Iterable[int]) -> int:
+    """
+    Przelicza maski i liczby ownerów pozycji podanych paragonów.
+    Zapisuje tylko pozycje, w których coś się zmieniło; zwraca ich liczbę.
+    """
+    ids = {rid for rid in receipt_ids if rid is not None}
+    if not ids:
+        return 0
+    owners: Dict[int, set] = defaultdict(set)
+    links = Item.owners.through.objects.filter(item__receipt_id__in=ids)
+    for item_id, person_id in links.values_list("item_id", "person_id"):
+        owners[item_id].add(person_id)
+
+    stale = []
+    for item_id, mask, count in Item.objects.filter(receipt_id__in=ids).values_list(
+        "id", "owner_mask", "owner_count"
+    ):
+        new_mask, new_count = mask_of(owners[item_id]), len(owners[item_id])
+        if (mask, count) != (new_mask, new_count):
+            stale.append(Item(id=item_id, owner_mask=new_mask, owner_count=new_count))
+    Item.objects.bulk_update(
+        stale, ["owner_mask", "owner_count"], batch_size=REFRESH_BATCH_SIZE
+    )
+    return len(stale)
+
+
+def refresh_all(batch_size: int = REFRESH_BATCH_SIZE) -> int:
+    """Przelicza maski wszystkich pozycji (np. po ręcznych zmianach w adminie)."""
+    total = 0
+    ids = list(Receipt.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(ids), batch_size):
+        total += refresh(ids[start : start + batch_size])
+    return total
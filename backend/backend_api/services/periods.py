@@ -0,0 +1,201 @@
+# backend_api/services/periods.py
+"""
+Wspólny resolver okresów dla endpointów analitycznych.
+
+Każdy okres to półotwarty zakres dat `[start, end)`, więc filtr zawsze
+kompiluje się do `payment_date >= start AND payment_date < end` i może
+użyć indeksu na `payment_date` (w przeciwieństwie do `__year`/`__month`,
+które na SQLite zamieniają się w wywołania funkcji na kolumnie).
+
+Obsługiwane `period`:
+  monthly   – year + month            (alias: month)
+  yearly    – year                    (alias: year)
+  quarterly – year + quarter (1–4)    (albo month → kwartał tego miesiąca)
+  weekly    – year + week (ISO)       (albo from → tydzień tej daty)
+  custom    – from + to (daty ISO, `to` włącznie)
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from django.db.models import Q
+
+YearMonth = Tuple[int, int]
+
+PERIODS = ("monthly", "yearly", "quarterly", "weekly", "custom")
+ALIASES = {"month": "monthly", "year": "yearly"}
+
+# górny limit zakresu custom – chroni przed przypadkowym skanem całej bazy
+MAX_CUSTOM_DAYS = 366 * 5
+# to samo dla zakresu miesięcy (`month_range`)
+MAX_RANGE_MONTHS = 12 * 5
+
+
+class PeriodError(ValueError):
+    """Niepoprawne lub brakujące parametry okresu."""
+
+
+def _month_start(year: int, month: int) -> date:
+    return date(year, month, 1)
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+@dataclass(frozen=True)
+class Period:
+    kind: str
+    start: date
+    end: date  # wyłącznie
+
+    @property
+    def year(self) -> int:
+        return self.start.year
+
+    @property
+    def month(self) -> Optional[int]:
+        return self.start.month if self.kind == "monthly" else None
+
+    @property
+    def last_day(self) -> date:
+        return self.end - timedelta(days=1)
+
+    def q(self, field: str = "payment_date") -> Q:
+        """Warunek `field >= start AND field < end`."""
+        return Q(**{f"{field}__gte": self.start, f"{field}__lt": self.end})
+
+    def days(self) -> List[str]:
+        """Wszystkie dni okresu jako YYYY-MM-DD."""
+        count = (self.end - self.start).days
+        return [(self.start + timedelta(days=i)).isoformat() for i in range(count)]
+
+    def months(self, include_next: bool = False) -> List[YearMonth]:
+        """
+        (rok, miesiąc) dotknięte okresem. `include_next` dokłada miesiąc dnia
+        `end` – tam leży saldo zapisane po okresie.
+        """
+        last = self.end if include_next else self.last_day
+        months, cursor = [], _month_start(self.start.year, self.start.month)
+        while cursor <= last:
+            months.append((cursor.year, cursor.month))
+            cursor = _next_month(cursor)
+        return months
+
+    def describe(self) -> dict:
+        return {
+            "period": self.kind,
+            "from": self.start.isoformat(),
+            "to": self.last_day.isoformat(),
+        }
+
+
+def monthly(year: int, month: int) -> Period:
+    start = _month_start(year, month)
+    return Period("monthly", start, _next_month(start))
+
+
+def yearly(year: int) -> Period:
+    return Period("yearly", date(year, 1, 1), date(year + 1, 1, 1))
+
+
+def quarterly(year: int, quarter: int) -> Period:
+    start = date(year, 3 * (quarter - 1) + 1, 1)
+    end = date(year + 1, 1, 1) if quarter == 4 else date(year, 3 * quarter + 1, 1)
+    return Period("quarterly", start, end)
+
+
+def weekly(monday: date) -> Period:
+    return Period("weekly", monday, monday + timedelta(days=7))
+
+
+def custom(start: date, last_day: date) -> Period:
+    return Period("custom", start, last_day + timedelta(days=1))
+
+
+def _int(params, name: str, low: int, high: int) -> int:
+    raw = params.get(name)
+    if raw in (None, ""):
+        raise PeriodError(f"Missing parameter: {name}")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise PeriodError(f"Invalid value for parameter: {name}")
+    if not low <= value <= high:
+        raise PeriodError(f"Invalid value for parameter: {name}")
+    return value
+
+
+def _date(params, name: str) -> date:
+    raw = params.get(name)
+    if not raw:
+        raise PeriodError(f"Missing parameter: {name}")
+    try:
+        return date.fromisoformat(raw)
+    except ValueError:
+        raise PeriodError(f"Invalid value for parameter: {name}")
+
+
+def _year_month(params, name: str) -> date:
+    raw = params.get(name)
+    if not raw:
+        raise PeriodError(f"Missing parameter: {name}")
+    try:
+        # YYYY-MM albo pełna data – liczy się jej miesiąc
+        day = date.fromisoformat(raw if len(raw) > 7 else f"{raw}-01")
+    except ValueError:
+        raise PeriodError(f"Invalid value for parameter: {name}")
+    return _month_start(day.year, day.month)
+
+
+def month_range(params) -> Period:
+    """
+    Pełne miesiące od `from` do `to` włącznie (YYYY-MM) jako okres custom –
+    dla serii miesięcznych (np. saldo miesiąc po miesiącu).
+    """
+    start, last = _year_month(params, "from"), _year_month(params, "to")
+    if last < start:
+        raise PeriodError("'to' must not be before 'from'")
+    count = (last.year - start.year) * 12 + last.month - start.month + 1
+    if count > MAX_RANGE_MONTHS:
+        raise PeriodError(f"Range longer than {MAX_RANGE_MONTHS} months")
+    return Period("custom", start, _next_month(last))
+
+
+def resolve(
+    params, default: str = "monthly", allowed: Optional[Iterable[str]] = None
+) -> Period:
+    """Zamienia parametry zapytania na `Period` albo rzuca `PeriodError`."""
+    kind = params.get("period") or default
+    kind = ALIASES.get(kind, kind)
+    if kind not in (allowed or PERIODS):
+        raise PeriodError(f"Unsupported period: {kind}")
+
+    if kind == "custom":
+        start, last_day = _date(params, "from"), _date(params, "to")
+        if last_day < start:
+            raise PeriodError("'to' must not be before 'from'")
+        if (last_day - start).days >= MAX_CUSTOM_DAYS:
+            raise PeriodError(f"Custom range longer than {MAX_CUSTOM_DAYS} days")
+        return custom(start, last_day)
+
+    if kind == "weekly" and params.get("from"):
+        day = _date(params, "from")
+        return weekly(day - timedelta(days=day.weekday()))
+
+    year = _int(params, "year", 1, 9998)
+    if kind == "monthly":
+        return monthly(year, _int(params, "month", 1, 12))
+    if kind == "yearly":
+        return yearly(year)
+    if kind == "quarterly":
+        if params.get("quarter") in (None, "") and params.get("month"):
+            return quarterly(year, (_int(params, "month", 1, 12) - 1) // 3 + 1)
+        return quarterly(year, _int(params, "quarter", 1, 4))
+    # weekly
+    week = _int(params, "week", 1, 53)
+    try:
+        return weekly(date.fromisocalendar(year, week, 1))
+    except ValueError:
+        raise PeriodError("Invalid value for parameter: week")
@@ -0,0 +1,264 @@
+# backend_api/services/prefix_sums.py
+"""
+Narastające sumy udziałów per owner i dzień (model DailyPrefixSum).
+
+P(d) = suma udziałów ownera od początku danych do dnia d włącznie, osobno
+dla wydatków i przychodów (bez `last_month_balance`). Wiersz istnieje
+tylko dla dni z ruchem, więc P(d) to ostatni wiersz z `day <= d`.
+Wartość narastająco w okresie to P(punkt) - P(dzień przed okresem) –
+dwa odczyty i odejmowanie na punkt, niezależnie od długości okresu.
+
+Zapis: `snapshot` przed i po zmianie paragonów (jak w rollupach),
+`apply_delta` dodaje różnicę do wierszy od zmienionego dnia w przód.
+Liczba zapytań nie zależy od liczby zmienionych dni: brakujące dni
+wstawia jeden bulk_create, ich wartość startową ustawia jeden UPDATE
+z podzapytaniem, a przesunięcie – UPDATE z CASE na paczkę dni.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+
+from backend_api.models import DailyPrefixSum, ItemShare
+
+GRANULARITIES = ("daily", "weekly", "monthly")
+DELTA_BATCH_SIZE = 200
+
+ZERO = Decimal(0)
+# (owner_id, dzień) → (wydatki, przychody)
+DayKey = Tuple[int, date]
+DaySnapshot = Dict[DayKey, Tuple[Decimal, Decimal]]
+
+
+def _grouped(shares_qs) -> DaySnapshot:
+    rows = (
+        shares_qs.exclude(category="last_month_balance")
+        .values("owner_id", "payment_date", "transaction_type")
+        .annotate(total=Sum("share"))
+        .order_by()
+    )
+    result: DaySnapshot = {}
+    for row in rows:
+        key = (row["owner_id"], row["payment_date"])
+        expense, income = result.get(key, (ZERO, ZERO))
+        if row["transaction_type"] == "expense":
+            expense += Decimal(row["total"])
+        else:
+            income += Decimal(row["total"])
+        result[key] = (expense, income)
+    return result
+
+
+def snapshot(receipt_ids: Iterable[int]) -> DaySnapshot:
+    """Dzienne sumy z ledgera dla paragonów, per (owner, dzień)."""
+    ids = {rid for rid in receipt_ids if rid is not None}
+    if not ids:
+        return {}
+    return _grouped(ItemShare.objects.filter(receipt_id__in=ids))
+
+
+def _decimal(value) -> Value:
+    return Value(value, output_field=DecimalField(max_digits=20, decimal_places=6))
+
+
+def _step(steps, index: int) -> Case:
+    """CASE: delta z kroku o najpóźniejszym dniu <= dzień wiersza (kroki malejąco)."""
+    return Case(
+        *[
+            When(owner_id=o, day__gte=d, then=_decimal(step[index]))
+            for o, d, *step in steps
+        ],
+        default=_decimal(ZERO),
+    )
+
+
+def apply_delta(before: DaySnapshot, after: DaySnapshot) -> int:
+    """
+    Dodaje różnicę `after - before` do P(d) każdego dnia od zmienionego
+    w przód. Zwraca liczbę zmienionych (owner, dzień).
+    """
+    deltas = {}
+    for key in set(before) | set(after):
+        old_e, old_i = before.get(key, (ZERO, ZERO))
+        new_e, new_i = after.get(key, (ZERO, ZERO))
+        if new_e != old_e or new_i != old_i:
+            deltas[key] = (new_e - old_e, new_i - old_i)
+    if not deltas:
+        return 0
+
+    owners = {owner_id for owner_id, _ in deltas}
+    existing = set(
+        DailyPrefixSum.objects.filter(
+            owner_id__in=owners, day__in={day for _, day in deltas}
+        ).values_list("owner_id", "day")
+    )
+    missing = [key for key in deltas if key not in existing]
+    if missing:
+        created = DailyPrefixSum.objects.bulk_create(
+            [DailyPrefixSum(owner_id=o, day=d) for o, d in missing],
+            batch_size=DELTA_BATCH_SIZE,
+        )
+        # nowy dzień startuje od P(poprzedni istniejący dzień) – zanim doszła delta
+        new_ids = [row.id for row in created]
+        previous = (
+            DailyPrefixSum.objects.filter(
+                owner_id=OuterRef("owner_id"), day__lt=OuterRef("day")
+            )
+            .exclude(id__in=new_ids)
+            .order_by("-day")
+        )
+        for start in range(0, len(new_ids), DELTA_BATCH_SIZE):
+            DailyPrefixSum.objects.filter(
+                id__in=new_ids[start : start + DELTA_BATCH_SIZE]
+            ).update(
+                expense=Coalesce(Subquery(previous.values("expense")[:1]), ZERO),
+                income=Coalesce(Subquery(previous.values("income")[:1]), ZERO),
+            )
+
+    # każda paczka dodaje swoją funkcję schodkową: dzień >= D dostaje sumę
+    # delt paczki z dni <= dzień (najpóźniejszy pasujący When wygrywa)
+    keys = sorted(deltas)
+    for start in range(0, len(keys), DELTA_BATCH_SIZE):
+        batch = keys[start : start + DELTA_BATCH_SIZE]
+        steps, running = [], {}
+        for owner_id, day in batch:
+            d_e, d_i = deltas[(owner_id, day)]
+            e, i = running.get(owner_id, (ZERO, ZERO))
+            running[owner_id] = (e + d_e, i + d_i)
+            steps.append((owner_id, day, e + d_e, i + d_i))
+        steps.reverse()
+
+        first_day = {}
+        for owner_id, day in batch:
+            first_day.setdefault(owner_id, day)
+        where = Q()
+        for owner_id, day in first_day.items():
+            where |= Q(owner_id=owner_id, day__gte=day)
+        DailyPrefixSum.objects.filter(where).update(
+            expense=F("expense") + _step(steps, 0),
+            income=F("income") + _step(steps, 1),
+        )
+    return len(deltas)
+
+
+def rebuild_all() -> int:
+    """Przelicza wszystkie sumy narastające od zera z ledgera udziałów."""
+    DailyPrefixSum.objects.all().delete()
+    rows = [
+        DailyPrefixSum(owner_id=owner_id, day=day, expense=e, income=i)
+        for (owner_id, day), (e, i) in _expected().items()
+    ]
+    DailyPrefixSum.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def _expected() -> DaySnapshot:
+    prefix: DaySnapshot = {}
+    running: Dict[int, Tuple[Decimal, Decimal]] = defaultdict(lambda: (ZERO, ZERO))
+    for (owner_id, day), (d_e, d_i) in sorted(_grouped(ItemShare.objects).items()):
+        e, i = running[owner_id]
+        running[owner_id] = prefix[(owner_id, day)] = (e + d_e, i + d_i)
+    return prefix
+
+
+def diff_against_ledger() -> List[Dict]:
+    """
+    Porównuje P(d) z ledgerem udziałów. Dni bez ruchu mogą mieć wiersz
+    (np. po usunięciu paragonu) – liczy się tylko wartość P(d) w każdym
+    dniu, który ma wiersz po którejkolwiek stronie. Pusta lista = spójnie.
+    """
+    expected = _expected()
+    stored = {
+        (owner_id, day): (e, i)
+        for owner_id, day, e, i in DailyPrefixSum.objects.values_list(
+            "owner_id", "day", "expense", "income"
+        )
+    }
+
+    mismatches = []
+    exp = act = (ZERO, ZERO)
+    previous_owner = None
+    for owner_id, day in sorted(set(expected) | set(stored)):
+        if owner_id != previous_owner:
+            exp = act = (ZERO, ZERO)
+            previous_owner = owner_id
+        exp = expected.get((owner_id, day), exp)
+        act = stored.get((owner_id, day), act)
+        if exp != act:
+            mismatches.append(
+                {"owner_id": owner_id, "day": day, "expected": exp, "actual": act}
+            )
+    return mismatches
+
+
+def _points(period, granularity: str) -> List[Tuple[date, date]]:
+    """(etykieta, ostatni dzień kubełka) – kubełki przycięte do okresu."""
+    last = period.last_day
+    if granularity == "daily":
+        days = (period.end - period.start).days
+        return [(period.start + timedelta(days=n),) * 2 for n in range(days)]
+
+    points, cursor = [], period.start
+    while cursor <= last:
+        if granularity == "weekly":
+            bucket_end = cursor + timedelta(days=6 - cursor.weekday())
+        else:
+            bucket_end = (
+                date(cursor.year + 1, 1, 1)
+                if cursor.month == 12
+                else date(cursor.year, cursor.month + 1, 1)
+            ) - timedelta(days=1)
+        bucket_end = min(bucket_end, last)
+        points.append((cursor, bucket_end))
+        cursor = bucket_end + timedelta(days=1)
+    return points
+
+
+def series(owner_id: int, period, granularity: str = "daily") -> List[Dict]:
+    """
+    Wydatki i przychody narastająco od początku okresu, punkt na każdy
+    dzień / tydzień / miesiąc (etykieta = pierwszy dzień kubełka w okresie,
+    wartość = stan na jego ostatni dzień). Jedno zapytanie: wiersze okresu
+    plus ostatni wiersz sprzed okresu (P dnia przed startem).
+    """
+    rows_qs = DailyPrefixSum.objects.filter(owner_id=owner_id)
+    anchor = rows_qs.filter(day__lt=period.start).order_by("-day").values("day")[:1]
+    rows = list(
+        rows_qs.filter(
+            Q(day__gte=period.start, day__lt=period.end) | Q(day=Subquery(anchor))
+        )
+        .order_by("day")
+        .values_list("day", "expense", "income")
+    )
+
+    base = (ZERO, ZERO)
+    if rows and rows[0][0] < period.start:
+        base = rows.pop(0)[1:]
+
+    result, index, current = [], 0, base
+    for label, point in _points(period, granularity):
+        while index < len(rows) and rows[index][0] <= point:
+            current = rows[index][1:]
+            index += 1
+        result.append(
+            {
+                "day": label.isoformat(),
+                "expense": round(float(current[0] - base[0]), 2),
+                "income": round(float(current[1] - base[1]), 2),
+            }
+        )
+    return result
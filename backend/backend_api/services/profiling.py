@@ -0,0 +1,129 @@
+# backend_api/services/profiling.py
+"""
+Profilowanie pojedynczych żądań na życzenie (ProfilingMiddleware).
+
+Profil to zrzut cProfile (`<id>.prof`, do otwarcia w pstats/snakeviz)
+plus metadane z podsumowaniem tekstowym (`<id>.json`): najdroższe funkcje
+i podział czasu na SQL, ORM, kod aplikacji i resztę. Pliki leżą w
+PROFILING_DIR jako bufor cykliczny – po zapisie usuwane są najstarsze
+profile ponad PROFILING_KEEP.
+"""
+
+import io
+import itertools
+import json
+import pstats
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+APP_DIR = Path(__file__).resolve().parent.parent
+PROFILE_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9]{6}-[0-9]+$")
+
+_sequence = itertools.count()
+
+
+def profile_dir() -> Path:
+    return Path(getattr(settings, "PROFILING_DIR", "profiles"))
+
+
+def _category(filename: str) -> str:
+    path = filename.replace("\\", "/")
+    if path.startswith(str(APP_DIR).replace("\\", "/")):
+        return "app"
+    if "/django/db/" in path:
+        return "orm"
+    if "/django/" in path or "/rest_framework/" in path:
+        return "framework"
+    return "other"
+
+
+def breakdown(stats: pstats.Stats, total: float, sql: float) -> Dict[str, float]:
+    """
+    Podział czasu żądania (ms). `sql` to czas zmierzony wokół kursora
+    (sterownik + baza); pozostały czas własny funkcji (tottime) liczony
+    jest per kategoria pliku: ORM (django/db), app (backend_api),
+    framework (Django/DRF) i reszta (biblioteki, wbudowane).
+    """
+    own = {"orm": 0.0, "app": 0.0, "framework": 0.0, "other": 0.0}
+    for (filename, _, _), (_, _, tottime, _, _) in stats.stats.items():
+        own[_category(filename)] += tottime
+    # wywołania sterownika (wbudowane `execute`, `fetchmany`) są w "other"
+    own["other"] = max(own["other"] - sql, 0.0)
+    result = {"total_ms": total * 1000, "sql_ms": sql * 1000}
+    result.update({f"{name}_ms": value * 1000 for name, value in own.items()})
+    return {key: round(value, 2) for key, value in result.items()}
+
+
+def summary(stats: pstats.Stats, top: int) -> str:
+    """Top-N funkcji wg czasu skumulowanego i wg czasu własnego."""
+    out = io.StringIO()
+    stats.stream = out
+    stats.sort_stats("cumulative").print_stats(top)
+    stats.sort_stats("tottime").print_stats(top)
+    return out.getvalue()
+
+
+def save(profiler, meta: Dict, sql: float, total: float) -> str:
+    """Zapisuje profil do bufora cyklicznego; zwraca jego id."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    now = timezone.now()
+    profile_id = f"{now:%Y%m%dT%H%M%S-%f}-{next(_sequence)}"
+
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+    stats = pstats.Stats(profiler)
+    meta = {
+        "id": profile_id,
+        "created": now.isoformat(),
+        **meta,
+        "breakdown": breakdown(stats, total, sql),
+        "summary": summary(stats, getattr(settings, "PROFILING_TOP", 30)),
+    }
+    with open(directory / f"{profile_id}.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    _trim(directory, getattr(settings, "PROFILING_KEEP", 20))
+    return profile_id
+
+
+def _trim(directory: Path, keep: int) -> None:
+    for path in sorted(directory.glob("*.json"), reverse=True)[keep:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def listing() -> List[Dict]:
+    """Zapisane profile od najnowszego (bez podsumowania tekstowego)."""
+    rows = []
+    for path in sorted(profile_dir().glob("*.json"), reverse=True):
+        meta = _read(path)
+        if meta is not None:
+            meta.pop("summary", None)
+            rows.append(meta)
+    return rows
+
+
+def load(profile_id: str) -> Optional[Dict]:
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    return _read(profile_dir() / f"{profile_id}.json")
+
+
+def dump_path(profile_id: str) -> Optional[Path]:
+    """Ścieżka zrzutu pstats albo None, gdy profilu nie ma."""
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    path = profile_dir() / f"{profile_id}.prof"
+    return path if path.exists() else None
+
+
+def _read(path: Path) -> Optional[Dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,111 @@
+# backend_api/services/query_budget.py
+"""
+Budżety zapytań SQL per widok.
+
+Widok deklaruje maksymalną liczbę zapytań dekoratorem `@query_budget(n)`
+(funkcja z `@api_view` albo klasa widoku / ViewSetu). Harness testowy
+(tests/test_query_budgets.py) odpala każdą trasę na małym i dużym zbiorze
+danych: liczba zapytań nie może przekroczyć budżetu ani rosnąć z danymi.
+`QueryRecorder` zapisuje SQL razem z miejscem wywołania, żeby raport
+z porażki od razu wskazywał pętlę N+1.
+"""
+
+import re
+import traceback
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connection
+
+# trasy spoza backend_api (router DRF, drf-spectacular) – bez dekoratora
+EXTERNAL_BUDGETS = {
+    "api-root": 0,
+    "schema": 0,
+    "swagger-ui": 0,
+}
+
+APP_DIR = Path(__file__).resolve().parent.parent
+SKIP_DIRS = (APP_DIR / "tests", Path(__file__).resolve().parent)
+LITERAL_RE = re.compile(r"'[^']*'|\b\d+\b")
+
+
+def query_budget(max_queries: int):
+    """Deklaruje maksymalną liczbę zapytań na jedno żądanie do widoku."""
+
+    def decorate(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorate
+
+
+def budget_of(name: str, callback) -> Optional[int]:
+    """Budżet trasy: z widoku (funkcja, klasa, ViewSet) albo EXTERNAL_BUDGETS."""
+    for target in (
+        callback,
+        getattr(callback, "view_class", None),
+        getattr(callback, "cls", None),
+    ):
+        budget = getattr(target, "query_budget", None)
+        if budget is not None:
+            return budget
+    return EXTERNAL_BUDGETS.get(name)
+
+
+def _origin(depth: int = 3) -> Tuple[str, ...]:
+    """
+    Ramki stosu z kodu aplikacji (bez testów i tego modułu), od najgłębszej.
+    Gdy zapytanie wychodzi z biblioteki (np. serializer DRF), najgłębsze
+    ramki spoza ORM – i tak wskazują pole, które robi N+1.
+    """
+    stack = list(reversed(traceback.extract_stack()))
+    app, library = [], []
+    for frame in stack:
+        path = Path(frame.filename)
+        if any(d == path.parent or d in path.parents for d in SKIP_DIRS):
+            continue
+        if APP_DIR in path.parents:
+            app.append(
+                f"{path.relative_to(APP_DIR.parent)}:{frame.lineno} {frame.name}"
+            )
+        elif "django" not in path.parts or "db" not in path.parts:
+            library.append(f"{path.name}:{frame.lineno} {frame.name}")
+    return tuple(app[:depth] or library[:depth])
+
+
+class QueryRecorder:
+    """`connection.execute_wrapper` zbierający (sql, miejsce wywołania)."""
+
+    def __init__(self):
+        self.queries: List[Tuple[str, Tuple[str, ...]]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, _origin()))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._wrapper.__exit__(*exc)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def report(self, limit: int = 5) -> str:
+        """Najczęściej powtarzane zapytania (bez literałów) z miejscami wywołań."""
+        counts: Counter = Counter()
+        origins: Dict[str, set] = defaultdict(set)
+        for sql, origin in self.queries:
+            shape = LITERAL_RE.sub("?", sql)
+            counts[shape] += 1
+            origins[shape].add(origin)
+        lines = []
+        for shape, count in counts.most_common(limit):
+            lines.append(f"{count}× {shape[:300]}")
+            for origin in sorted(origins[shape])[:3]:
+                lines.append("    ← " + " ← ".join(origin))
+        return "\n".join(lines)
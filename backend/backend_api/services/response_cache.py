@@ -0,0 +1,136 @@
+# backend_api/services/response_cache.py
+"""
+Cache odpowiedzi endpointów analitycznych.
+
+Klucz = nazwa endpointu + znormalizowane parametry + tokeny wersji miesięcy,
+których dotyczy zapytanie. Zapis paragonu podbija wersję miesiąca, więc
+nieaktualny wpis nigdy nie zostanie trafiony – po prostu wygasa.
+"""
+
+import functools
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from backend_api.services import etags, periods, versions
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(endpoint: str, outcome: str) -> None:
+    with _stats_lock:
+        _stats[(endpoint, outcome)] += 1
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """Liczniki hit/miss per endpoint (w obrębie procesu)."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    result: Dict[str, Dict[str, int]] = {}
+    for (endpoint, outcome), value in sorted(snapshot.items()):
+        result.setdefault(endpoint, {"hit": 0, "miss": 0})[outcome] = value
+    return result
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def get_cache():
+    return caches[getattr(settings, "ANALYTICS_CACHE_ALIAS", "default")]
+
+
+def months_from_params(
+    query_params, include_next: bool = False, resolver: Callable = periods.resolve
+) -> List:
+    """
+    Miesiące objęte zapytaniem na podstawie parametrów okresu
+    (year/month/quarter/week/from/to + period).
+    Niepoprawne parametry → [] (widok sam zwróci błąd 400).
+    """
+    try:
+        period = resolver(query_params)
+    except periods.PeriodError:
+        return []
+    return period.months(include_next=include_next)
+
+
+def version_token(months) -> str:
+    return ",".join(
+        f"{y}-{m}:{t}" for (y, m), t in sorted(versions.tokens(months).items())
+    )
+
+
+def _freeze(response) -> Optional[tuple]:
+    if response.status_code != 200:
+        return None
+    if isinstance(response, Response):
+        return ("drf", response.data)
+    return ("raw", response.content, response["Content-Type"])
+
+
+def _thaw(frozen) -> HttpResponse:
+    if frozen[0] == "drf":
+        return Response(frozen[1])
+    return HttpResponse(frozen[1], content_type=frozen[2])
+
+
+def cached_response(
+    endpoint: str, include_next: bool = False, resolver: Callable = periods.resolve
+) -> Callable:
+    """
+    Dekorator widoku GET (funkcja DRF lub metoda APIView).
+    Cache'uje tylko odpowiedzi 200 dla poprawnych parametrów okresu,
+    ustawia silny ETag i odpowiada 304 na pasujący If-None-Match.
+    `resolver` zamienia parametry na okres (domyślnie `periods.resolve`).
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(a for a in args if hasattr(a, "query_params"))
+            params = request.query_params
+            months = months_from_params(params, include_next, resolver)
+            if not months:
+                return view(*args, **kwargs)
+
+            # jedno zapytanie po indeksie – tańsze niż właściwe przeliczenie
+            fp = etags.fingerprint(endpoint, params, version_token(months))
+            etag = etags.make_etag(fp)
+            if etags.matches(request, etag):
+                return etags.not_modified(etag)
+
+            if not getattr(settings, "ANALYTICS_CACHE_ENABLED", True):
+                response = view(*args, **kwargs)
+            else:
+                cache = get_cache()
+                key = f"analytics:{endpoint}:{fp}"
+                frozen = cache.get(key)
+                if frozen is not None:
+                    _count(endpoint, "hit")
+                    response = _thaw(frozen)
+                else:
+                    _count(endpoint, "miss")
+                    response = view(*args, **kwargs)
+                    frozen = _freeze(response)
+                    if frozen is not None:
+                        cache.set(
+                            key,
+                            frozen,
+                            getattr(settings, "ANALYTICS_CACHE_TIMEOUT", 60 * 60 * 24),
+                        )
+
+            if response.status_code == 200:
+                etags.tag(response, etag)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,118 @@
+# backend_api/services/rollup.py
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from backend_api.models import ItemShare, MonthlyRollup, Receipt
+from backend_api.services.ledger import compute_share
+
+# (owner_id, year, month, category, transaction_type)
+RollupKey = Tuple[int, int, int, str, str]
+RollupSnapshot = Dict[RollupKey, Tuple[Decimal, int]]
+
+KEY_FIELDS = ("owner_id", "year", "month", "category", "transaction_type")
+
+
+def _grouped(shares_qs) -> RollupSnapshot:
+    rows = (
+        shares_qs.annotate(
+            year=ExtractYear("payment_date"), month=ExtractMonth("payment_date")
+        )
+        .values(*KEY_FIELDS)
+        .annotate(total=Sum("share"), share_count=Count("id"))
+        .order_by()
+    )
+    return {
+        tuple(row[f] for f in KEY_FIELDS): (Decimal(row["total"]), row["share_count"])
+        for row in rows
+    }
+
+
+def snapshot(receipt_ids: Iterable[int]) -> RollupSnapshot:
+    """Sumy z ledgera dla paragonów, pogrupowane po kluczu rollupu."""
+    ids = {rid for rid in receipt_ids if rid is not None}
+    if not ids:
+        return {}
+    return _grouped(ItemShare.objects.filter(receipt_id__in=ids))
+
+
+def apply_delta(before: RollupSnapshot, after: RollupSnapshot) -> int:
+    """
+    Nakłada różnicę `after - before` na tabelę rollupów.
+    Wiersze, w których nie został żaden udział, są usuwane.
+    Zwraca liczbę zmienionych kluczy.
+    """
+    changed = 0
+    for key in set(before) | set(after):
+        old_total, old_count = before.get(key, (Decimal(0), 0))
+        new_total, new_count = after.get(key, (Decimal(0), 0))
+        d_total, d_count = new_total - old_total, new_count - old_count
+        if not d_total and not d_count:
+            continue
+
+        lookup = dict(zip(KEY_FIELDS, key))
+        updated = MonthlyRollup.objects.filter(**lookup).update(
+            total=F("total") + d_total, share_count=F("share_count") + d_count
+        )
+        if not updated:
+            MonthlyRollup.objects.create(**lookup, total=d_total, share_count=d_count)
+        elif d_count < 0:
+            MonthlyRollup.objects.filter(**lookup, share_count__lte=0).delete()
+        changed += 1
+    return changed
+
+
+def rebuild_all() -> int:
+    """Przebudowuje rollupy od zera na podstawie ledgera udziałów."""
+    MonthlyRollup.objects.all().delete()
+    rows = [
+        MonthlyRollup(
+            **dict(zip(KEY_FIELDS, key)), total=total, share_count=share_count
+        )
+        for key, (total, share_count) in _grouped(ItemShare.objects.all()).items()
+    ]
+    MonthlyRollup.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def diff_against_raw() -> List[Dict]:
+    """
+    Porównuje rollupy z surowymi tabelami (Receipt → Item → owners).
+    Zwraca listę rozbieżności; pusta lista = tabela spójna.
+    """
+    expected: Dict[RollupKey, Decimal] = defaultdict(Decimal)
+    receipts = Receipt.objects.prefetch_related("items__owners").iterator(
+        chunk_size=500
+    )
+    for receipt in receipts:
+        d = receipt.payment_date
+        for item in receipt.items.all():
+            owners = list(item.owners.all())
+            share = compute_share(item.value, len(owners))
+            for owner in owners:
+                key = (
+                    owner.id,
+                    d.year,
+                    d.month,
+                    item.category,
+                    receipt.transaction_type,
+                )
+                expected[key] += share
+
+    actual = {
+        tuple(row[f] for f in KEY_FIELDS): row["total"]
+        for row in MonthlyRollup.objects.values(*KEY_FIELDS, "total")
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual)):
+        exp = expected.get(key, Decimal(0))
+        act = actual.get(key, Decimal(0))
+        if exp != act:
+            mismatches.append(
+                {**dict(zip(KEY_FIELDS, key)), "expected": exp, "actual": act}
+            )
+    return mismatches
@@ -0,0 +1,123 @@
+# backend_api/services/spending_ratio.py
+"""
+Proporcje wydatków w grupach kategorii (invest / spending / fun).
+
+Jedno zapytanie na ledgerze udziałów: dla każdej grupy
+`Sum(Case(When(category__in=...)))` i licznik pozycji, opcjonalnie
+pogrupowane po ownerze i/lub miesiącu. Dzięki temu kilka osób albo cały
+rok miesiąc po miesiącu to nadal jedno zapytanie. Id pozycji tylko na
+życzenie, stronicowane (`item_ids`).
+"""
+
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+from django.db.models import Case, Count, DecimalField, Sum, Value, When
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from backend_api.models import ItemShare
+from backend_api.services import category_groups
+
+EMPTY_DETAIL = "Brak wydatków w tym okresie dla tego właściciela."
+MAX_IDS_LIMIT = 5000
+
+
+def _shares(period, owner_ids):
+    return ItemShare.objects.filter(
+        period.q(), owner_id__in=list(owner_ids), transaction_type="expense"
+    )
+
+
+def _summary(sums: Dict[str, Decimal], counts: Dict[str, int]) -> Dict:
+    total_all = sum(float(value) for value in sums.values())
+    if total_all == 0:
+        return {"available": False, "detail": EMPTY_DETAIL}
+    result = {"available": True}
+    for name, value in sums.items():
+        result[name] = round(float(value) / total_all * 100, 2)
+    for name, count in counts.items():
+        result[f"{name}_count"] = count
+    return result
+
+
+def summarize(groups, rows: Iterable) -> Dict:
+    """
+    Proporcje z wierszy (kategoria, udział) – dla kodu, który ma już udziały
+    w pamięci (dashboard); wynik jak z `ratios`.
+    """
+    sums = {name: Decimal(0) for name in groups}
+    counts = {name: 0 for name in groups}
+    for category, share in rows:
+        for name, cats in groups.items():
+            if category in cats:
+                sums[name] += share
+                counts[name] += 1
+    return _summary(sums, counts)
+
+
+def ratios(owner_ids: List[int], period, by: Iterable[str] = ()) -> List[Dict]:
+    """
+    Proporcje dla udziałów podanych ownerów, pogrupowane wg `by`
+    ("owner" i/lub "month"); bez `by` – jeden wynik dla wszystkich razem
+    (`aggregate()`). Zawsze jedno zapytanie; wpisy mają klucze grupowania
+    (`owner`, `year`, `month`), brakujące kombinacje dostają available=False.
+    """
+    groups = category_groups.groups(category_groups.SPENDING_RATIO)
+    every = sorted({c for cats in groups.values() for c in cats})
+    by = set(by)
+
+    shares = _shares(period, owner_ids).filter(category__in=every)
+    keys, slots = [], [()]
+    if "owner" in by:
+        keys.append("owner_id")
+        slots = [(owner_id,) for owner_id in owner_ids]
+    if "month" in by:
+        shares = shares.annotate(
+            year=ExtractYear("payment_date"), month=ExtractMonth("payment_date")
+        )
+        keys += ["year", "month"]
+        slots = [slot + ym for slot in slots for ym in period.months()]
+
+    aggregates = {}
+    for name, cats in groups.items():
+        aggregates[f"{name}_sum"] = Sum(
+            Case(
+                When(category__in=cats, then="share"),
+                default=Value(Decimal(0)),
+                output_field=DecimalField(max_digits=20, decimal_places=6),
+            )
+        )
+        aggregates[f"{name}_count"] = Count(Case(When(category__in=cats, then=1)))
+    if keys:
+        rows = shares.values(*keys).annotate(**aggregates).order_by()
+        found = {tuple(row[key] for key in keys): row for row in rows}
+    else:
+        found = {(): shares.aggregate(**aggregates)}
+
+    labels = ["owner" if key == "owner_id" else key for key in keys]
+    result = []
+    for slot in slots:
+        row = found.get(slot, {})
+        entry = dict(zip(labels, slot))
+        entry.update(
+            _summary(
+                {name: row.get(f"{name}_sum") or Decimal(0) for name in groups},
+                {name: row.get(f"{name}_count") or 0 for name in groups},
+            )
+        )
+        result.append(entry)
+    return result
+
+
+def item_ids(owner_id: int, period, offset: int, limit: int) -> Dict[str, List[int]]:
+    """Strona id pozycji każdej grupy (po rosnącym id) – zapytanie na grupę."""
+    groups = category_groups.groups(category_groups.SPENDING_RATIO)
+    shares = _shares(period, [owner_id])
+    return {
+        name: list(
+            shares.filter(category__in=cats)
+            .order_by("item_id")
+            .values_list("item_id", flat=True)[offset : offset + limit]
+        )
+        for name, cats in groups.items()
+    }
@@ -0,0 +1,73 @@
+# backend_api/services/sync.py
+"""
+Jedno miejsce, przez które przechodzą wszystkie zapisy paragonów.
+Każda ścieżka zapisu (serializer, import, saldo) woła `receipts_saved`
+po zapisie i `receipts_deleted` przed usunięciem paragonów. Pozycje
+usuwa się przez `items_deleted` (kaskada kasuje ich udziały z ledgera).
+"""
+
+from typing import Iterable
+
+from backend_api.models import Item
+from backend_api.services import (
+    fingerprints,
+    ledger,
+    owner_mask,
+    prefix_sums,
+    rollup,
+    versions,
+)
+
+
+def _ids(receipt_ids: Iterable[int]) -> set:
+    return {rid for rid in receipt_ids if rid is not None}
+
+
+def _months(*snapshots) -> set:
+    return {(key[1], key[2]) for snap in snapshots for key in snap}
+
+
+def receipts_saved(receipt_ids: Iterable[int]) -> None:
+    """Odświeża dane pochodne po utworzeniu/edycji paragonów."""
+    ids = _ids(receipt_ids)
+    if not ids:
+        return
+    owner_mask.refresh(ids)
+    fingerprints.refresh(ids)
+    before = rollup.snapshot(ids)
+    days_before = prefix_sums.snapshot(ids)
+    ledger.rebuild_shares(ids)
+    after = rollup.snapshot(ids)
+    rollup.apply_delta(before, after)
+    prefix_sums.apply_delta(days_before, prefix_sums.snapshot(ids))
+    # stare miesiące (sprzed zmiany daty) + bieżące daty paragonów
+    versions.bump(_months(before, after) | versions.months_of_receipts(ids))
+
+
+def receipts_deleted(receipt_ids: Iterable[int]) -> None:
+    """Czyści dane pochodne paragonów, które zaraz zostaną usunięte."""
+    ids = _ids(receipt_ids)
+    if not ids:
+        return
+    before = rollup.snapshot(ids)
+    rollup.apply_delta(before, {})
+    prefix_sums.apply_delta(prefix_sums.snapshot(ids), {})
+    ledger.drop_shares(ids)
+    versions.bump(_months(before) | versions.months_of_receipts(ids))
+
+
+def items_deleted(item_ids: Iterable[int]) -> None:
+    """Usuwa pozycje i odejmuje ich udziały od rollupów."""
+    ids = _ids(item_ids)
+    if not ids:
+        return
+    items = Item.objects.filter(id__in=ids)
+    receipt_ids = set(items.values_list("receipt_id", flat=True))
+    before = rollup.snapshot(receipt_ids)
+    days_before = prefix_sums.snapshot(receipt_ids)
+    items.delete()
+    after = rollup.snapshot(receipt_ids)
+    rollup.apply_delta(before, after)
+    prefix_sums.apply_delta(days_before, prefix_sums.snapshot(receipt_ids))
+    fingerprints.refresh(receipt_ids)
+    versions.bump(_months(before) | versions.months_of_receipts(receipt_ids))
@@ -0,0 +1,216 @@
+# backend_api/services/synthetic.py
+"""
+Deterministyczny generator danych testowych (osoby, paragony, pozycje,
+inwestycje) do benchmarków i testów wydajności.
+
+Ten sam `seed` i te same wolumeny dają zawsze ten sam zbiór danych.
+Zapis idzie miesiąc po miesiącu hurtowymi insertami, a dane pochodne
+(ledger, rollupy, wersje) odświeża `receipts_saved` – jak każdy inny zapis.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List
+
+from django.db import transaction
+
+from backend_api.models import (
+    Instrument,
+    Invest,
+    Item,
+    Person,
+    Receipt,
+    RecentShop,
+    Wallet,
+)
+from backend_api.services import owner_mask
+from backend_api.services.sync import receipts_saved
+
+WRITE_BATCH_SIZE = 1000
+
+# sklep → kategorie i widełki cen (PLN) pozycji, które się w nim kupuje
+SHOPS = {
+    "biedronka": (["food_drinks", "chemistry", "alcohol"], (2, 60)),
+    "lidl": (["food_drinks", "chemistry", "other_shopping"], (2, 80)),
+    "orlen": (["fuel", "car_expenses", "fastfood"], (8, 350)),
+    "mcdonalds": (["fastfood"], (6, 45)),
+    "zalando": (["clothes", "delivery"], (15, 400)),
+    "media expert": (["electronics_games", "delivery"], (20, 2500)),
+    "pgnig": (["flat_bills"], (60, 600)),
+    "netflix": (["monthly_subscriptions"], (30, 70)),
+    "eventim": (["tickets_entrance"], (40, 450)),
+    "xtb": (["investments_savings"], (100, 2000)),
+}
+INCOME = {
+    "pracodawca": ("work_income", (4000, 12000)),
+    "rodzina": ("family_income", (100, 1500)),
+    "zwrot": ("money_back", (10, 300)),
+}
+INSTRUMENTS = [
+    ("WIG20 ETF", "SYN-ETFW20", "etf"),
+    ("S&P 500 ETF", "SYN-SP500", "etf"),
+    ("Obligacje EDO", "SYN-EDO", "bond"),
+    ("Bitcoin", "SYN-BTC", "crypto"),
+]
+# odsetek pozycji dzielonych między wszystkich ownerów
+SHARED_RATIO = 0.3
+
+
+@dataclass(frozen=True)
+class Volume:
+    years: int = 10
+    owners: int = 3
+    receipts_per_month: int = 40  # na ownera
+    items_per_receipt: int = 15
+    invests_per_month: int = 2
+    start_year: int = 2015
+    seed: int = 42
+
+    @property
+    def receipts(self) -> int:
+        return self.years * 12 * self.owners * self.receipts_per_month
+
+    @property
+    def items(self) -> int:
+        return self.receipts * self.items_per_receipt
+
+
+def _money(rng: random.Random, low: int, high: int) -> Decimal:
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _persons(volume: Volume) -> List[Person]:
+    persons = []
+    for n in range(1, volume.owners + 1):
+        person, _ = Person.objects.get_or_create(
+            name=f"Synthetic {n}", defaults={"payer": True, "owner": True}
+        )
+        persons.append(person)
+    return persons
+
+
+def _month_receipts(rng, volume, persons, year, month) -> List[tuple]:
+    """(Receipt, [(category, value, description, owner_ids)]) dla miesiąca."""
+    everyone = [p.id for p in persons]
+    shops, incomes = list(SHOPS), list(INCOME)
+    result = []
+    for payer in persons:
+        for n in range(volume.receipts_per_month):
+            day = date(year, month, rng.randint(1, 28))
+            # pierwszy paragon ownera w miesiącu to przychód
+            if n == 0:
+                shop = rng.choice(incomes)
+                category, (low, high) = INCOME[shop]
+                receipt = Receipt(
+                    payment_date=day,
+                    payer=payer,
+                    shop=shop,
+                    transaction_type="income",
+                )
+                items = [(category, _money(rng, low, high), shop, [payer.id])]
+            else:
+                shop = rng.choice(shops)
+                categories, (low, high) = SHOPS[shop]
+                receipt = Receipt(
+                    payment_date=day,
+                    payer=payer,
+                    shop=shop,
+                    transaction_type="expense",
+                )
+                items = []
+                for i in range(volume.items_per_receipt):
+                    category = rng.choice(categories)
+                    owners = everyone if rng.random() < SHARED_RATIO else [payer.id]
+                    items.append(
+                        (category, _money(rng, low, high), f"{category} {i}", owners)
+                    )
+            result.append((receipt, items))
+    return result
+
+
+def _write_month(pairs) -> List[int]:
+    receipts = Receipt.objects.bulk_create(
+        [receipt for receipt, _ in pairs], batch_size=WRITE_BATCH_SIZE
+    )
+    items, owners = [], []
+    for receipt, rows in pairs:
+        for category, value, description, owner_ids in rows:
+            items.append(
+                Item(
+                    receipt=receipt,
+                    category=category,
+                    value=value,
+                    description=description,
+                    owner_mask=owner_mask.mask_of(owner_ids),
+                    owner_count=len(owner_ids),
+                )
+            )
+            owners.append(owner_ids)
+    Item.objects.bulk_create(items, batch_size=WRITE_BATCH_SIZE)
+    links = Item.owners.through
+    links.objects.bulk_create(
+        [
+            links(item_id=item.id, person_id=pid)
+            for item, owner_ids in zip(items, owners)
+            for pid in owner_ids
+        ],
+        batch_size=WRITE_BATCH_SIZE,
+    )
+    return [r.id for r in receipts]
+
+
+def _invests(rng, volume, wallet, instruments, year, month) -> List[Invest]:
+    rows = []
+    for _ in range(volume.invests_per_month):
+        value = _money(rng, 100, 5000)
+        rows.append(
+            Invest(
+                wallet=wallet,
+                instrument=rng.choice(instruments),
+                value=value,
+                current_value=value * Decimal(rng.randint(80, 130)) / 100,
+                payment_date=date(year, month, rng.randint(1, 28)),
+                transaction_type=rng.choice(["buy", "buy", "sell", "dividend"]),
+            )
+        )
+    return rows
+
+
+def generate(volume: Volume, progress=None) -> Dict[str, int]:
+    """Generuje dane dla `volume`; zwraca liczbę utworzonych wierszy."""
+    rng = random.Random(volume.seed)
+    counts = {"persons": volume.owners, "receipts": 0, "items": 0, "invests": 0}
+
+    with transaction.atomic():
+        persons = _persons(volume)
+        wallet, _ = Wallet.objects.get_or_create(name="Synthetic")
+        instruments = [
+            Instrument.objects.get_or_create(
+                symbol=symbol, defaults={"name": name, "category": category}
+            )[0]
+            for name, symbol, category in INSTRUMENTS
+        ]
+        existing = set(RecentShop.objects.values_list("name", flat=True))
+        RecentShop.objects.bulk_create(
+            RecentShop(name=name)
+            for name in sorted((set(SHOPS) | set(INCOME)) - existing)
+        )
+
+    for year in range(volume.start_year, volume.start_year + volume.years):
+        for month in range(1, 13):
+            pairs = _month_receipts(rng, volume, persons, year, month)
+            invests = _invests(rng, volume, wallet, instruments, year, month)
+            with transaction.atomic():
+                ids = _write_month(pairs)
+                Invest.objects.bulk_create(invests)
+                receipts_saved(ids)
+            counts["receipts"] += len(ids)
+            counts["items"] += sum(len(rows) for _, rows in pairs)
+            counts["invests"] += len(invests)
+            if progress:
+                progress(year, month, counts)
+
+    wallet.update_totals()
+    return counts
@@ -0,0 +1,73 @@
+# backend_api/services/versions.py
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import F, Max, Q, Sum
+from django.utils import timezone
+
+from backend_api.models import DataVersion, Receipt
+
+YearMonth = Tuple[int, int]
+
+# token dla miesiąca, w którym jeszcze nic nie zapisano
+EMPTY_TOKEN = "0"
+
+
+def months_of_receipts(receipt_ids: Iterable[int]) -> set:
+    """Zbiór (rok, miesiąc) dat płatności podanych paragonów."""
+    dates = Receipt.objects.filter(id__in=list(receipt_ids)).values_list(
+        "payment_date", flat=True
+    )
+    return {(d.year, d.month) for d in dates}
+
+
+def bump(months: Iterable[YearMonth]) -> None:
+    """Podbija licznik wersji dla każdego (rok, miesiąc)."""
+    stamp = timezone.now()
+    for year, month in sorted(set(months)):
+        updated = DataVersion.objects.filter(year=year, month=month).update(
+            version=F("version") + 1, changed_at=stamp
+        )
+        if not updated:
+            DataVersion.objects.create(
+                year=year, month=month, version=1, changed_at=stamp
+            )
+
+
+def tokens(months: Iterable[YearMonth]) -> Dict[YearMonth, str]:
+    """Aktualne tokeny wersji dla miesięcy – jedno zapytanie po indeksie."""
+    months = sorted(set(months))
+    if not months:
+        return {}
+    cond = Q()
+    for year, month in months:
+        cond |= Q(year=year, month=month)
+    found = {(v.year, v.month): v.token for v in DataVersion.objects.filter(cond)}
+    return {ym: found.get(ym, EMPTY_TOKEN) for ym in months}
+
+
+def months_for_period(
+    year: int, month: Optional[int] = None, include_next: bool = False
+) -> List[YearMonth]:
+    """
+    Miesiące, od których zależy odpowiedź dla okresu: jeden miesiąc albo cały rok.
+    `include_next` dokłada miesiąc następny (saldo zapisywane jest na 1. dzień).
+    """
+    months = [(year, month)] if month else [(year, m) for m in range(1, 13)]
+    if include_next:
+        last = date(*months[-1], 1)
+        months.append(
+            (last.year + 1, 1) if last.month == 12 else (last.year, last.month + 1)
+        )
+    return months
+
+
+def global_token() -> str:
+    """
+    Token całej bazy paragonów – zmienia się przy każdym zapisie.
+    Agregat po małej tabeli wersji (jeden wiersz na miesiąc).
+    """
+    agg = DataVersion.objects.aggregate(total=Sum("version"), last=Max("changed_at"))
+    if not agg["total"]:
+        return EMPTY_TOKEN
+    return f"{agg['total']}.{int(agg['last'].timestamp() * 1_000_000)}"
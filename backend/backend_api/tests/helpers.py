@@ -0,0 +1,55 @@
+# tests/helpers.py
+"""Wspólne dane testowe: osoby i paragony zakładane przez API."""
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from backend_api.models import Person
+from backend_api.services import response_cache
+
+
+class ReceiptAPITestCase(APITestCase):
+    """
+    Tworzy osoby z `persons` ({atrybut: czy płatnik}, nazwa = atrybut
+    wielką literą) i czyści cache odpowiedzi analitycznych. Paragony
+    zakłada się przez `receipt-create` – jak frontend, więc przechodzą
+    przez ledger, rollupy i resztę `receipts_saved`.
+    """
+
+    persons = {"payer": True, "alice": False}
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        for attr, payer in self.persons.items():
+            person = Person.objects.create(
+                name=attr.capitalize(), payer=payer, owner=True
+            )
+            setattr(self, attr, person)
+
+    def receipt(
+        self, items, day="2025-05-03", payer=None, tx="expense", shop="Shop"
+    ) -> dict:
+        """
+        Payload paragonu; `items` to krotki (kategoria, wartość, ownerzy).
+        Domyślny płatnik – pierwsza osoba z `persons`.
+        """
+        payer = payer or getattr(self, next(iter(self.persons)))
+        return {
+            "payment_date": day,
+            "payer": getattr(payer, "pk", payer),
+            "shop": shop,
+            "transaction_type": tx,
+            "items": [
+                {"category": c, "value": v, "description": "x", "owners": o}
+                for c, v, o in items
+            ],
+        }
+
+    def post_receipt(self, items, **fields) -> int:
+        """Zakłada paragon przez API i zwraca jego id."""
+        resp = self.client.post(
+            reverse("receipt-create"), self.receipt(items, **fields), format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        return resp.data["id"]
@@ -0,0 +1,112 @@
+# tests/test_balance_series.py
+
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Item, Receipt
+from backend_api.services import periods, response_cache
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class BalanceSeriesTests(ReceiptAPITestCase):
+    persons = {"alice": True, "bob": True}
+
+    def setUp(self):
+        super().setUp()
+        alice, both = [self.alice.id], [self.alice.id, self.bob.id]
+
+        # styczeń: +100 -30, luty: -20 (połowa z 40), marzec: nic
+        self.post_receipt(
+            [("work_income", "100.00", alice)], day="2025-01-10", tx="income"
+        )
+        self.post_receipt([("fuel", "30.00", alice)], day="2025-01-12")
+        self.post_receipt([("fuel", "40.00", both)], day="2025-02-03")
+        # saldo zamykające styczeń (zapis z frontendu: 1. dzień kolejnego miesiąca)
+        self.post_receipt(
+            [("last_month_balance", "65.00", alice)], day="2025-02-01", tx="income"
+        )
+
+    def _series(self, **params):
+        response_cache.get_cache().clear()
+        return self.client.get(
+            reverse("balance-series"),
+            {"owners[]": [self.alice.id], "from": "2025-01", "to": "2025-03", **params},
+        )
+
+    def test_series_matches_monthly_balance(self):
+        with self.assertNumQueries(3):
+            resp = self._series()
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual((resp.data["from"], resp.data["to"]), ("2025-01", "2025-03"))
+
+        months = resp.data["months"]
+        self.assertEqual([m["computed_balance"] for m in months], [70.0, -20.0, 0.0])
+        self.assertEqual(months[0]["difference"], 5.0)
+        for entry in months:
+            single = self.client.get(
+                reverse("balance"),
+                {
+                    "owners[]": [self.alice.id],
+                    "year": entry["year"],
+                    "month": entry["month"],
+                },
+            ).data
+            self.assertEqual(entry, single)
+
+    def test_close_writes_missing_months_at_once(self):
+        url = reverse("balance-series")
+        body = {
+            "owners": [self.alice.id],
+            "from": "2025-01",
+            "to": "2025-03",
+            "values": {"2025-03": "12.50"},
+        }
+        resp = self.client.post(url, body, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        created = resp.data["created"]
+        self.assertEqual(
+            [(c["year"], c["month"], c["value"]) for c in created],
+            [(2025, 2, -20.0), (2025, 3, 12.5)],
+        )
+        receipt = Receipt.objects.get(id=created[0]["receipt_id"])
+        self.assertEqual(
+            (receipt.payment_date, receipt.payer_id), (date(2025, 3, 1), self.alice.id)
+        )
+        item = Item.objects.get(id=created[1]["item_id"])
+        self.assertEqual(
+            list(item.owners.values_list("id", flat=True)), [self.alice.id]
+        )
+
+        months = self._series().data["months"]
+        self.assertEqual([m["create"] for m in months], [False, False, False])
+        self.assertEqual([m["difference"] for m in months], [5.0, 0.0, -12.5])
+
+        # drugi raz nic nie brakuje
+        again = self.client.post(url, body, format="json")
+        self.assertEqual(again.data["created"], [])
+
+    def test_invalid_params(self):
+        for params in (
+            {"from": "2025-13"},
+            {"to": "2024-12"},
+            {"from": "2020-01", "to": "2025-03"},
+            {"owners[]": []},
+        ):
+            self.assertEqual(self._series(**params).status_code, 400, params)
+
+        url = reverse("balance-series")
+        base = {"owners": [self.alice.id], "from": "2025-01", "to": "2025-03"}
+        for body in ({**base, "owners": []}, {**base, "values": {"x": "1"}}):
+            resp = self.client.post(url, body, format="json")
+            self.assertEqual(resp.status_code, 400, body)
+        resp = self.client.post(url, {**base, "owners": [999]}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_month_range(self):
+        period = periods.month_range({"from": "2024-11", "to": "2025-01-15"})
+        self.assertEqual(
+            (period.start, period.end), (date(2024, 11, 1), date(2025, 2, 1))
+        )
+        self.assertEqual(period.months(), [(2024, 11), (2024, 12), (2025, 1)])
@@ -0,0 +1,97 @@
+# tests/test_bar_persons.py
+
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Person, Receipt
+from backend_api.services import response_cache
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class BarPersonsAggregationTests(ReceiptAPITestCase):
+    persons = {"payer": True, "alice": True}
+
+    def setUp(self):
+        super().setUp()
+        both = [self.payer.id, self.alice.id]
+
+        self.shared = self._post(
+            self.payer,
+            [
+                ("fuel", "10.00", both),
+                ("food_drinks", "2.50", both),
+                ("clothes", "4.00", [self.alice.id]),
+                ("last_month_balance", "100.00", both),
+            ],
+        )
+        self.own = self._post(self.payer, [("fuel", "7.00", [self.payer.id])])
+        self.alice_not_own = self._post(self.alice, [("fuel", "3.00", [self.payer.id])])
+        # paragon bez pozycji – płatnik jest na liście, ale bez paragonów
+        self.empty = Receipt.objects.create(
+            payment_date=date(2025, 5, 9),
+            payer=self.alice,
+            shop="Shop",
+            transaction_type="expense",
+        )
+        self.params = {"year": 2025, "month": 5, "period": "monthly"}
+
+    def _post(self, payer, items):
+        return self.post_receipt(items, day="2025-05-05", payer=payer)
+
+    def _get(self, **params):
+        response_cache.get_cache().clear()
+        resp = self.client.get(reverse("fetch-bar-persons"), {**self.params, **params})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.json()
+
+    def test_conditional_sums(self):
+        data = self._get()
+        self.assertEqual(
+            data["shared_expenses"],
+            [
+                {
+                    "payer": self.payer.id,
+                    "expense_sum": 12.5,
+                    "receipt_ids": [self.shared],
+                    "top_outlier_receipts": [self.shared],
+                },
+                {
+                    "payer": self.alice.id,
+                    "expense_sum": 0.0,
+                    "receipt_ids": [],
+                    "top_outlier_receipts": [],
+                },
+            ],
+        )
+        self.assertEqual(
+            data["not_own_expenses"],
+            [
+                {
+                    "payer": self.payer.id,
+                    "expense_sum": 4.0,
+                    "receipt_ids": [self.shared],
+                    "top_outlier_receipts": [self.shared],
+                },
+                {
+                    "payer": self.alice.id,
+                    "expense_sum": 3.0,
+                    "receipt_ids": [self.alice_not_own],
+                    "top_outlier_receipts": [self.alice_not_own],
+                },
+            ],
+        )
+
+        fuel = self._get(**{"category[]": ["fuel"]})
+        self.assertEqual(fuel["shared_expenses"][0]["expense_sum"], 10.0)
+        self.assertEqual(fuel["not_own_expenses"][0]["payer"], self.alice.id)
+        self.assertEqual(fuel["not_own_expenses"][1]["receipt_ids"], [])
+
+    def test_m2m_fallback_matches_mask(self):
+        with_mask = self._get()
+        # osoba o id > 63 wyłącza maskę – warunek "płatnik jest ownerem" z M2M
+        Person.objects.create(id=100, name="Far", payer=False, owner=True)
+        with self.assertNumQueries(4):
+            without_mask = self._get()
+        self.assertEqual(without_mask, with_mask)
@@ -0,0 +1,121 @@
+# tests/test_benchmark.py
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APITestCase
+
+from backend_api.models import Invest, Item, ItemShare, MonthlyRollup, Receipt
+from backend_api.services import benchmark, synthetic
+
+SMALL = synthetic.Volume(
+    years=1,
+    owners=2,
+    receipts_per_month=3,
+    items_per_receipt=4,
+    invests_per_month=1,
+    start_year=2024,
+    seed=7,
+)
+
+
+def fingerprint():
+    return list(
+        Item.objects.order_by(
+            "receipt__payment_date", "receipt__shop", "id"
+        ).values_list("receipt__payment_date", "receipt__shop", "category", "value")
+    )
+
+
+class SyntheticDataTests(APITestCase):
+    def test_generate_is_deterministic(self):
+        counts = synthetic.generate(SMALL)
+        # 1 paragon przychodu (1 pozycja) + 2 wydatków (po 4) na osobę/miesiąc
+        self.assertEqual(
+            counts,
+            {"persons": 2, "receipts": 72, "items": 12 * 2 * 9, "invests": 12},
+        )
+        self.assertEqual(Invest.objects.count(), 12)
+        # dane pochodne odświeżone jak przy zwykłym zapisie
+        self.assertTrue(ItemShare.objects.exists())
+        self.assertEqual(
+            MonthlyRollup.objects.values("year", "month").distinct().count(), 12
+        )
+
+        first = fingerprint()
+        Receipt.objects.all().delete()
+        synthetic.generate(SMALL)
+        self.assertEqual(fingerprint(), first)
+
+        Receipt.objects.all().delete()
+        synthetic.generate(synthetic.Volume(**{**SMALL.__dict__, "seed": 8}))
+        self.assertNotEqual(fingerprint(), first)
+
+
+class BenchmarkTests(APITestCase):
+    def setUp(self):
+        synthetic.generate(SMALL)
+
+    def test_run_covers_routes(self):
+        result = benchmark.run(repeat=2)
+        names = {name for name, _ in benchmark.routes()}
+        self.assertEqual(set(result["endpoints"]) | set(result["skipped"]), names)
+        self.assertEqual(result["skipped"]["import_receipts"], "brak GET")
+
+        row = result["endpoints"]["fetch-line-sums"]
+        self.assertEqual(row["status"], 200)
+        self.assertLessEqual(row["p50_ms"], row["p95_ms"])
+        self.assertGreater(row["queries"], 0)
+        self.assertEqual(result["data"]["receipts"], 72)
+        for name, row in result["endpoints"].items():
+            self.assertLess(row["status"], 500, name)
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            "endpoints": {
+                "a": {"p95_ms": 10.0, "queries": 3, "peak_kib": 100.0},
+                "b": {"p95_ms": 10.0, "queries": 3, "peak_kib": 100.0},
+            }
+        }
+        current = {
+            "endpoints": {
+                "a": {"p95_ms": 11.5, "queries": 3, "peak_kib": 110.0},
+                "b": {"p95_ms": 20.0, "queries": 4, "peak_kib": 100.0},
+                "new": {"p95_ms": 1.0, "queries": 1, "peak_kib": 1.0},
+            }
+        }
+        self.assertEqual(
+            [
+                (r["endpoint"], r["metric"])
+                for r in benchmark.compare(baseline, current)
+            ],
+            [("b", "queries"), ("b", "p95_ms")],
+        )
+
+    def test_command_writes_and_checks_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            only = ["fetch-pie-categories", "balance"]
+            call_command(
+                "benchmark", repeat=2, only=only, output=path, stdout=StringIO()
+            )
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            self.assertEqual(set(saved["endpoints"]), set(only))
+
+            saved["endpoints"]["balance"]["queries"] = 0
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+            with self.assertRaises(CommandError):
+                call_command(
+                    "benchmark",
+                    repeat=2,
+                    only=only,
+                    baseline=path,
+                    fail_on_regression=True,
+                    stdout=StringIO(),
+                )
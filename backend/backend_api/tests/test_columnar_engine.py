@@ -0,0 +1,106 @@
+# tests/test_columnar_engine.py
+
+from datetime import date
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Person, Receipt
+from backend_api.services import columnar, response_cache
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class ColumnarEngineTests(ReceiptAPITestCase):
+    persons = {"payer": True, "alice": True, "bob": False}
+
+    def setUp(self):
+        super().setUp()
+        both = [self.payer.id, self.alice.id]
+        three = [self.payer.id, self.alice.id, self.bob.id]
+        self.post_receipt(
+            [("food_drinks", "10.00", three), ("fuel", "12.50", [self.payer.id])]
+        )
+        self.post_receipt([("clothes", "8.01", both)], day="2025-05-20")
+        self.post_receipt([("fuel", "3.33", three)], day="2025-05-21", payer=self.alice)
+        self.post_receipt(
+            [("alcohol", "5.00", [self.bob.id])], day="2025-07-01", payer=self.alice
+        )
+        self.post_receipt(
+            [("work_income", "500", [self.payer.id])], day="2025-05-10", tx="income"
+        )
+
+    def _both_engines(self, name, params):
+        results = []
+        for engine in ("sql", "numpy"):
+            response_cache.get_cache().clear()
+            with override_settings(ANALYTICS_ENGINE=engine):
+                resp = self.client.get(reverse(name), params)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            results.append(resp.json())
+        return results
+
+    def test_matches_sql_engine(self):
+        monthly = {"year": 2025, "month": 5, "period": "monthly"}
+        yearly = {"year": 2025, "period": "yearly"}
+        for period in (monthly, yearly):
+            for owner in (self.payer, self.alice, self.bob):
+                sql, numpy = self._both_engines(
+                    "fetch-line-sums", {**period, "owners[]": [owner.id]}
+                )
+                self.assertEqual(numpy, sql)
+
+            for owners in ([self.payer.id], [self.alice.id, self.bob.id], []):
+                sql, numpy = self._both_engines(
+                    "fetch-pie-categories",
+                    {**period, "owners[]": owners, "transactionType": "expense"},
+                )
+                self.assertEqual(numpy, sql)
+
+            for params in ({}, {"owners[]": [self.alice.id]}, {"category": ["fuel"]}):
+                sql, numpy = self._both_engines(
+                    "fetch-bar-persons", {**period, **params}
+                )
+                for payload in (sql, numpy):
+                    for row in payload["shared_expenses"] + payload["not_own_expenses"]:
+                        row["receipt_ids"].sort()
+                self.assertEqual(numpy, sql)
+
+    def test_payer_with_item_less_receipt(self):
+        # Bob płaci tylko za paragon bez pozycji – obie ścieżki listują go z zerami
+        Receipt.objects.create(
+            payment_date=date(2025, 5, 9),
+            payer=self.bob,
+            shop="Shop",
+            transaction_type="expense",
+        )
+        monthly = {"year": 2025, "month": 5, "period": "monthly"}
+        for params in ({}, {"owners[]": [self.bob.id]}, {"owners[]": [self.alice.id]}):
+            sql, numpy = self._both_engines("fetch-bar-persons", {**monthly, **params})
+            self.assertEqual(numpy, sql)
+        sql, _ = self._both_engines("fetch-bar-persons", monthly)
+        self.assertIn(
+            {
+                "payer": self.bob.id,
+                "expense_sum": 0.0,
+                "receipt_ids": [],
+                "top_outlier_receipts": [],
+            },
+            sql["shared_expenses"],
+        )
+
+    def test_mask_overflow(self):
+        for i in range(columnar.MASK_BITS):
+            Person.objects.create(name=f"P{i}", payer=False, owner=True)
+        owners = list(Person.objects.values_list("id", flat=True))
+        self.post_receipt([("fuel", "1.00", owners)], day="2025-05-04")
+
+        with self.assertRaises(columnar.MaskOverflow):
+            columnar.load_period(2025, 5)
+
+        # widok wraca do ścieżki SQL
+        sql, numpy = self._both_engines(
+            "fetch-line-sums",
+            {"year": 2025, "month": 5, "period": "monthly", "owners[]": [self.bob.id]},
+        )
+        self.assertEqual(numpy, sql)
@@ -0,0 +1,113 @@
+# tests/test_dashboard.py
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.services import category_groups
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class DashboardTests(ReceiptAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self._post(
+            "expense",
+            "2025-05-03",
+            "Lidl",
+            [
+                ("food_drinks", "30.00", [self.payer.id, self.alice.id]),
+                ("fuel", "12.50", [self.payer.id]),
+                ("clothes", "8.00", [self.alice.id]),
+            ],
+        )
+        self._post(
+            "expense",
+            "2025-05-20",
+            "Orlen",
+            [("investments_savings", "100.00", [self.payer.id])],
+        )
+        self._post(
+            "income", "2025-05-10", "Praca", [("work_income", "500", [self.payer.id])]
+        )
+        # pozycje bez ownerów, paragon bez ownerów i paragon bez pozycji
+        self._post(
+            "expense",
+            "2025-05-11",
+            "Biedronka",
+            [("food_drinks", "10.00", [self.alice.id]), ("fuel", "7.00", [])],
+        )
+        self._post("expense", "2025-05-12", "Kiosk", [("other", "5.00", [])])
+        self._post("expense", "2025-05-13", "Pusty", [])
+        # udziały z połówką grosza – float gubi je przy kumulacji
+        for day in ("2025-05-14", "2025-05-15", "2025-05-16"):
+            self._post(
+                "expense",
+                day,
+                "Lidl",
+                [("food_drinks", "2.01", [self.payer.id, self.alice.id])],
+            )
+        self.client.post(
+            reverse("balance"), {"year": 2025, "month": 6, "value": "7"}, format="json"
+        )
+
+    def _post(self, tx, payment_date, shop, items):
+        self.post_receipt(items, day=payment_date, tx=tx, shop=shop)
+
+    def test_payloads_match_individual_endpoints(self):
+        params = {"owners[]": [self.payer.id], "year": 2025, "month": 5}
+        monthly = {**params, "period": "monthly"}
+
+        # grupy kategorii są cache'owane w procesie – rozgrzane przed pomiarem
+        category_groups.groups(category_groups.BAR_SHOPS)
+        category_groups.groups(category_groups.SPENDING_RATIO)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("fetch-dashboard"), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(len(ctx.captured_queries), 4)
+        dashboard = resp.json()
+
+        def get(name, extra=None):
+            return self.client.get(reverse(name), {**monthly, **(extra or {})}).json()
+
+        self.assertEqual(dashboard["line_sums"], get("fetch-line-sums"))
+        self.assertEqual(
+            dashboard["pie_categories"],
+            get("fetch-pie-categories", {"transactionType": "expense"}),
+        )
+        self.assertEqual(
+            dashboard["bar_shops"],
+            get("fetch-bar-shops", {"transactionType": "expense"}),
+        )
+        self.assertEqual(dashboard["balance"], get("balance"))
+        self.assertEqual(dashboard["spending_ratio"], get("spending-ratio"))
+
+        persons = get("fetch-bar-persons")
+        self.assertEqual(dashboard["bar_persons"], persons)
+        not_own = persons["not_own_expenses"][0]
+        self.assertEqual(not_own["expense_sum"], 30.0)
+        self.assertEqual(len(not_own["receipt_ids"]), 3)
+
+        for top in (0, 1, 50):
+            resp = self.client.get(reverse("fetch-dashboard"), {**params, "top": top})
+            self.assertEqual(
+                resp.json()["bar_persons"], get("fetch-bar-persons", {"top": top})
+            )
+
+    def test_rejects_bad_top_and_unknown_owner(self):
+        params = {"owners[]": [self.payer.id], "year": 2025, "month": 5}
+        resp = self.client.get(reverse("fetch-dashboard"), {**params, "top": 51})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        params["owners[]"] = [9999]
+        resp = self.client.get(reverse("fetch-dashboard"), params)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        resp = self.client.get(
+            reverse("spending-ratio"), {**params, "period": "monthly"}
+        )
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_requires_month_and_owners(self):
+        resp = self.client.get(reverse("fetch-dashboard"), {"year": 2025})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
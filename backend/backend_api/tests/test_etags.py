@@ -0,0 +1,77 @@
+# tests/test_etags.py
+
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Person
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class ETagTests(ReceiptAPITestCase):
+    persons = {"payer": True}
+
+    def _post(self, payment_date):
+        return self.post_receipt([("fuel", "2.00", [self.payer.id])], day=payment_date)
+
+    def test_analytics_304_until_month_changes(self):
+        self._post("2025-05-02")
+        url = reverse("fetch-line-sums")
+        params = {
+            "owners[]": [self.payer.id],
+            "year": 2025,
+            "month": 5,
+            "period": "monthly",
+        }
+        first = self.client.get(url, params)
+        etag = first["ETag"]
+        self.assertTrue(etag.startswith('"'))
+
+        again = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(again.content, b"")
+
+        self._post("2025-05-20")
+        changed = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_owner_order_changes_etag(self):
+        alice = Person.objects.create(name="Alice", payer=False, owner=True)
+        self._post("2025-05-02")
+        url = reverse("fetch-line-sums")
+        params = {"year": 2025, "month": 5, "period": "monthly"}
+        first = self.client.get(url, {**params, "owners[]": [self.payer.id, alice.id]})
+
+        swapped = self.client.get(
+            url,
+            {**params, "owners[]": [alice.id, self.payer.id]},
+            HTTP_IF_NONE_MATCH=first["ETag"],
+        )
+        self.assertEqual(swapped.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(swapped["ETag"], first["ETag"])
+        self.assertNotEqual(swapped.json(), first.json())
+
+    def test_receipt_list_and_balance_etags(self):
+        self._post("2025-05-02")
+        list_url = reverse("receipt-create")
+        etag = self.client.get(list_url)["ETag"]
+        self.assertEqual(
+            self.client.get(list_url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        # inne filtry → inny ETag
+        self.assertNotEqual(self.client.get(list_url, {"year": 2025})["ETag"], etag)
+
+        self._post("2024-01-01")
+        self.assertEqual(
+            self.client.get(list_url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_200_OK,
+        )
+
+        balance_url = reverse("balance")
+        params = {"owners[]": [self.payer.id], "year": 2025, "month": 5}
+        b_etag = self.client.get(balance_url, params)["ETag"]
+        self.assertEqual(
+            self.client.get(balance_url, params, HTTP_IF_NONE_MATCH=b_etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
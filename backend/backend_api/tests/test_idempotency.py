@@ -0,0 +1,133 @@
+# tests/test_idempotency.py
+
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from backend_api.models import IdempotencyKey, Item, Receipt
+from backend_api.services import idempotency
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class IdempotencyKeyTests(ReceiptAPITestCase):
+    persons = {"payer": True}
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("receipt-create")
+
+    def _receipt(self, value="10.00"):
+        return self.receipt([("fuel", value, [self.payer.id])], shop="Lidl")
+
+    def _post(self, body, key="abc", url=None, **extra):
+        return self.client.post(
+            url or self.url, body, HTTP_IDEMPOTENCY_KEY=key, **extra
+        )
+
+    def test_retry_replays_without_writing(self):
+        first = self._post(self._receipt(), format="json")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as ctx:
+            again = self._post(self._receipt(), format="json")
+        self.assertEqual(again.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(again["Idempotent-Replayed"], "true")
+        self.assertEqual(again.json()["id"], first.data["id"])
+        touched = " ".join(q["sql"] for q in ctx.captured_queries)
+        self.assertNotIn("backend_api_receipt", touched)
+        self.assertNotIn("backend_api_item", touched)
+        self.assertEqual((Receipt.objects.count(), Item.objects.count()), (1, 1))
+
+        # bez klucza – zwykły zapis
+        self.client.post(self.url, self._receipt(), format="json")
+        self.assertEqual(Receipt.objects.count(), 2)
+
+    def test_conflicts_and_release(self):
+        self._post(self._receipt(), format="json")
+        other = self._post(self._receipt("11.00"), format="json")
+        self.assertEqual(other.status_code, 422)
+
+        # wiersz bez statusu = pierwsze żądanie jeszcze trwa
+        IdempotencyKey.objects.filter(key="abc").update(status_code=None)
+        busy = self._post(self._receipt(), format="json")
+        self.assertEqual(busy.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(busy["Retry-After"], "1")
+
+        too_long = self._post(self._receipt(), key="x" * 256, format="json")
+        self.assertEqual(too_long.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_exception_releases_key(self):
+        with mock.patch(
+            "backend_api.views.receipt_views.ReceiptSerializer.save",
+            side_effect=RuntimeError("boom"),
+        ):
+            with self.assertRaises(RuntimeError):
+                self._post(self._receipt(), key="crash", format="json")
+        self.assertFalse(IdempotencyKey.objects.filter(key="crash").exists())
+        retry = self._post(self._receipt(), key="crash", format="json")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Receipt.objects.count(), 1)
+
+    def test_abandoned_claim_is_taken_over(self):
+        # proces padł po zajęciu klucza: wiersz został bez statusu
+        self._post(self._receipt(), format="json")
+        Receipt.objects.all().delete()
+        IdempotencyKey.objects.update(status_code=None)
+        self.assertEqual(self._post(self._receipt(), format="json").status_code, 409)
+
+        IdempotencyKey.objects.update(
+            created_at=timezone.now()
+            - idempotency.claim_timeout()
+            - timedelta(seconds=1)
+        )
+        # inna treść pod tym kluczem nadal nie przejmuje
+        other = self._post(self._receipt("11.00"), format="json")
+        self.assertEqual(other.status_code, 422)
+        retry = self._post(self._receipt(), format="json")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(retry.has_header("Idempotent-Replayed"))
+        self.assertEqual(Receipt.objects.count(), 1)
+        replay = self._post(self._receipt(), format="json")
+        self.assertEqual(replay.json()["id"], retry.data["id"])
+
+    def test_ttl_eviction(self):
+        self._post(self._receipt(), format="json")
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        again = self._post(self._receipt(), format="json")
+        self.assertFalse(again.has_header("Idempotent-Replayed"))
+        self.assertEqual(Receipt.objects.count(), 2)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_claim_has_single_winner(self):
+        self.assertIsNone(idempotency.claim("s", "k", "h1"))
+        record = idempotency.claim("s", "k", "h1")
+        self.assertEqual((record.request_hash, record.status_code), ("h1", None))
+        self.assertIsNone(idempotency.claim("other", "k", "h1"))
+
+    def test_balance_and_import(self):
+        body = {"year": 2025, "month": 6, "value": "12.00"}
+        first = self._post(body, url=reverse("balance"), format="json")
+        again = self._post(body, url=reverse("balance"), format="json")
+        self.assertEqual(again.json()["id"], first.data["id"])
+        self.assertEqual(Receipt.objects.count(), 1)
+
+        line = (
+            '{"paymentDate": "2025-05-04", "payerId": %d, "shop": "S", '
+            '"transactionType": "expense", "items": []}' % self.payer.id
+        )
+        url = reverse("import_receipts")
+        for _ in range(2):
+            upload = SimpleUploadedFile("r.ndjson", line.encode())
+            resp = self._post({"file": upload}, key="imp", url=url, format="multipart")
+            self.assertEqual(resp.json()["inserted"], 1)
+        self.assertEqual(Receipt.objects.count(), 2)
+
+        other = SimpleUploadedFile("r.ndjson", (line + "\n" + line).encode())
+        resp = self._post({"file": other}, key="imp", url=url, format="multipart")
+        self.assertEqual(resp.status_code, 422)
@@ -0,0 +1,69 @@
+# tests/test_item_gc.py
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from backend_api.models import Item, Person, Receipt
+from backend_api.services import item_gc
+
+
+class ItemGarbageCollectorTests(APITestCase):
+    def setUp(self):
+        self.payer = Person.objects.create(name="Payer", payer=True, owner=True)
+        self.receipt = Receipt.objects.create(
+            payment_date="2025-05-03",
+            payer=self.payer,
+            shop="Lidl",
+            transaction_type="expense",
+        )
+        self.linked = self._item(self.receipt.id, owners=[self.payer])
+        self.ownerless = self._item(self.receipt.id, owners=[])
+        # wiszące receipt_id (klucze obce SQLite sprawdzane są dopiero przy
+        # commicie – każdy test sprząta sieroty przed końcem)
+        self.orphans = [self._item(10_000 + i, owners=[]) for i in range(5)]
+
+    def _item(self, receipt_id, owners):
+        item = Item.objects.create(
+            receipt_id=receipt_id, category="fuel", value="1.00", description="x"
+        )
+        item.owners.set(owners)
+        return item
+
+    def test_report(self):
+        report = item_gc.report()
+        self.assertEqual(report["orphan_items"]["count"], 5)
+        self.assertEqual(
+            report["orphan_items"]["sample"], [item.id for item in self.orphans]
+        )
+        self.assertEqual(
+            report["ownerless_items"]["sample"],
+            [self.ownerless.id] + [item.id for item in self.orphans],
+        )
+        item_gc.collect_orphans()
+
+    def test_collect_in_bounded_batches(self):
+        self.assertEqual(item_gc.collect_orphans(batch_size=2, max_batches=2), [2, 2])
+        self.assertEqual(item_gc.orphan_items().count(), 1)
+        self.assertEqual(item_gc.collect_orphans(batch_size=2), [1])
+        self.assertEqual(
+            set(Item.objects.values_list("id", flat=True)),
+            {self.linked.id, self.ownerless.id},
+        )
+
+    def test_command_dry_run_and_endpoint(self):
+        out = StringIO()
+        call_command("gc_items", "--dry-run", stdout=out)
+        self.assertIn("orphan_items: 5", out.getvalue())
+        self.assertEqual(Item.objects.count(), 7)
+
+        call_command("gc_items", "--batch-size", "3", stdout=StringIO())
+        resp = self.client.get(reverse("item-consistency-debug"), {"sample": 1})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["orphan_items"], {"count": 0, "sample": []})
+        self.assertEqual(
+            resp.json()["ownerless_items"], {"count": 1, "sample": [self.ownerless.id]}
+        )
@@ -0,0 +1,70 @@
+# tests/test_item_receipt_migration.py
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+BEFORE = [("backend_api", "0031_item_receipt")]
+AFTER = [("backend_api", "0033_remove_receipt_items")]
+
+
+class ItemReceiptMigrationTests(TransactionTestCase):
+    """Przeniesienie Receipt.items (M2M) na Item.receipt (FK)."""
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_links_become_foreign_keys(self):
+        apps = self._migrate(BEFORE)
+        Person = apps.get_model("backend_api", "Person")
+        Item = apps.get_model("backend_api", "Item")
+        Receipt = apps.get_model("backend_api", "Receipt")
+
+        payer = Person.objects.create(name="Payer", payer=True)
+        receipts = [
+            Receipt.objects.create(
+                payment_date="2025-05-0%d" % (i + 1),
+                payer=payer,
+                shop="Lidl",
+                transaction_type="expense",
+            )
+            for i in range(2)
+        ]
+
+        def item(description):
+            obj = Item.objects.create(
+                category="fuel", value="2.00", description=description
+            )
+            obj.owners.set([payer])
+            return obj
+
+        single, shared, orphan = item("single"), item("shared"), item("orphan")
+        receipts[0].items.add(single, shared)
+        receipts[1].items.add(shared)
+
+        apps = self._migrate(AFTER)
+        Item = apps.get_model("backend_api", "Item")
+
+        self.assertFalse(Item.objects.filter(id=orphan.id).exists())
+        self.assertEqual(Item.objects.get(id=single.id).receipt_id, receipts[0].id)
+        by_receipt = {
+            receipt.id: sorted(
+                Item.objects.filter(receipt_id=receipt.id).values_list(
+                    "description", flat=True
+                )
+            )
+            for receipt in receipts
+        }
+        self.assertEqual(
+            by_receipt,
+            {receipts[0].id: ["shared", "single"], receipts[1].id: ["shared"]},
+        )
+        # klon pozycji zachowuje ownerów
+        clone = Item.objects.get(receipt_id=receipts[1].id)
+        self.assertEqual(list(clone.owners.values_list("id", flat=True)), [payer.id])
@@ -0,0 +1,85 @@
+# tests/test_item_share_ledger.py
+
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Receipt, ItemShare
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class ItemShareLedgerTests(ReceiptAPITestCase):
+    def test_create_writes_one_row_per_owner(self):
+        receipt_id = self.post_receipt(
+            [
+                ("food_drinks", "10.00", [self.payer.id, self.alice.id]),
+                ("fuel", "7.00", [self.alice.id]),
+            ]
+        )
+        shares = ItemShare.objects.filter(receipt_id=receipt_id)
+        self.assertEqual(shares.count(), 3)
+        self.assertEqual(shares.get(owner=self.payer).share, Decimal("5.000000"))
+        self.assertEqual(
+            sum(s.share for s in shares.filter(owner=self.alice)), Decimal("12")
+        )
+
+    def test_update_and_delete_keep_ledger_in_sync(self):
+        receipt_id = self.post_receipt([("food_drinks", "10.00", [self.alice.id])])
+        url = reverse("receipt-update", args=[receipt_id])
+        resp = self.client.put(
+            url,
+            self.receipt(
+                [("fuel", "4.00", [self.alice.id, self.payer.id])], day="2025-06-01"
+            ),
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        shares = ItemShare.objects.filter(receipt_id=receipt_id)
+        self.assertEqual(shares.count(), 2)
+        self.assertTrue(all(s.category == "fuel" for s in shares))
+        self.assertTrue(all(str(s.payment_date) == "2025-06-01" for s in shares))
+
+        self.client.delete(url)
+        self.assertFalse(Receipt.objects.filter(id=receipt_id).exists())
+        self.assertFalse(ItemShare.objects.filter(receipt_id=receipt_id).exists())
+
+    def test_line_sums_and_pie_read_shares(self):
+        self.post_receipt(
+            [("food_drinks", "9.00", [self.payer.id, self.alice.id])], day="2025-05-10"
+        )
+        resp = self.client.get(
+            reverse("fetch-line-sums"),
+            {
+                "owners[]": [self.alice.id],
+                "year": 2025,
+                "month": 5,
+                "period": "monthly",
+            },
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        days = {row["day"]: row for row in resp.json()}
+        self.assertEqual(days["2025-05-09"]["expense"], 0.0)
+        self.assertEqual(days["2025-05-10"]["expense"], 4.5)
+        self.assertEqual(days["2025-05-31"]["expense"], 4.5)
+
+        resp = self.client.get(
+            reverse("fetch-pie-categories"),
+            {
+                "owners[]": [self.alice.id],
+                "year": 2025,
+                "month": 5,
+                "period": "monthly",
+                "transactionType": "expense",
+            },
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            resp.json(),
+            [
+                {
+                    "category": "food_drinks",
+                    "expense_sum": 4.5,
+                    "fill": "var(--color-food_drinks)",
+                }
+            ],
+        )
@@ -0,0 +1,65 @@
+# tests/test_monthly_rollup.py
+
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import MonthlyRollup
+from backend_api.services import rollup
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class MonthlyRollupTests(ReceiptAPITestCase):
+    def _payload(self, payment_date, value, category="food_drinks"):
+        return self.receipt(
+            [(category, value, [self.payer.id, self.alice.id])], day=payment_date
+        )
+
+    def test_rollups_follow_create_update_delete(self):
+        receipt_id = self.post_receipt(
+            [("food_drinks", "20.00", [self.payer.id, self.alice.id])], day="2025-03-04"
+        )
+        self.assertEqual(
+            MonthlyRollup.objects.get(owner=self.alice, year=2025, month=3).total,
+            Decimal("10"),
+        )
+
+        # zmiana daty przenosi sumę do innego miesiąca
+        resp = self.client.put(
+            reverse("receipt-update", args=[receipt_id]),
+            self._payload("2025-04-01", "30.00"),
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertFalse(MonthlyRollup.objects.filter(month=3).exists())
+        self.assertEqual(
+            MonthlyRollup.objects.get(owner=self.alice, year=2025, month=4).total,
+            Decimal("15"),
+        )
+        self.assertEqual(rollup.diff_against_raw(), [])
+
+        self.client.delete(reverse("receipt-update", args=[receipt_id]))
+        self.assertFalse(MonthlyRollup.objects.exists())
+
+    def test_yearly_line_sums_and_commands(self):
+        for payment_date, value in (("2025-01-10", "4.00"), ("2025-03-10", "6.00")):
+            self.post_receipt(
+                [("food_drinks", value, [self.payer.id, self.alice.id])],
+                day=payment_date,
+            )
+
+        resp = self.client.get(
+            reverse("fetch-line-sums"),
+            {"owners[]": [self.alice.id], "year": 2025, "period": "yearly"},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        expense = [row["expense"] for row in resp.json()]
+        self.assertEqual(expense[:4], [2.0, 2.0, 5.0, 5.0])
+
+        MonthlyRollup.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_rollups", stdout=out)
+        call_command("check_rollups", stdout=out)
+        self.assertIn("spójne", out.getvalue())
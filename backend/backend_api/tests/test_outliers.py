@@ -0,0 +1,97 @@
+# tests/test_outliers.py
+
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.services import outliers, periods
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class OutlierReceiptsTests(ReceiptAPITestCase):
+    persons = {"payer": True, "alice": True}
+
+    def setUp(self):
+        super().setUp()
+        both = [self.payer.id, self.alice.id]
+        alice = [self.alice.id]
+
+        # (płatnik, data, [(kategoria, wartość, ownerzy)])
+        self.r = {}
+        self.r["shared_small"] = self._post(
+            self.payer, "2025-05-02", [("food_drinks", "10.00", both)]
+        )
+        # suma paragonu liczy też pozycję spoza koszyka
+        self.r["shared_big"] = self._post(
+            self.payer,
+            "2025-05-03",
+            [("food_drinks", "5.00", both), ("fuel", "100.00", [self.payer.id])],
+        )
+        self.r["shared_mid"] = self._post(
+            self.payer, "2025-05-04", [("fuel", "40.00", both)]
+        )
+        self.r["mixed"] = self._post(
+            self.payer,
+            "2025-05-05",
+            [("fuel", "30.00", both), ("clothes", "1.00", alice)],
+        )
+        self.r["not_own"] = self._post(
+            self.payer, "2025-05-06", [("clothes", "70.00", alice)]
+        )
+        self.r["balance_only"] = self._post(
+            self.payer, "2025-05-07", [("last_month_balance", "900.00", alice)]
+        )
+        self.r["alice_shared"] = self._post(
+            self.alice, "2025-05-08", [("fuel", "20.00", both)]
+        )
+        self.r["june"] = self._post(self.payer, "2025-06-01", [("fuel", "999", both)])
+        self.may = periods.monthly(2025, 5)
+
+    def _post(self, payer, payment_date, items):
+        return self.post_receipt(items, day=payment_date, payer=payer)
+
+    def test_top_per_payer_and_bucket_in_one_query(self):
+        with self.assertNumQueries(1):
+            top = outliers.top_receipts(self.may, num_top=3)
+        r = self.r
+        self.assertEqual(
+            top["shared"],
+            {
+                self.payer.id: [r["shared_big"], r["shared_mid"], r["mixed"]],
+                self.alice.id: [r["alice_shared"]],
+            },
+        )
+        self.assertEqual(top["not_own"], {self.payer.id: [r["not_own"], r["mixed"]]})
+
+    def test_filters(self):
+        r = self.r
+        top = outliers.top_receipts(self.may, [self.payer.id], ["fuel"], num_top=2)
+        self.assertEqual(
+            top,
+            {"shared": {self.payer.id: [r["shared_mid"], r["mixed"]]}, "not_own": {}},
+        )
+        self.assertEqual(
+            outliers.top_receipts(self.may, num_top=0), {"shared": {}, "not_own": {}}
+        )
+
+    def test_bar_persons_top_param(self):
+        params = {"year": 2025, "month": 5, "period": "monthly"}
+        resp = self.client.get(reverse("fetch-bar-persons"), {**params, "top": 1})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        shared = {
+            row["payer"]: row["top_outlier_receipts"]
+            for row in resp.json()["shared_expenses"]
+        }
+        self.assertEqual(
+            shared,
+            {
+                self.payer.id: [self.r["shared_big"]],
+                self.alice.id: [self.r["alice_shared"]],
+            },
+        )
+
+        default = self.client.get(reverse("fetch-bar-persons"), params).json()
+        self.assertEqual(len(default["shared_expenses"][0]["top_outlier_receipts"]), 3)
+
+        for bad in ("-1", "51", "abc"):
+            resp = self.client.get(reverse("fetch-bar-persons"), {**params, "top": bad})
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST, bad)
@@ -0,0 +1,80 @@
+# tests/test_owner_mask.py
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Item, Person
+from backend_api.services import owner_mask
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class OwnerMaskTests(ReceiptAPITestCase):
+    persons = {"payer": True, "alice": False, "bob": False}
+
+    def setUp(self):
+        super().setUp()
+        self.shared = self._post("Lidl", [self.payer.id, self.alice.id])
+        self.bobs = self._post("Orlen", [self.bob.id])
+
+    def _post(self, shop, owners):
+        return self.post_receipt([("fuel", "10.00", owners)], shop=shop)
+
+    def _mask(self, receipt):
+        item = Item.objects.get(receipt_id=receipt)
+        return item.owner_mask, item.owner_count
+
+    def test_mask_follows_owner_changes(self):
+        self.assertEqual(
+            self._mask(self.shared),
+            (owner_mask.mask_of([self.payer.id, self.alice.id]), 2),
+        )
+        item_id = Item.objects.get(receipt_id=self.bobs).id
+        resp = self.client.patch(
+            reverse("item-detail", args=[item_id]),
+            {"owners": [self.alice.id, self.bob.id]},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self._mask(self.bobs),
+            (owner_mask.mask_of([self.alice.id, self.bob.id]), 2),
+        )
+
+    def test_receipt_owner_filter_without_m2m_join(self):
+        with CaptureQueriesContext(connection) as ctx:
+            rows = self.client.get(
+                reverse("receipt-create"), {"owners": self.alice.id}
+            ).json()
+        self.assertEqual([r["id"] for r in rows], [self.shared])
+        list_sql = [q["sql"] for q in ctx.captured_queries if "EXISTS" in q["sql"]]
+        self.assertEqual(len(list_sql), 1)
+        self.assertIn("owner_mask", list_sql[0])
+        self.assertNotIn("backend_api_item_owners", list_sql[0])
+
+    def test_bar_shops_counts_item_once(self):
+        resp = self.client.get(
+            reverse("fetch-bar-shops"),
+            {
+                "owners[]": [self.payer.id, self.alice.id],
+                "year": 2025,
+                "month": 5,
+                "period": "monthly",
+            },
+        )
+        self.assertEqual(resp.json(), [{"shop": "Lidl", "expense_sum": 10.0}])
+
+    def test_fallback_beyond_mask_width(self):
+        wide = Person.objects.create(
+            id=owner_mask.MASK_BITS + 1, name="Wide", owner=True
+        )
+        self.assertFalse(owner_mask.usable())
+        wide_receipt = self._post("Biedronka", [wide.id])
+
+        rows = self.client.get(reverse("receipt-create"), {"owners": wide.id}).json()
+        self.assertEqual([r["id"] for r in rows], [wide_receipt])
+        rows = self.client.get(
+            reverse("receipt-create"), {"owners": self.bob.id}
+        ).json()
+        self.assertEqual([r["id"] for r in rows], [self.bobs])
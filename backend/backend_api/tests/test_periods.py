@@ -0,0 +1,159 @@
+# tests/test_periods.py
+
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from backend_api.services import periods
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class PeriodResolverTests(APITestCase):
+    def test_ranges_are_half_open(self):
+        cases = [
+            ({"year": "2024", "month": "2"}, date(2024, 2, 1), date(2024, 3, 1)),
+            (
+                {"period": "month", "year": "2024", "month": "12"},
+                date(2024, 12, 1),
+                date(2025, 1, 1),
+            ),
+            ({"period": "yearly", "year": "2024"}, date(2024, 1, 1), date(2025, 1, 1)),
+            (
+                {"period": "quarterly", "year": "2024", "quarter": "4"},
+                date(2024, 10, 1),
+                date(2025, 1, 1),
+            ),
+            (
+                {"period": "quarterly", "year": "2024", "month": "5"},
+                date(2024, 4, 1),
+                date(2024, 7, 1),
+            ),
+            (
+                {"period": "weekly", "year": "2025", "week": "1"},
+                date(2024, 12, 30),
+                date(2025, 1, 6),
+            ),
+            (
+                {"period": "weekly", "from": "2025-05-08"},
+                date(2025, 5, 5),
+                date(2025, 5, 12),
+            ),
+            (
+                {"period": "custom", "from": "2025-05-03", "to": "2025-05-03"},
+                date(2025, 5, 3),
+                date(2025, 5, 4),
+            ),
+        ]
+        for params, start, end in cases:
+            period = periods.resolve(params)
+            self.assertEqual((period.start, period.end), (start, end), params)
+
+    def test_months_and_invalid_params(self):
+        period = periods.resolve(
+            {"period": "custom", "from": "2024-11-20", "to": "2025-01-31"}
+        )
+        self.assertEqual(period.months(), [(2024, 11), (2024, 12), (2025, 1)])
+        self.assertEqual(period.months(include_next=True)[-1], (2025, 2))
+
+        for params in (
+            {"year": "2024"},
+            {"year": "2024", "month": "13"},
+            {"period": "custom", "from": "2025-05-03", "to": "2025-05-01"},
+            {"period": "custom", "from": "2025-05-03"},
+            {"period": "weekly", "year": "2021", "week": "53"},
+            {"period": "daily", "year": "2024"},
+        ):
+            with self.assertRaises(periods.PeriodError, msg=params):
+                periods.resolve(params)
+
+
+class PeriodEndpointTests(ReceiptAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for day, shop, value in (
+            ("2025-03-31", "Lidl", "5.00"),
+            ("2025-04-01", "Lidl", "10.00"),
+            ("2025-04-15", "Orlen", "20.00"),
+            ("2025-06-30", "Orlen", "40.00"),
+            ("2025-07-01", "Lidl", "80.00"),
+        ):
+            self.post_receipt(
+                [("fuel", value, [self.payer.id, self.alice.id])], day=day, shop=shop
+            )
+
+    def _get(self, name, params):
+        params = {"owners[]": [self.alice.id], **params}
+        resp = self.client.get(reverse(name), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        return resp.json()
+
+    def test_quarterly_and_custom_ranges(self):
+        q2 = {"period": "quarterly", "year": 2025, "quarter": 2}
+        pie = self._get("fetch-pie-categories", q2)
+        self.assertEqual(pie[0]["expense_sum"], 35.0)  # (10 + 20 + 40) / 2
+
+        shops = self._get("fetch-bar-shops", q2)
+        self.assertEqual(
+            shops,
+            [
+                {"shop": "Orlen", "expense_sum": 60.0},
+                {"shop": "Lidl", "expense_sum": 10.0},
+            ],
+        )
+
+        custom = {"period": "custom", "from": "2025-03-31", "to": "2025-04-01"}
+        line = self._get("fetch-line-sums", custom)
+        self.assertEqual(
+            line,
+            [
+                {"day": "2025-03-31", "expense": 2.5, "income": 0.0},
+                {"day": "2025-04-01", "expense": 7.5, "income": 0.0},
+            ],
+        )
+
+        balance = self._get("balance", custom)
+        self.assertEqual(balance["computed_balance"], -7.5)
+        self.assertEqual((balance["from"], balance["to"]), ("2025-03-31", "2025-04-01"))
+
+        ratio = self._get("spending-ratio", q2)
+        self.assertEqual(ratio["spending"], 100.0)
+
+        persons = self._get(
+            "fetch-bar-persons", {**custom, "owners[]": [self.payer.id]}
+        )
+        self.assertEqual(persons["shared_expenses"][0]["expense_sum"], 15.0)
+
+    def test_bad_period_is_rejected(self):
+        resp = self.client.get(
+            reverse("fetch-pie-categories"),
+            {"period": "custom", "from": "2025-05-02", "to": "2025-05-01"},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_queries_use_date_ranges(self):
+        monthly = {"year": 2025, "month": 4, "period": "monthly"}
+        with CaptureQueriesContext(connection) as ctx:
+            for name in (
+                "fetch-line-sums",
+                "fetch-pie-categories",
+                "fetch-bar-persons",
+                "fetch-bar-shops",
+                "balance",
+                "spending-ratio",
+            ):
+                self._get(name, monthly)
+            rows = self.client.get(
+                reverse("receipt-create"), {"year": 2025, "month": 4}
+            ).json()
+        self.assertEqual(len(rows), 2)
+
+        dated = [q["sql"] for q in ctx.captured_queries if "payment_date" in q["sql"]]
+        self.assertTrue(dated)
+        for sql in dated:
+            self.assertNotIn("django_date_extract", sql)
+            self.assertNotIn("strftime", sql.lower())
+        self.assertTrue(any('"payment_date" >= ' in sql for sql in dated))
@@ -0,0 +1,130 @@
+# tests/test_prefix_sums.py
+
+from datetime import date, timedelta
+
+from django.db.models import Sum
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import DailyPrefixSum, ItemShare
+from backend_api.services import periods, prefix_sums, response_cache
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class PrefixSumTests(ReceiptAPITestCase):
+    def setUp(self):
+        super().setUp()
+        both = [self.payer.id, self.alice.id]
+
+        self.ids = [
+            self._post("2024-12-30", "expense", "fuel", "40.00", both),
+            self._post("2025-01-02", "expense", "fuel", "10.00", [self.alice.id]),
+            self._post("2025-01-02", "income", "work_income", "100.00", both),
+            self._post("2025-01-20", "expense", "clothes", "7.50", [self.alice.id]),
+            self._post("2025-02-03", "expense", "fuel", "6.00", both),
+            # saldo nie wchodzi do krzywych
+            self._post("2025-02-01", "income", "last_month_balance", "900", both),
+        ]
+
+    def _post(self, day, transaction_type, category, value, owners):
+        return self.post_receipt(
+            [(category, value, owners)], day=day, tx=transaction_type
+        )
+
+    def _brute_force(self, period):
+        """Dzień po dniu z ledgera – tak liczył widok przed tabelą prefiksów."""
+        shares = ItemShare.objects.filter(owner=self.alice).exclude(
+            category="last_month_balance"
+        )
+        result, day = [], period.start
+        while day < period.end:
+            totals = dict(
+                shares.filter(payment_date__gte=period.start, payment_date__lte=day)
+                .values("transaction_type")
+                .annotate(total=Sum("share"))
+                .values_list("transaction_type", "total")
+            )
+            result.append(
+                {
+                    "day": day.isoformat(),
+                    "expense": round(float(totals.get("expense") or 0), 2),
+                    "income": round(float(totals.get("income") or 0), 2),
+                }
+            )
+            day += timedelta(days=1)
+        return result
+
+    def _line(self, **params):
+        response_cache.get_cache().clear()
+        resp = self.client.get(
+            reverse("fetch-line-sums"), {"owners[]": [self.alice.id], **params}
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        return resp.json()
+
+    def test_daily_matches_ledger_across_years(self):
+        period = periods.custom(date(2024, 12, 29), date(2025, 2, 10))
+        with self.assertNumQueries(1):
+            series = prefix_sums.series(self.alice.id, period)
+        self.assertEqual(series, self._brute_force(period))
+
+        # okres w środku danych: odejmuje P(dnia przed startem)
+        line = self._line(period="custom", **{"from": "2025-01-10", "to": "2025-01-31"})
+        self.assertEqual(line[0], {"day": "2025-01-10", "expense": 0.0, "income": 0.0})
+        self.assertEqual(line[-1]["expense"], 7.5)
+
+    def test_weekly_and_monthly_points(self):
+        weekly = self._line(period="monthly", year=2025, month=1, granularity="weekly")
+        # tydzień 30.12–5.01 przycięty do 1.01; wartość na ostatni dzień tygodnia
+        self.assertEqual(
+            weekly[0], {"day": "2025-01-01", "expense": 10.0, "income": 50.0}
+        )
+        self.assertEqual(
+            [row["day"] for row in weekly],
+            ["2025-01-01", "2025-01-06", "2025-01-13", "2025-01-20", "2025-01-27"],
+        )
+        self.assertEqual(weekly[-1]["expense"], 17.5)
+
+        yearly = self._line(period="yearly", year=2025)
+        self.assertEqual(len(yearly), 12)
+        self.assertEqual([row["expense"] for row in yearly[:3]], [17.5, 20.5, 20.5])
+        multi = self._line(
+            period="custom",
+            granularity="monthly",
+            **{"from": "2024-12-15", "to": "2025-02-28"},
+        )
+        self.assertEqual(
+            [(row["day"], row["expense"]) for row in multi],
+            [("2024-12-15", 20.0), ("2025-01-01", 37.5), ("2025-02-01", 40.5)],
+        )
+        resp = self.client.get(
+            reverse("fetch-line-sums"),
+            {"owners[]": [self.alice.id], "year": 2025, "granularity": "hourly"},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_consistent_after_date_change_and_delete(self):
+        first = self.ids[0]
+        # przesunięcie paragonu z 2024 na luty 2025
+        resp = self.client.patch(
+            reverse("receipt-update", args=[first]),
+            {"payment_date": "2025-02-05"},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(prefix_sums.diff_against_ledger(), [])
+        period = periods.custom(date(2024, 12, 1), date(2025, 2, 28))
+        self.assertEqual(
+            prefix_sums.series(self.alice.id, period), self._brute_force(period)
+        )
+
+        self.client.delete(reverse("receipt-update", args=[self.ids[1]]))
+        self.assertEqual(prefix_sums.diff_against_ledger(), [])
+        self.assertEqual(
+            prefix_sums.series(self.alice.id, period), self._brute_force(period)
+        )
+
+        DailyPrefixSum.objects.update(expense=0)
+        self.assertTrue(prefix_sums.diff_against_ledger())
+        prefix_sums.rebuild_all()
+        self.assertEqual(prefix_sums.diff_against_ledger(), [])
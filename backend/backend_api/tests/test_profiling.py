@@ -0,0 +1,99 @@
+# tests/test_profiling.py
+
+import pstats
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend_api.models import Person
+from backend_api.services import response_cache
+
+
+class ProfilingTests(APITestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        override = override_settings(
+            PROFILING_ENABLED=True, PROFILING_DIR=self.dir, PROFILING_KEEP=2
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+        response_cache.get_cache().clear()
+        self.payer = Person.objects.create(name="Payer", payer=True, owner=True)
+        self.staff = User.objects.create_user("admin", password="x", is_staff=True)
+        self.params = {"year": 2025, "month": 5, "owners[]": [self.payer.id]}
+
+    def _profile(self, **extra):
+        return self.client.get(
+            reverse("fetch-line-sums"), {**self.params, "_profile": 1}, **extra
+        )
+
+    def test_staff_request_is_profiled(self):
+        self.client.force_login(self.staff)
+        resp = self._profile()
+        self.assertEqual(resp.status_code, 200)
+        profile_id = resp["X-Profile-Id"]
+
+        stats = pstats.Stats(str(self.dir / f"{profile_id}.prof"))
+        self.assertTrue(
+            any(func == "fetch_line_sums" for _, _, func in stats.stats),
+            "widok powinien być w profilu",
+        )
+
+        meta = self.client.get(reverse("profile-detail", args=[profile_id])).json()
+        self.assertEqual(meta["view"], "fetch-line-sums")
+        self.assertEqual(meta["status"], 200)
+        self.assertGreater(meta["queries"], 0)
+        self.assertIn("cumulative", meta["summary"])
+        self.assertEqual(
+            set(meta["breakdown"]),
+            {"total_ms", "sql_ms", "orm_ms", "app_ms", "framework_ms", "other_ms"},
+        )
+
+        dump = self.client.get(reverse("profile-dump", args=[profile_id]))
+        self.assertEqual(dump.status_code, 200)
+        self.assertEqual(
+            b"".join(dump.streaming_content),
+            (self.dir / f"{profile_id}.prof").read_bytes(),
+        )
+
+    def test_header_trigger_and_ring_limit(self):
+        self.client.force_login(self.staff)
+        ids = [
+            self.client.get(
+                reverse("fetch-line-sums"), self.params, HTTP_X_PROFILE="1"
+            )["X-Profile-Id"]
+            for _ in range(3)
+        ]
+        listed = self.client.get(reverse("profile-list")).json()["profiles"]
+        self.assertEqual([p["id"] for p in listed], ids[:0:-1])
+        self.assertEqual(len(list(self.dir.glob("*.prof"))), 2)
+        self.assertEqual(
+            self.client.get(reverse("profile-detail", args=[ids[0]])).status_code,
+            404,
+        )
+
+    def test_not_profiled_without_staff_or_setting(self):
+        self.assertNotIn("X-Profile-Id", self._profile())
+
+        User.objects.create_user("user", password="x")
+        self.client.login(username="user", password="x")
+        self.assertNotIn("X-Profile-Id", self._profile())
+        self.assertEqual(self.client.get(reverse("profile-list")).status_code, 403)
+
+        self.client.force_login(self.staff)
+        with override_settings(PROFILING_ENABLED=False):
+            self.assertNotIn("X-Profile-Id", self._profile())
+        self.assertNotIn("X-Profile-Id", self.client.get(reverse("fetch-line-sums")))
+        self.assertEqual(list(self.dir.iterdir()), [])
+
+    def test_invalid_profile_id(self):
+        self.client.force_login(self.staff)
+        resp = self.client.get(reverse("profile-detail", args=["..%2Fsecret"]))
+        self.assertEqual(resp.status_code, 404)
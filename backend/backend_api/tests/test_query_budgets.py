@@ -0,0 +1,138 @@
+# tests/test_query_budgets.py
+
+from datetime import date
+from decimal import Decimal
+
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.test import APITestCase
+
+from backend_api.models import (
+    Instrument,
+    Invest,
+    Item,
+    Person,
+    Receipt,
+    Wallet,
+    WalletSnapshot,
+)
+from backend_api.services import benchmark, owner_mask, receipts_saved
+from backend_api.services.query_budget import QueryRecorder, budget_of
+
+SMALL, LARGE = 10, 1000
+
+
+class QueryBudgetTests(APITestCase):
+    """
+    Każda trasa GET ma zadeklarowany budżet zapytań (@query_budget) i liczba
+    zapytań nie rośnie między zbiorem 10 a 1000 paragonów (brak N+1).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.payer = Person.objects.create(name="Payer", payer=True, owner=True)
+        cls.alice = Person.objects.create(name="Alice", payer=True, owner=True)
+        cls.wallet = Wallet.objects.create(name="Portfel")
+        cls.instrument = Instrument.objects.create(
+            name="ETF", symbol="ETFW20", category="etf"
+        )
+
+    def _seed(self, total):
+        """Dokłada paragony (z pozycjami i inwestycjami) do `total` w maju 2025."""
+        start = Receipt.objects.count()
+        persons = [self.payer, self.alice]
+        receipts = Receipt.objects.bulk_create(
+            Receipt(
+                payment_date=date(2025, 5, 1 + n % 28),
+                payer=persons[n % 2],
+                shop=f"sklep {n % 7}",
+                transaction_type="income" if n % 5 == 0 else "expense",
+            )
+            for n in range(start, total)
+        )
+        owner_sets = [[self.payer.id], [self.alice.id], [self.payer.id, self.alice.id]]
+        items, owners = [], []
+        for receipt in receipts:
+            for k in range(3):
+                ids = owner_sets[(receipt.id + k) % 3]
+                items.append(
+                    Item(
+                        receipt=receipt,
+                        category=("fuel", "food_drinks", "work_income")[k],
+                        value=Decimal("10.00") + k,
+                        description=f"pozycja {k}",
+                        owner_mask=owner_mask.mask_of(ids),
+                        owner_count=len(ids),
+                    )
+                )
+                owners.append(ids)
+        Item.objects.bulk_create(items)
+        Item.owners.through.objects.bulk_create(
+            Item.owners.through(item_id=item.id, person_id=pid)
+            for item, ids in zip(items, owners)
+            for pid in ids
+        )
+        receipts_saved([r.id for r in receipts])
+        Invest.objects.bulk_create(
+            Invest(
+                wallet=self.wallet,
+                instrument=self.instrument,
+                value=Decimal("100.00"),
+                payment_date=r.payment_date,
+                transaction_type="buy",
+            )
+            for r in receipts
+        )
+        WalletSnapshot.objects.bulk_create(
+            WalletSnapshot(wallet=self.wallet, total_value=1, total_invest_income=0)
+            for _ in receipts[::10]
+        )
+
+    def _measure(self):
+        client = Client()
+        counts = {}
+        with override_settings(ANALYTICS_CACHE_ENABLED=False):
+            for spec in benchmark.build_requests():
+                if "skipped" in spec:
+                    continue
+                client.get(spec["url"], spec["params"])  # rozgrzewka
+                with QueryRecorder() as recorder:
+                    response = client.get(spec["url"], spec["params"])
+                self.assertLess(response.status_code, 500, spec["name"])
+                counts[spec["name"]] = recorder
+        return counts
+
+    def test_query_counts_within_budget_and_flat(self):
+        callbacks = dict(benchmark.routes())
+        self._seed(SMALL)
+        small = self._measure()
+        self._seed(LARGE)
+        large = self._measure()
+        self.assertEqual(set(small), set(large))
+
+        failures = []
+        for name, recorder in large.items():
+            budget = budget_of(name, callbacks[name])
+            if budget is None:
+                failures.append(f"{name}: brak @query_budget")
+            elif len(recorder) > budget:
+                failures.append(
+                    f"{name}: {len(recorder)} zapytań > budżet {budget}\n"
+                    + recorder.report()
+                )
+            elif len(recorder) > len(small[name]):
+                failures.append(
+                    f"{name}: {len(small[name])} → {len(recorder)} zapytań "
+                    f"przy {SMALL} → {LARGE} paragonach\n" + recorder.report()
+                )
+        self.assertFalse(failures, "\n\n".join(failures))
+
+    def test_report_groups_repeated_queries(self):
+        self._seed(SMALL)
+        with QueryRecorder() as recorder:
+            for item in Item.objects.all()[:4]:
+                list(item.owners.all())
+        report = recorder.report()
+        self.assertEqual(len(recorder), 5)
+        self.assertTrue(report.startswith("4× SELECT"), report)
+        self.assertIn('INNER JOIN "backend_api_item_owners"', report)
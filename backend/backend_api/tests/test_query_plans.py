@@ -0,0 +1,137 @@
+# tests/test_query_plans.py
+
+import re
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from backend_api.models import Item, Person, RecentShop, Receipt
+from backend_api.services import owner_mask, receipts_saved
+
+# tabele, po których pełny skan oznacza brakujący / nieużyty indeks
+WATCHED = {
+    "backend_api_receipt",
+    "backend_api_item",
+    "backend_api_itemshare",
+    "backend_api_monthlyrollup",
+    "backend_api_dailyprefixsum",
+    "backend_api_recentshop",
+}
+ALIAS_RE = re.compile(r'"(backend_api_\w+)"(?: AS)? "?([A-Z]\d+)"?')
+SCAN_RE = re.compile(r"^SCAN (\S+)$")
+
+MONTHLY = {"year": 2025, "month": 5, "period": "monthly"}
+
+
+def full_scans(sql):
+    """Pełne skany obserwowanych tabel w planie `EXPLAIN QUERY PLAN`."""
+    aliases = {alias: table for table, alias in ALIAS_RE.findall(sql)}
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        details = [row[-1] for row in cursor.fetchall()]
+    scans = []
+    for detail in details:
+        match = SCAN_RE.match(detail)
+        if match:
+            table = aliases.get(match.group(1), match.group(1)).strip('"')
+            if table in WATCHED:
+                scans.append(detail)
+    return scans
+
+
+class QueryPlanTests(APITestCase):
+    """
+    Główne zapytania endpointów na zasianych danych nie mogą wracać do
+    pełnego skanu tabel (SCAN bez indeksu) – regresja indeksów.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.payer = Person.objects.create(name="Payer", payer=True, owner=True)
+        cls.alice = Person.objects.create(name="Alice", payer=False, owner=True)
+        start = date(2024, 1, 1)
+        receipts = Receipt.objects.bulk_create(
+            Receipt(
+                payment_date=start + timedelta(days=3 * i),
+                payer=cls.payer,
+                shop=("lidl", "orlen", "biedronka")[i % 3],
+                transaction_type="income" if i % 7 == 0 else "expense",
+            )
+            for i in range(200)
+        )
+        items = Item.objects.bulk_create(
+            Item(
+                receipt=receipt,
+                category=("fuel", "food_drinks", "fastfood")[n],
+                value="12.50",
+                description=f"item {n}",
+            )
+            for receipt in receipts
+            for n in range(3)
+        )
+        links = Item.owners.through
+        links.objects.bulk_create(
+            links(item_id=item.id, person_id=person.id)
+            for i, item in enumerate(items)
+            for person in ((cls.payer, cls.alice) if i % 2 else (cls.alice,))
+        )
+        owner_mask.refresh_all()
+        receipts_saved([r.id for r in receipts])
+        RecentShop.objects.bulk_create(
+            RecentShop(name=name) for name in ("lidl", "orlen", "biedronka")
+        )
+
+    def assertNoFullScans(self, name, params, method="get"):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = getattr(self.client, method)(reverse(name), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        selects = [
+            q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")
+        ]
+        self.assertTrue(selects)
+        for sql in selects:
+            self.assertEqual(full_scans(sql), [], f"{name}: {sql}")
+
+    def test_receipt_list(self):
+        self.assertNoFullScans("receipt-create", {"year": 2025, "month": 5})
+        self.assertNoFullScans(
+            "receipt-create",
+            {"payment_date_after": "2025-01-01", "payment_date_before": "2025-02-01"},
+        )
+        self.assertNoFullScans(
+            "receipt-create",
+            {"transaction_type": "income", "year": 2024, "owners": self.alice.id},
+        )
+        self.assertNoFullScans(
+            "receipt-create", {"payer": self.payer.id, "year": 2024, "month": 3}
+        )
+
+    def test_analytics_endpoints(self):
+        owners = {"owners[]": [self.alice.id]}
+        for name, extra in (
+            ("fetch-line-sums", {}),
+            ("fetch-pie-categories", {}),
+            ("fetch-bar-persons", {}),
+            ("fetch-bar-shops", {}),
+            ("balance", {}),
+            ("spending-ratio", {}),
+            ("fetch-dashboard", {}),
+        ):
+            with self.subTest(name):
+                self.assertNoFullScans(name, {**MONTHLY, **owners, **extra})
+
+    def test_yearly_and_custom_periods(self):
+        owners = {"owners[]": [self.alice.id]}
+        yearly = {"year": 2024, "period": "yearly"}
+        custom = {"period": "custom", "from": "2024-03-01", "to": "2024-04-15"}
+        for name in ("fetch-line-sums", "fetch-pie-categories", "fetch-bar-shops"):
+            for params in (yearly, custom):
+                with self.subTest(name, **params):
+                    self.assertNoFullScans(name, {**params, **owners})
+
+    def test_shop_suggestions(self):
+        self.assertNoFullScans("recent-shop-search", {"q": "lid"})
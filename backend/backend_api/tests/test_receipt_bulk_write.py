@@ -0,0 +1,69 @@
+# tests/test_receipt_bulk_write.py
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Item, Receipt
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class ReceiptBulkWriteTests(ReceiptAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("receipt-create")
+
+    def _receipt(self, n_items, day="2025-05-03", owners=None, payer=None):
+        owners = owners or [self.payer.id, self.alice.id]
+        items = [("fuel", f"{i + 1}.00", owners) for i in range(n_items)]
+        return self.receipt(items, day=day, payer=payer, shop="Lidl")
+
+    def _queries(self, payload):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(self.url, payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        return len(ctx.captured_queries)
+
+    def test_query_count_independent_of_item_count(self):
+        # pierwszy zapis zakłada wiersze rollupów/wersji dla miesiąca
+        self._queries(self._receipt(1))
+        self.assertEqual(
+            self._queries(self._receipt(2)), self._queries(self._receipt(20))
+        )
+
+    def test_list_payload_constant_queries(self):
+        self._queries(self._receipt(1))
+        small = self._queries([self._receipt(1), self._receipt(1, "2025-05-04")])
+        large = self._queries(
+            [self._receipt(5, f"2025-05-{d:02d}") for d in range(5, 15)]
+        )
+        self.assertEqual(small, large)
+        self.assertEqual(Receipt.objects.count(), 13)
+        self.assertEqual(Item.objects.count(), 53)
+
+    def test_response_and_relations(self):
+        resp = self.client.post(self.url, self._receipt(3), format="json")
+        body = resp.json()
+        self.assertEqual(body["payer"], self.payer.id)
+        self.assertEqual([i["value"] for i in body["items"]], ["1.00", "2.00", "3.00"])
+        self.assertEqual(body["items"][0]["owners"], [self.payer.id, self.alice.id])
+        receipt = Receipt.objects.get(id=body["id"])
+        self.assertEqual(receipt.items.count(), 3)
+
+    def test_unknown_owner_rolls_back_whole_list(self):
+        resp = self.client.post(
+            self.url,
+            [self._receipt(1), self._receipt(1, owners=[999])],
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Receipt.objects.count(), 0)
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_payer_must_be_payer(self):
+        resp = self.client.post(
+            self.url, self._receipt(1, payer=self.alice.id), format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("payer", resp.json())
@@ -0,0 +1,117 @@
+# tests/test_receipt_fingerprints.py
+
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Item, Receipt
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class ReceiptFingerprintTests(ReceiptAPITestCase):
+    persons = {"payer": True}
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("receipt-create")
+
+    def _receipt(self, shop="Lidl", items=(("fuel", "10.00"), ("food_drinks", "2.5"))):
+        return self.receipt([(c, v, [self.payer.id]) for c, v in items], shop=shop)
+
+    def _fingerprint(self, receipt_id):
+        return Receipt.objects.get(id=receipt_id).fingerprint
+
+    def test_fingerprint_follows_content(self):
+        first = self.client.post(self.url, self._receipt(), format="json").data["id"]
+        # inna kolejność pozycji, wielkość liter i spacje w sklepie – ten sam odcisk
+        same = self.client.post(
+            self.url,
+            self._receipt(" LIDL ", (("food_drinks", "2.50"), ("fuel", "10"))),
+            format="json",
+        ).data["id"]
+        other = self.client.post(
+            self.url, self._receipt(items=(("fuel", "10.00"),)), format="json"
+        ).data["id"]
+        self.assertEqual(len(self._fingerprint(first)), 32)
+        self.assertEqual(self._fingerprint(first), self._fingerprint(same))
+        self.assertNotEqual(self._fingerprint(first), self._fingerprint(other))
+
+        # usunięcie pozycji przez endpoint pozycji odświeża odcisk
+        item = Item.objects.filter(receipt_id=first, category="food_drinks").get()
+        self.client.delete(reverse("item-detail", args=[item.id]))
+        self.assertEqual(self._fingerprint(first), self._fingerprint(other))
+
+        resp = self.client.get(reverse("receipt-duplicates-debug"))
+        groups = resp.data["duplicates"]
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0]["receipt_ids"], [first, other])
+        self.assertEqual(groups[0]["count"], 2)
+
+    def test_create_warn_and_reject(self):
+        first = self.client.post(self.url, self._receipt(), format="json").data["id"]
+
+        resp = self.client.post(
+            f"{self.url}?duplicates=reject", self._receipt(), format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(resp.data["duplicates"][0]["duplicate_of"], [first])
+        self.assertEqual(Receipt.objects.count(), 1)
+
+        resp = self.client.post(
+            f"{self.url}?duplicates=warn",
+            [self._receipt("Orlen"), self._receipt(), self._receipt("Orlen")],
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("duplicate_of", resp.data[0])
+        self.assertEqual(resp.data[1]["duplicate_of"], [first])
+        self.assertEqual(
+            (resp.data[2]["duplicate_of"], resp.data[2]["duplicate_of_index"]), ([], 0)
+        )
+        self.assertEqual(Receipt.objects.count(), 4)
+
+        resp = self.client.post(
+            f"{self.url}?duplicates=x", self._receipt(), format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_reject_skips_duplicates(self):
+        first = self.client.post(self.url, self._receipt(), format="json").data["id"]
+
+        def line(shop, value):
+            return json.dumps(
+                {
+                    "paymentDate": "2025-05-03",
+                    "payerId": self.payer.id,
+                    "shop": shop,
+                    "transactionType": "expense",
+                    "items": [
+                        {"category": "fuel", "value": "10.00", "ownerIds": []},
+                        {"category": "food_drinks", "value": value, "ownerIds": []},
+                    ],
+                }
+            )
+
+        content = "\n".join(
+            [line("Lidl", "2.50"), line("Orlen", "1"), line("Orlen", "1")]
+        )
+        upload = SimpleUploadedFile("receipts.ndjson", content.encode())
+        resp = self.client.post(
+            f"{reverse('import_receipts')}?duplicates=reject",
+            {"file": upload},
+            format="multipart",
+        )
+        data = resp.json()
+        self.assertEqual((data["inserted"], data["duplicates"]), (1, 2))
+        self.assertEqual(
+            data["duplicateSamples"],
+            [
+                {"line": 1, "duplicateOf": [first]},
+                {"line": 3, "duplicateOf": [], "duplicateOfLine": 2},
+            ],
+        )
+        self.assertEqual(Receipt.objects.count(), 2)
+        imported = Receipt.objects.get(shop="Orlen")
+        self.assertEqual(len(imported.fingerprint), 32)
@@ -0,0 +1,70 @@
+# tests/test_receipt_pagination.py
+
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class ReceiptListPaginationTests(ReceiptAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("receipt-create")
+        # kilka paragonów z tą samą datą – remis rozstrzyga id
+        for day, values in [
+            ("2025-05-03", ["1.00", "2.00"]),
+            ("2025-05-03", ["3.50"]),
+            ("2025-05-01", ["4.00"]),
+            ("2025-05-03", ["5.00", "6.00", "7.00"]),
+            ("2025-06-01", ["8.00"]),
+        ]:
+            self._post(day, values)
+
+    def _post(self, payment_date, values):
+        owners = [self.payer.id, self.alice.id]
+        self.post_receipt([("fuel", v, owners) for v in values], day=payment_date)
+
+    def test_cursor_walks_all_receipts_in_key_order(self):
+        full = self.client.get(self.url).json()
+        self.assertIsInstance(full, list)
+
+        seen, params = [], {"page_size": 2}
+        while True:
+            page = self.client.get(self.url, params).json()
+            self.assertLessEqual(len(page["results"]), 2)
+            seen += page["results"]
+            if not page["next"]:
+                break
+            params = parse_qs(urlsplit(page["next"]).query)
+
+        self.assertEqual(seen, full)
+        keys = [(r["payment_date"], r["id"]) for r in seen]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_invalid_cursor(self):
+        resp = self.client.get(self.url, {"cursor": "!!!"})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_summary_mode(self):
+        rows = self.client.get(
+            self.url, {"view": "summary", "owners": self.alice.id}
+        ).json()
+        self.assertNotIn("items", rows[0])
+        by_count = {r["item_count"]: r["total"] for r in rows}
+        self.assertEqual(by_count[3], "18.00")
+        self.assertEqual(by_count[2], "3.00")
+
+    def test_full_mode_constant_queries(self):
+        def count():
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(self.url)
+            return len(ctx.captured_queries)
+
+        before = count()
+        for _ in range(5):
+            self._post("2025-07-01", ["1.00", "2.00"])
+        self.assertEqual(count(), before)
@@ -0,0 +1,108 @@
+# tests/test_receipt_update_diff.py
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Item, ItemShare, MonthlyRollup
+from backend_api.services import prefix_sums
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class ReceiptUpdateDiffTests(ReceiptAPITestCase):
+    def setUp(self):
+        super().setUp()
+        owners = [self.payer.id, self.alice.id]
+        receipt_id = self.post_receipt(
+            [("food_drinks", "1.00", owners)] * 60, shop="Lidl"
+        )
+        self.url = reverse("receipt-update", args=[receipt_id])
+        self.saved = self.client.get(self.url).json()
+
+    def _put(self, items):
+        payload = {**self.saved, "items": items}
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.put(self.url, payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        return resp.json(), ctx.captured_queries
+
+    @staticmethod
+    def _item_writes(queries):
+        tables = (
+            "backend_api_item",
+            "backend_api_item_owners",
+            "backend_api_receipt_items",
+        )
+        return [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+            and any(f'"{table}"' in q["sql"].split("(")[0] for table in tables)
+        ]
+
+    def test_editing_one_line_touches_one_row(self):
+        items = [dict(i) for i in self.saved["items"]]
+        items[7]["value"] = "9.99"
+
+        body, queries = self._put(items)
+        self.assertEqual(
+            body["item_changes"],
+            {"created": [], "updated": [items[7]["id"]], "deleted": []},
+        )
+        writes = self._item_writes(queries)
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith('UPDATE "backend_api_item"'))
+        self.assertEqual([i["id"] for i in body["items"]], [i["id"] for i in items])
+
+    def test_create_update_delete(self):
+        items = [dict(i) for i in self.saved["items"][:58]]
+        items[0]["owners"] = [self.alice.id]
+        items.append(
+            {
+                "category": "fuel",
+                "value": "10.00",
+                "description": "nowa",
+                "owners": [self.payer.id],
+            }
+        )
+        dropped = [i["id"] for i in self.saved["items"][58:]]
+
+        body, _ = self._put(items)
+        changes = body["item_changes"]
+        self.assertEqual(changes["updated"], [items[0]["id"]])
+        self.assertEqual(changes["deleted"], dropped)
+        self.assertEqual(len(changes["created"]), 1)
+        self.assertEqual(len(body["items"]), 59)
+
+        # usunięte pozycje nie zostają jako sieroty, ledger i rollupy się zgadzają
+        self.assertFalse(Item.objects.filter(id__in=dropped).exists())
+        self.assertEqual(ItemShare.objects.filter(item_id__in=dropped).count(), 0)
+        fuel = MonthlyRollup.objects.get(owner=self.payer, category="fuel")
+        self.assertEqual(fuel.total, 10)
+        food_alice = MonthlyRollup.objects.get(owner=self.alice, category="food_drinks")
+        self.assertEqual(food_alice.total, 29.5)
+
+    def test_patch_without_items_keeps_items(self):
+        resp = self.client.patch(self.url, {"shop": "Biedronka"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.json()["items"]), 60)
+        self.assertEqual(resp.json()["shop"], "Biedronka")
+
+    def test_partial_patch_keeps_owners(self):
+        items = [{"id": i["id"]} for i in self.saved["items"]]
+        items[3]["value"] = "4.00"
+        resp = self.client.patch(self.url, {"items": items}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        self.assertEqual(resp.json()["item_changes"]["updated"], [items[3]["id"]])
+
+        owners = {i["id"]: i["owners"] for i in resp.json()["items"]}
+        self.assertEqual(
+            set(map(tuple, owners.values())), {(self.payer.id, self.alice.id)}
+        )
+        self.assertEqual(ItemShare.objects.count(), 120)
+        self.assertEqual(prefix_sums.diff_against_ledger(), [])
+        self.assertEqual(
+            MonthlyRollup.objects.get(owner=self.alice, category="food_drinks").total,
+            31.5,
+        )
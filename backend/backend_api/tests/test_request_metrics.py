@@ -0,0 +1,85 @@
+# tests/test_request_metrics.py
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from backend_api.models import Person
+from backend_api.services import metrics
+
+
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        self.payer = Person.objects.create(name="Payer", payer=True, owner=True)
+        self.staff = User.objects.create_user("admin", password="x", is_staff=True)
+        self.client.force_authenticate(self.staff)
+        metrics.reset()
+
+    def _metrics(self):
+        resp = self.client.get(reverse("request-metrics"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return resp.content.decode()
+
+    def test_histograms_per_view(self):
+        for _ in range(2):
+            self.client.get(reverse("person-list"))
+        self.client.get("/api/nie-ma-takiej-trasy/")
+        body = self._metrics()
+
+        labels = 'view="person-list",method="GET"'
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 2", body)
+        self.assertIn(f'http_request_queries_bucket{{{labels},le="+Inf"}} 2', body)
+        self.assertIn(f'http_request_queries_bucket{{{labels},le="0"}} 0', body)
+        self.assertIn(f"http_request_db_seconds_sum{{{labels}}}", body)
+        self.assertIn(f"http_response_size_bytes_count{{{labels}}} 2", body)
+        self.assertIn(
+            'http_responses_total{view="person-list",method="GET",status="200"} 2',
+            body,
+        )
+        self.assertIn(
+            'http_responses_total{view="<unresolved>",method="GET",status="404"} 1',
+            body,
+        )
+        self.assertIn("# TYPE http_request_queries histogram", body)
+
+        self.client.delete(reverse("request-metrics"))
+        self.assertNotIn('view="person-list"', self._metrics())
+
+    def test_debug_endpoints_require_admin(self):
+        self.client.get(reverse("person-list"))
+        self.client.force_authenticate(None)
+        for name in ("request-metrics", "analytics-cache-debug"):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 403)
+            self.assertEqual(self.client.delete(reverse(name)).status_code, 403)
+        self.assertIn('view="person-list"', metrics.render())
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram((1, 5, 10))
+        for value in (0, 1, 3, 7, 50):
+            histogram.observe(value)
+        self.assertEqual(
+            histogram.cumulative(),
+            [("1", 2), ("5", 3), ("10", 4), ("+Inf", 5)],
+        )
+        self.assertEqual((histogram.sum, histogram.count), (61, 5))
+
+    @override_settings(SLOW_REQUEST_MS=0, SLOW_REQUEST_TOP_SQL=1)
+    def test_slow_request_logged_with_top_sql(self):
+        with self.assertLogs("backend_api.slow_requests", "WARNING") as logs:
+            self.client.get(reverse("person-list"))
+        self.assertEqual(len(logs.output), 1)
+        message = logs.output[0]
+        self.assertIn("GET /api/person/ (person-list) → 200", message)
+        self.assertIn("backend_api_person", message)
+
+    @override_settings(SLOW_REQUEST_MS=None)
+    def test_fast_requests_not_logged(self):
+        with self.assertNoLogs("backend_api.slow_requests", "WARNING"):
+            self.client.get(reverse("person-list"))
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_disabled(self):
+        self.client.get(reverse("person-list"))
+        self.assertNotIn('view="person-list"', metrics.render())
@@ -0,0 +1,93 @@
+# tests/test_response_cache.py
+
+import tempfile
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from backend_api.models import Person
+from backend_api.services import response_cache
+from backend_api.tests.helpers import ReceiptAPITestCase
+
+
+class ResponseCacheTests(ReceiptAPITestCase):
+    persons = {"payer": True}
+
+    def setUp(self):
+        super().setUp()
+        response_cache.reset_stats()
+
+    def _post(self, payment_date, value):
+        self.post_receipt([("fuel", value, [self.payer.id])], day=payment_date)
+
+    def _pie(self, month=5):
+        return self.client.get(
+            reverse("fetch-pie-categories"),
+            {
+                "owners[]": [self.payer.id],
+                "year": 2025,
+                "month": month,
+                "period": "monthly",
+                "transactionType": "expense",
+            },
+        )
+
+    def test_hit_then_invalidated_by_write_in_same_month(self):
+        self._post("2025-05-02", "10.00")
+        first = self._pie().json()
+        second = self._pie().json()
+        self.assertEqual(first, second)
+        self.assertEqual(
+            response_cache.stats()["pie-categories"], {"hit": 1, "miss": 1}
+        )
+
+        # zapis w innym miesiącu nie unieważnia maja
+        self._post("2025-06-02", "1.00")
+        self._pie()
+        self.assertEqual(response_cache.stats()["pie-categories"]["hit"], 2)
+
+        self._post("2025-05-03", "5.00")
+        self.assertEqual(self._pie().json()[0]["expense_sum"], 15.0)
+        self.assertEqual(response_cache.stats()["pie-categories"]["miss"], 2)
+
+    def test_balance_cache_tracks_next_month(self):
+        url = reverse("balance")
+        params = {"owners[]": [self.payer.id], "year": 2025, "month": 5}
+        self.assertTrue(self.client.get(url, params).data["create"])
+
+        # saldo maja zapisuje się jako paragon z 1 czerwca
+        self.client.post(url, {"year": 2025, "month": 6, "value": "3"}, format="json")
+        self.assertFalse(self.client.get(url, params).data["create"])
+
+    def test_owner_order_is_part_of_key(self):
+        self._post("2025-05-02", "10.00")
+        alice = Person.objects.create(name="Alice", payer=False, owner=True)
+        self.post_receipt([("fuel", "7.00", [alice.id])], day="2025-05-03")
+
+        def line(owners):
+            params = {"owners[]": owners, "year": 2025, "month": 5, "period": "monthly"}
+            return self.client.get(reverse("fetch-line-sums"), params).json()
+
+        # line-sums liczy pierwszego ownera – odwrócona lista to inny wynik
+        self.assertEqual(line([self.payer.id, alice.id])[-1]["expense"], 10.0)
+        self.assertEqual(line([alice.id, self.payer.id])[-1]["expense"], 7.0)
+        self.assertEqual(response_cache.stats()["line-sums"]["miss"], 2)
+
+    def test_file_based_cache_backend(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            file_caches = {
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "analytics": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": tmp,
+                },
+            }
+            with override_settings(CACHES=file_caches):
+                self._post("2025-05-02", "10.00")
+                self._pie()
+                resp = self._pie()
+                self.assertEqual(resp.status_code, status.HTTP_200_OK)
+                self.assertEqual(resp.json()[0]["expense_sum"], 10.0)
+                self.assertEqual(response_cache.stats()["pie-categories"]["hit"], 1)
+                caches["analytics"].clear()
@@ -0,0 +1,132 @@
+# tests/test_spending_ratio.py
+
+from datetime import date
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from backend_api.models import CategoryGroup, Item, Person, Receipt
+from backend_api.services import category_groups, receipts_saved, response_cache
+
+
+class SpendingRatioEngineTests(APITestCase):
+    def setUp(self):
+        response_cache.get_cache().clear()
+        category_groups.invalidate()
+        self.addCleanup(category_groups.invalidate)
+        self.alice = Person.objects.create(name="Alice", payer=True, owner=True)
+        self.bob = Person.objects.create(name="Bob", payer=True, owner=True)
+
+        # maj: Alice 30 fuel + 10 alcohol, Bob 50 (połowa z pozycji 100) invest
+        self.fuel = self._item(date(2025, 5, 3), "fuel", "30", [self.alice])
+        self.alcohol = self._item(date(2025, 5, 4), "alcohol", "10", [self.alice])
+        self._item(
+            date(2025, 5, 5), "investments_savings", "100", [self.alice, self.bob]
+        )
+        # czerwiec: Alice 20 fastfood
+        self._item(date(2025, 6, 1), "fastfood", "20", [self.alice])
+
+    def _item(self, day, category, value, owners):
+        receipt = Receipt.objects.create(
+            payer=self.alice, shop="S", transaction_type="expense", payment_date=day
+        )
+        item = Item.objects.create(
+            receipt=receipt, category=category, value=Decimal(value), description="x"
+        )
+        item.owners.set(owners)
+        receipts_saved([receipt.id])
+        return item
+
+    def _get(self, **params):
+        response_cache.get_cache().clear()
+        return self.client.get(
+            reverse("spending-ratio"),
+            {"owners[]": [self.alice.id], "year": 2025, "month": 5, **params},
+        )
+
+    def test_single_owner_counts_without_ids(self):
+        with self.assertNumQueries(4):
+            resp = self._get()
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            resp.data,
+            {
+                "available": True,
+                "invest": 55.56,
+                "spending": 33.33,
+                "fun": 11.11,
+                "invest_count": 1,
+                "spending_count": 1,
+                "fun_count": 1,
+            },
+        )
+
+    def test_ids_are_paged(self):
+        first = self._get(ids=1, ids_limit=1).data
+        self.assertEqual(first["spending_ids"], [self.fuel.id])
+        self.assertEqual((first["ids_offset"], first["ids_limit"]), (0, 1))
+        second = self._get(ids=1, ids_limit=1, ids_offset=1).data
+        self.assertEqual(second["spending_ids"], [])
+
+        for bad in ({"ids_limit": 0}, {"ids_offset": -1}, {"ids": 1, "by": "owner"}):
+            self.assertEqual(self._get(**bad).status_code, 400, bad)
+
+    def test_by_owner_and_month_in_one_query(self):
+        params = {
+            "owners[]": [self.alice.id, self.bob.id],
+            "period": "yearly",
+            "by": "owner,month",
+        }
+        with self.assertNumQueries(4):
+            resp = self._get(**params)
+        data = resp.data
+        self.assertEqual(data["groups"], ["invest", "spending", "fun"])
+        self.assertEqual(len(data["results"]), 2 * 12)
+        by_key = {(r["owner"], r["month"]): r for r in data["results"]}
+        self.assertEqual(by_key[(self.alice.id, 6)]["fun"], 100.0)
+        self.assertEqual(by_key[(self.bob.id, 5)]["invest"], 100.0)
+        self.assertFalse(by_key[(self.bob.id, 6)]["available"])
+        self.assertEqual(by_key[(self.alice.id, 5)]["year"], 2025)
+
+        owners = self._get(**{**params, "by": "owner", "period": "monthly"}).data
+        self.assertEqual(
+            [(r["owner"], r["invest"]) for r in owners["results"]],
+            [(self.alice.id, 55.56), (self.bob.id, 100.0)],
+        )
+        self.assertEqual(self._get(by="day").status_code, 400)
+        self.assertEqual(
+            self._get(**{"owners[]": [999], "by": "owner"}).status_code, 404
+        )
+
+    def test_groups_come_from_data(self):
+        self.assertEqual(self._get().data["fun"], 11.11)
+        CategoryGroup.objects.filter(
+            group_set=category_groups.SPENDING_RATIO, category="alcohol"
+        ).update(name="spending")
+        # cache w procesie trzyma stare grupy do invalidate()
+        with self.assertNumQueries(3):
+            self.assertEqual(self._get().data["fun"], 11.11)
+
+        category_groups.invalidate()
+        data = self._get().data
+        self.assertEqual((data["spending"], data["fun"]), (44.44, 0.0))
+        self.assertEqual(data["spending_count"], 2)
+
+    def test_bar_shops_defaults_from_data(self):
+        CategoryGroup.objects.filter(
+            group_set=category_groups.BAR_SHOPS, name="expense", category="fuel"
+        ).delete()
+        category_groups.invalidate()
+        resp = self.client.get(
+            reverse("fetch-bar-shops"),
+            {
+                "owners[]": [self.alice.id],
+                "year": 2025,
+                "month": 5,
+                "transactionType": "expense",
+            },
+        )
+        # 10 alcohol + 100 investments_savings, bez 30 fuel
+        self.assertEqual(resp.json(), [{"shop": "S", "expense_sum": 110.0}])
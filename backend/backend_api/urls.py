@@ -18,10 +18,18 @@ from backend_api.views import (
     InvestViewSet,
     WalletSnapshotViewSet,
     DuplicateReceiptDebugView,
+    ItemConsistencyDebugView,
+    AnalyticsCacheStatsView,
+    RequestMetricsView,
+    ProfileListView,
+    ProfileDetailView,
+    ProfileDumpView,
     BalanceView,
+    BalanceSeriesView,
     SpendingRatioView,
     export_receipts_zip,
     import_receipts,
+    fetch_dashboard,
 )
 
 router = DefaultRouter()
@@ -57,11 +65,36 @@ urlpatterns = [
     path("fetch/bar-persons/", fetch_bar_persons, name="fetch-bar-persons"),
     path("fetch/bar-shops/", fetch_bar_shops, name="fetch-bar-shops"),
     path("fetch/pie-categories/", fetch_pie_categories, name="fetch-pie-categories"),
+    path("fetch/dashboard/", fetch_dashboard, name="fetch-dashboard"),
     path(
         "debug/receipts/duplicates/",
         DuplicateReceiptDebugView.as_view(),
         name="receipt-duplicates-debug",
     ),
+    path(
+        "debug/items/consistency/",
+        ItemConsistencyDebugView.as_view(),
+        name="item-consistency-debug",
+    ),
+    path(
+        "debug/cache/",
+        AnalyticsCacheStatsView.as_view(),
+        name="analytics-cache-debug",
+    ),
+    path("debug/metrics", RequestMetricsView.as_view(), name="request-metrics"),
+    path("debug/profiles/", ProfileListView.as_view(), name="profile-list"),
+    path(
+        "debug/profiles/<str:profile_id>.prof",
+        ProfileDumpView.as_view(),
+        name="profile-dump",
+    ),
+    path(
+        "debug/profiles/<str:profile_id>/",
+        ProfileDetailView.as_view(),
+        name="profile-detail",
+    ),
     path("balance/", BalanceView.as_view(), name="balance"),
+    path("balance/series/", BalanceSeriesView.as_view(), name="balance-series"),
+    path("balance/<int:item_id>/", BalanceView.as_view(), name="balance-patch"),
     path("spending-ratio/", SpendingRatioView.as_view(), name="spending-ratio"),
 ]
@@ -11,6 +11,15 @@ from .investment_views import (
     InvestViewSet,
     WalletSnapshotViewSet,
 )
-from .debug_views import DuplicateReceiptDebugView
-from .balance_views import BalanceView, SpendingRatioView
+from .debug_views import (
+    DuplicateReceiptDebugView,
+    ItemConsistencyDebugView,
+    AnalyticsCacheStatsView,
+    RequestMetricsView,
+    ProfileListView,
+    ProfileDetailView,
+    ProfileDumpView,
+)
+from .balance_views import BalanceView, BalanceSeriesView, SpendingRatioView
 from .import_export import export_receipts_zip, import_receipts
+from .dashboard_views import fetch_dashboard
@@ -1,9 +1,11 @@
 # src/api/views/balance_views.py
 
 from datetime import date
+from decimal import Decimal
 
 from django.db import transaction as db_transaction
-from django.db.models import Sum, F, Q, Count, FloatField
+from django.db.models import Sum, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 
 from rest_framework.views import APIView
@@ -12,8 +14,18 @@ from rest_framework import status
 
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 
-from backend_api.models import Item, Receipt, Person
+from backend_api.models import Item, ItemShare, Receipt, Person
 from backend_api.serializers import ReceiptSerializer, ItemSerializer
+from backend_api.services import (
+    balance,
+    category_groups,
+    periods,
+    receipts_saved,
+    spending_ratio,
+)
+from backend_api.services.response_cache import cached_response
+from backend_api.services.idempotency import idempotent
+from backend_api.services.query_budget import query_budget
 
 
 @extend_schema(
@@ -35,9 +47,15 @@ from backend_api.serializers import ReceiptSerializer, ItemSerializer
         OpenApiParameter(
             name="month",
             description="Miesiąc (1–12), dla którego pobieramy bilans",
-            required=True,
+            required=False,
             type=int,
         ),
+        OpenApiParameter(
+            name="period",
+            description="monthly (domyślnie) | yearly | quarterly | weekly | custom (from/to)",
+            required=False,
+            type=str,
+        ),
     ],
     responses={
         200: OpenApiResponse(
@@ -82,15 +100,16 @@ from backend_api.serializers import ReceiptSerializer, ItemSerializer
         500: OpenApiResponse(description="Internal server error"),
     },
 )
+@query_budget(3)
 class BalanceView(APIView):
+    @cached_response("balance", include_next=True)
     def get(self, request):
         # parsowanie parametrów
         owner_ids = request.query_params.getlist("owners[]")
         try:
             owners = [int(o) for o in owner_ids]
-            year = int(request.query_params["year"])
-            month = int(request.query_params["month"])
-        except (KeyError, ValueError):
+            period = periods.resolve(request.query_params)
+        except ValueError:
             return Response(
                 {
                     "detail": "Parametry owners[], year i month są wymagane i muszą być liczbami."
@@ -98,82 +117,52 @@ class BalanceView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # --- LICZENIE PRZYCHODÓW ---
-        income_share = 0
-        receipts_inc = Receipt.objects.filter(
-            transaction_type="income",
-            payment_date__year=year,
-            payment_date__month=month,
-        ).prefetch_related("items__owners")
-        for receipt in receipts_inc:
-            for item in receipt.items.all():
-                # jeżeli item należy do któregoś z właścicieli
-                item_owner_ids = [o.id for o in item.owners.all()]
-                common = set(item_owner_ids) & set(owners)
-                if common:
-                    share = float(item.value) / item.owners.count()
-                    # dodaj share tylko raz na item
-                    income_share += share
-
-        # --- LICZENIE WYDATKÓW ---
-        expense_share = 0
-        receipts_exp = Receipt.objects.filter(
-            transaction_type="expense",
-            payment_date__year=year,
-            payment_date__month=month,
-        ).prefetch_related("items__owners")
-        for receipt in receipts_exp:
-            for item in receipt.items.all():
-                item_owner_ids = [o.id for o in item.owners.all()]
-                common = set(item_owner_ids) & set(owners)
-                if common:
-                    share = float(item.value) / item.owners.count()
-                    expense_share += share
+        # --- PRZYCHODY I WYDATKI: jedno SUM ... GROUP BY po ledgerze udziałów ---
+        totals = dict(
+            ItemShare.objects.filter(period.q(), owner_id__in=owners)
+            .exclude(category="last_month_balance")
+            .values("transaction_type")
+            .annotate(total=Sum("share"))
+            .values_list("transaction_type", "total")
+        )
+        income_share = float(totals.get("income") or 0)
+        expense_share = float(totals.get("expense") or 0)
 
         computed_balance = round(income_share - expense_share, 2)
 
-        # wyliczamy next_year i next_month:
-        if month == 12:
-            next_year, next_month = year + 1, 1
-        else:
-            next_year, next_month = year, month + 1
-
-        next_month_date = date(next_year, next_month, 1)
+        # saldo zamykające okres zapisywane jest na pierwszy dzień po nim
+        saved_row = (
+            ItemShare.objects.filter(
+                transaction_type="income",
+                category="last_month_balance",
+                payment_date=period.end,
+                owner_id__in=owners,
+            )
+            .order_by("receipt_id")
+            .values("item_id", "share")
+            .first()
+        )
 
-        saved_qs = Receipt.objects.filter(
-            transaction_type="income",
-            items__category="last_month_balance",
-            payment_date=next_month_date,
-            items__owners__id__in=owners,
-        ).distinct()
-
-        if saved_qs.exists():
-            saved_item = saved_qs.first().items.get(category="last_month_balance")
-            owner_count = saved_item.owners.count()
-            saved_share = round(float(saved_item.value) / owner_count, 2)
-            return Response(
+        payload = {
+            "computed_balance": computed_balance,
+            "create": saved_row is None,
+            "year": period.year,
+            "month": period.month,
+        }
+        if period.kind != "monthly":
+            payload.update(period.describe())
+        if saved_row is not None:
+            saved_share = round(float(saved_row["share"]), 2)
+            payload.update(
                 {
-                    "computed_balance": computed_balance,
-                    "create": False,
-                    "year": year,
-                    "month": month,
                     "saved_balance": saved_share,
                     "difference": round(computed_balance - saved_share, 2),
-                    "saved_item_id": saved_item.id,
-                },
-                status=status.HTTP_200_OK,
-            )
-        else:
-            return Response(
-                {
-                    "computed_balance": computed_balance,
-                    "create": True,
-                    "year": year,
-                    "month": month,
-                },
-                status=status.HTTP_200_OK,
+                    "saved_item_id": saved_row["item_id"],
+                }
             )
+        return Response(payload, status=status.HTTP_200_OK)
 
+    @idempotent("balance")
     @db_transaction.atomic
     def post(self, request):
         year = request.data.get("year")
@@ -203,6 +192,7 @@ class BalanceView(APIView):
         )
 
         item = Item.objects.create(
+            receipt=receipt,
             save_date=date.today(),
             category="last_month_balance",
             value=value,
@@ -211,7 +201,7 @@ class BalanceView(APIView):
         )
         owners_qs = Person.objects.filter(payer=True)
         item.owners.set(owners_qs)
-        receipt.items.add(item)
+        receipts_saved([receipt.id])
 
         serializer = ReceiptSerializer(receipt)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -226,11 +216,120 @@ class BalanceView(APIView):
         item.value = value
         item.save(update_fields=["value", "save_date"])
 
-        receipt = Receipt.objects.filter(items=item).first()
-        serializer = ReceiptSerializer(receipt)
+        receipts_saved([item.receipt_id])
+        serializer = ReceiptSerializer(item.receipt)
         return Response(serializer.data)
 
 
+@extend_schema(
+    methods=["GET"],
+    parameters=[
+        OpenApiParameter(
+            name="owners[]",
+            description="Lista ID właścicieli (share liczona per właściciel)",
+            required=True,
+            type=int,
+            many=True,
+        ),
+        OpenApiParameter(
+            name="from",
+            description="Pierwszy miesiąc zakresu (YYYY-MM)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="to",
+            description="Ostatni miesiąc zakresu włącznie (YYYY-MM, max 60 miesięcy)",
+            required=True,
+            type=str,
+        ),
+    ],
+    responses={
+        200: OpenApiResponse(
+            description="{ from, to, months: [{ year, month, computed_balance, "
+            "create, saved_balance?, difference?, saved_item_id? }] }"
+        ),
+        400: OpenApiResponse(description="Bad request"),
+    },
+)
+@extend_schema(
+    methods=["POST"],
+    request=OpenApiResponse(
+        description="Body: { owners: [int], from: YYYY-MM, to: YYYY-MM, "
+        "values?: { YYYY-MM: Decimal } }"
+    ),
+    responses={
+        201: OpenApiResponse(
+            description="{ created: [{ year, month, value, receipt_id, item_id }] }"
+        ),
+        400: OpenApiResponse(description="Missing or invalid fields"),
+        404: OpenApiResponse(description="Person not found"),
+    },
+)
+@query_budget(3)
+class BalanceSeriesView(APIView):
+    """
+    Saldo wyliczone vs zapisane dla każdego miesiąca zakresu `from`–`to`
+    (jak GET /balance/ miesiąc po miesiącu, ale w dwóch zapytaniach).
+    POST zamyka cały zakres naraz: dopisuje brakujące salda
+    `last_month_balance` w jednej transakcji.
+    """
+
+    @cached_response("balance-series", include_next=True, resolver=periods.month_range)
+    def get(self, request):
+        params = request.query_params
+        try:
+            owners = list(dict.fromkeys(int(o) for o in params.getlist("owners[]")))
+            period = periods.month_range(params)
+        except ValueError:
+            owners = []
+        if not owners:
+            return Response(
+                {"detail": "Parametry owners[], from i to (YYYY-MM) są wymagane."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                "from": f"{period.start:%Y-%m}",
+                "to": f"{period.last_day:%Y-%m}",
+                "months": balance.series(owners, period),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def post(self, request):
+        data = request.data
+        raw_values = data.get("values") or {}
+        owners = (
+            data.getlist("owners") if hasattr(data, "getlist") else data.get("owners")
+        )
+        try:
+            owners = list(dict.fromkeys(int(o) for o in owners or []))
+            period = periods.month_range(data)
+            if not isinstance(raw_values, dict):
+                raise ValueError
+            values = {}
+            for key, value in raw_values.items():
+                month = periods.month_range({"from": key, "to": key}).start
+                values[(month.year, month.month)] = Decimal(str(value))
+        except (TypeError, ValueError, ArithmeticError):
+            owners = []
+        if not owners:
+            return Response(
+                {
+                    "detail": "Podaj owners, from i to (YYYY-MM); "
+                    "values jako { YYYY-MM: kwota }."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if Person.objects.filter(id__in=owners).count() != len(owners):
+            raise Http404("Nie ma takiej osoby.")
+
+        created = balance.close(owners, period, values)
+        return Response({"created": created}, status=status.HTTP_201_CREATED)
+
+
 @extend_schema(
     methods=["GET"],
     parameters=[
@@ -250,101 +349,125 @@ class BalanceView(APIView):
         OpenApiParameter(
             name="month",
             description="Miesiąc (1–12), dla którego pobieramy bilans",
-            required=True,
+            required=False,
+            type=int,
+        ),
+        OpenApiParameter(
+            name="period",
+            description="monthly (domyślnie) | yearly | quarterly | weekly | custom (from/to)",
+            required=False,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="by",
+            description="owner | month | owner,month – lista wyników zamiast jednego",
+            required=False,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="ids",
+            description="1 – dołącz stronę id pozycji każdej grupy (<grupa>_ids)",
+            required=False,
+            type=bool,
+        ),
+        OpenApiParameter(
+            name="ids_offset",
+            description="Początek strony id",
+            required=False,
+            type=int,
+        ),
+        OpenApiParameter(
+            name="ids_limit",
+            description="Rozmiar strony id (domyślnie 500, max 5000)",
+            required=False,
             type=int,
         ),
     ],
     responses={
         200: OpenApiResponse(
-            description="{ invest: float, spending: float, fun: float }"
+            description="{ invest: float, spending: float, fun: float, "
+            "<grupa>_count: int } albo { groups, by, results: [...] }"
         ),
         400: OpenApiResponse(description="Bad request"),
     },
 )
+@query_budget(4)
 class SpendingRatioView(APIView):
-    INVEST_CATS = ["investments_savings"]
-    SPENDING_CATS = [
-        "fuel",
-        "car_expenses",
-        "food_drinks",
-        "chemistry",
-        "flat_bills",
-    ]
-    FUN_CATS = [
-        "fastfood",
-        "alcohol",
-        "clothes",
-        "electronics_games",
-        "tickets_entrance",
-        "delivery",
-        "other_shopping",
-        "monthly_subscriptions",
-        "other_cyclical_expenses",
-        "other",
-    ]
+    """
+    Proporcje wydatków w grupach kategorii (CategoryGroup, zestaw
+    "spending-ratio"). Domyślnie dla pierwszego ownera; `by=owner` i/lub
+    `by=month` zwraca listę wyników dla wszystkich ownerów / miesięcy okresu.
+    Id pozycji (`ids=1`) tylko dla pojedynczego wyniku, stronicowane.
+    """
+
+    IDS_LIMIT = 500
+    BY_KEYS = {"owner", "month"}
 
+    @cached_response("spending-ratio")
     def get(self, request):
+        params = request.query_params
         # --- parse & validate ---
-        owner_ids = request.query_params.getlist(
-            "owners[]"
-        ) or request.query_params.getlist("owners")
+        owner_ids = params.getlist("owners[]") or params.getlist("owners")
         try:
-            owner_id = int(owner_ids[0])
-            year = int(request.query_params["year"])
-            month = int(request.query_params["month"])
-        except (IndexError, KeyError, ValueError):
+            owner_ids = list(dict.fromkeys(int(o) for o in owner_ids))
+            period = periods.resolve(params)
+        except ValueError:
+            owner_ids = []
+        if not owner_ids:
             return Response(
                 {"detail": "Podaj owner (jeden), year i month jako liczby."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        owner = get_object_or_404(Person, pk=owner_id)
-
-        # --- build base queryset for *this* owner ---
-        items = Item.objects.filter(
-            receipts__transaction_type="expense",
-            receipts__payment_date__year=year,
-            receipts__payment_date__month=month,
-            owners=owner,  # only this owner’s items
-        ).annotate(
-            owner_count=Count("owners", distinct=True),
-            share=F("value") / F("owner_count"),
-        )
+        by = {key for value in params.getlist("by") for key in value.split(",") if key}
+        if not by <= self.BY_KEYS:
+            return Response(
+                {"detail": "Parametr by: owner i/lub month."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        with_ids = params.get("ids") in ("1", "true")
+        try:
+            offset = int(params.get("ids_offset", 0))
+            limit = int(params.get("ids_limit", self.IDS_LIMIT))
+        except ValueError:
+            offset = limit = -1
+        if (
+            offset < 0
+            or not 1 <= limit <= spending_ratio.MAX_IDS_LIMIT
+            or (with_ids and by)
+        ):
+            return Response(
+                {
+                    "detail": "ids tylko bez by; ids_offset >= 0, "
+                    f"ids_limit 1–{spending_ratio.MAX_IDS_LIMIT}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not by:
+            owner_ids = owner_ids[:1]  # dawne API: liczy się pierwszy owner
+        if Person.objects.filter(id__in=owner_ids).count() != len(owner_ids):
+            raise Http404("Nie ma takiej osoby.")
 
-        # --- split by category ---
-        invest_qs = items.filter(category__in=self.INVEST_CATS)
-        spending_qs = items.filter(category__in=self.SPENDING_CATS)
-        fun_qs = items.filter(category__in=self.FUN_CATS)
-
-        # --- sum up shares ---
-        sums = {}
-        for key, qs in [
-            ("invest", invest_qs),
-            ("spending", spending_qs),
-            ("fun", fun_qs),
-        ]:
-            total = qs.aggregate(t=Sum("share", output_field=FloatField()))["t"] or 0
-            sums[key] = total
-
-        total_all = sums["invest"] + sums["spending"] + sums["fun"]
-        if total_all == 0:
+        # --- jedno zapytanie: Sum(Case(When(...))) per grupa ---
+        results = spending_ratio.ratios(owner_ids, period, by)
+        if by:
             return Response(
                 {
-                    "available": False,
-                    "detail": "Brak wydatków w tym okresie dla tego właściciela.",
+                    "groups": list(
+                        category_groups.groups(category_groups.SPENDING_RATIO)
+                    ),
+                    "by": sorted(by),
+                    "results": results,
                 },
                 status=status.HTTP_200_OK,
             )
 
-        # --- build response ---
-        result = {
-            "available": True,
-            "invest": round(sums["invest"] / total_all * 100, 2),
-            "spending": round(sums["spending"] / total_all * 100, 2),
-            "fun": round(sums["fun"] / total_all * 100, 2),
-            # optional: item IDs if you still need them
-            "invest_ids": list(invest_qs.values_list("id", flat=True)),
-            "spending_ids": list(spending_qs.values_list("id", flat=True)),
-            "fun_ids": list(fun_qs.values_list("id", flat=True)),
-        }
+        result = results[0]
+        if with_ids and result["available"]:
+            pages = spending_ratio.item_ids(owner_ids[0], period, offset, limit)
+            for name, page in pages.items():
+                result[f"{name}_ids"] = page
+            result["ids_offset"] = offset
+            result["ids_limit"] = limit
         return Response(result, status=status.HTTP_200_OK)
@@ -1,16 +1,32 @@
 # myapp/views/bar_views.py
-from collections import defaultdict
 from decimal import Decimal
 from django.http import JsonResponse
-from django.db.models import Sum, FloatField, Prefetch
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    Exists,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Sum,
+    Value,
+    When,
+)
 from rest_framework.decorators import api_view
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
-from backend_api.views.utils import (
-    get_query_params,
-    handle_error,
-    get_top_outlier_receipts,
+from backend_api.views.utils import handle_error
+from backend_api.services import (
+    category_groups,
+    columnar,
+    outliers,
+    owner_mask,
+    periods,
 )
-from backend_api.models import Receipt
+from backend_api.services.response_cache import cached_response
+from backend_api.services.query_budget import query_budget
+from backend_api.models import Item, Receipt
 from backend_api.serializers import PersonExpenseSerializer, ShopExpenseSerializer
 
 
@@ -28,10 +44,16 @@ from backend_api.serializers import PersonExpenseSerializer, ShopExpenseSerializ
         ),
         OpenApiParameter(
             name="period",
-            description="Wybrany okres (np. period=month).",
+            description="monthly | yearly | quarterly | weekly | custom (from/to)",
             required=True,
             type=str,
         ),
+        OpenApiParameter(
+            name="top",
+            description="Number of top outlier receipts per payer (0-50, default 3)",
+            required=False,
+            type=int,
+        ),
     ],
     responses={
         200: OpenApiResponse(description="List of expenses with receipts"),
@@ -39,27 +61,14 @@ from backend_api.serializers import PersonExpenseSerializer, ShopExpenseSerializ
         500: OpenApiResponse(description="Internal server error"),
     },
 )
+@query_budget(4)
 @api_view(["GET"])
+@cached_response("bar-persons")
 def fetch_bar_persons(request):
     try:
-        selected_year = int(request.GET.get("year"))
-    except (ValueError, TypeError):
-        return JsonResponse(
-            {"error": "Invalid or missing 'year' parameter"}, status=400
-        )
-
-    period = request.GET.get("period", "monthly")
-    if period == "month":
-        period = "monthly"
-
-    selected_month = None
-    if period == "monthly":
-        try:
-            selected_month = int(request.GET.get("month"))
-        except (ValueError, TypeError):
-            return JsonResponse(
-                {"error": "Invalid or missing 'month' parameter"}, status=400
-            )
+        period = periods.resolve(request.GET)
+    except periods.PeriodError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
     categories = request.GET.getlist("category[]")
     if not categories:
@@ -72,107 +81,102 @@ def fetch_bar_persons(request):
         return JsonResponse({"error": "Invalid 'owners[]' parameter"}, status=400)
 
     try:
-        time_filter = {"payment_date__year": selected_year}
-        if selected_month is not None:
-            time_filter["payment_date__month"] = selected_month
+        num_top = int(request.GET.get("top", outliers.DEFAULT_TOP))
+    except (ValueError, TypeError):
+        num_top = -1
+    if not 0 <= num_top <= outliers.MAX_TOP:
+        return JsonResponse(
+            {"error": f"Invalid 'top' parameter (0-{outliers.MAX_TOP})"}, status=400
+        )
 
-        receipts_qs = (
-            Receipt.objects.filter(
-                transaction_type="expense",
-                **time_filter,
+    if columnar.enabled():
+        try:
+            cols = columnar.PeriodColumns(period.start, period.end)
+            return JsonResponse(
+                cols.payer_sums(selected_owner_ids, categories, num_top),
+                safe=False,
+                status=200,
             )
-            .prefetch_related(Prefetch("items", to_attr="prefetched_items"))
-            .select_related("payer")
-        )
+        except columnar.MaskOverflow:
+            pass
 
-        if selected_owner_ids:
-            receipts_qs = receipts_qs.filter(payer__id__in=selected_owner_ids)
+    try:
+        # Jedno zapytanie GROUP BY paragon: warunkowe sumy pozycji "shared"
+        # (płatnik wśród >1 ownerów) i "not own" (płatnik spoza ownerów).
+        # Paragony bez liczonych pozycji też wracają – płatnik dostaje zera.
+        if owner_mask.usable(selected_owner_ids):
+            payer_owns = owner_mask.payer_is_owner()
+        else:
+            payer_owns = Exists(
+                Item.owners.through.objects.filter(
+                    item_id=OuterRef("items__id"), person_id=OuterRef("payer_id")
+                )
+            )
+        # LEFT JOIN: paragon bez pozycji daje NULL-e, które ~Q uznałoby za prawdę
+        counted = Q(items__id__isnull=False) & ~Q(items__category="last_month_balance")
+        if categories:
+            counted &= Q(items__category__in=categories)
+        shared = counted & payer_owns & Q(items__owner_count__gt=1)
+        not_own = counted & ~payer_owns
+
+        def conditional_sum(condition):
+            return Sum(
+                Case(
+                    When(condition, then="items__value"),
+                    default=Value(Decimal(0)),
+                    output_field=DecimalField(max_digits=20, decimal_places=2),
+                )
+            )
 
-        shared_expense_sums = defaultdict(
-            lambda: {"sum": Decimal(0), "receipt_ids": set(), "top_outliers": []}
+        receipts_qs = Receipt.objects.filter(
+            period.q(), transaction_type="expense", payer__isnull=False
         )
-        not_own_expense_sums = defaultdict(
-            lambda: {"sum": Decimal(0), "receipt_ids": set(), "top_outliers": []}
+        if selected_owner_ids:
+            receipts_qs = receipts_qs.filter(payer_id__in=selected_owner_ids)
+        rows = (
+            receipts_qs.values("id", "payer_id")
+            .annotate(
+                shared_sum=conditional_sum(shared),
+                shared_items=Count(Case(When(shared, then=1))),
+                not_own_sum=conditional_sum(not_own),
+                not_own_items=Count(Case(When(not_own, then=1))),
+            )
+            .order_by("payer_id", "id")
         )
 
-        all_payers = set()
-
-        for receipt in receipts_qs:
-            payer = receipt.payer
-            if payer is None:
-                continue
-            all_payers.add(payer)
-
-            for item in getattr(receipt, "prefetched_items", []):
-                if getattr(item, "category", None) == "last_month_balance":
-                    continue
-                if categories and getattr(item, "category", None) not in categories:
-                    continue
-
-                owners = list(item.owners.all())
-                owners_count = len(owners)
-
-                if owners_count > 1 and payer in owners:
-                    try:
-                        shared_expense_sums[payer]["sum"] += Decimal(item.value)
-                        shared_expense_sums[payer]["receipt_ids"].add(receipt.id)
-                    except (ValueError, TypeError):
-                        continue
-
-                if payer not in owners:
-                    try:
-                        not_own_expense_sums[payer]["sum"] += Decimal(item.value)
-                        not_own_expense_sums[payer]["receipt_ids"].add(receipt.id)
-                    except (ValueError, TypeError):
-                        continue
-
-        # outliers
-        for data in shared_expense_sums.values():
-            data["top_outliers"] = get_top_outlier_receipts(data["receipt_ids"])
-        for data in not_own_expense_sums.values():
-            data["top_outliers"] = get_top_outlier_receipts(data["receipt_ids"])
-
-        # dodaj brakujących payerów z zerami
-        for payer in all_payers:
-            if payer not in shared_expense_sums:
-                shared_expense_sums[payer] = {
-                    "sum": Decimal(0),
-                    "receipt_ids": set(),
-                    "top_outliers": [],
-                }
-            if payer not in not_own_expense_sums:
-                not_own_expense_sums[payer] = {
-                    "sum": Decimal(0),
-                    "receipt_ids": set(),
-                    "top_outliers": [],
-                }
-
-        sorted_shared_expenses = sorted(
-            shared_expense_sums.items(), key=lambda x: x[1]["sum"], reverse=True
-        )
-        sorted_not_own_expenses = sorted(
-            not_own_expense_sums.items(), key=lambda x: x[1]["sum"], reverse=True
-        )
+        buckets = {"shared_expenses": {}, "not_own_expenses": {}}
+        for row in rows:
+            for name, prefix in (
+                ("shared_expenses", "shared"),
+                ("not_own_expenses", "not_own"),
+            ):
+                data = buckets[name].setdefault(
+                    row["payer_id"], {"sum": Decimal(0), "receipt_ids": []}
+                )
+                if row[f"{prefix}_items"]:
+                    data["sum"] += row[f"{prefix}_sum"] or Decimal(0)
+                    data["receipt_ids"].append(row["id"])
+
+        # outliers – top-N per płatnik i koszyk jednym zapytaniem (ROW_NUMBER)
+        top = outliers.top_receipts(period, selected_owner_ids, categories, num_top)
+        top_by_bucket = {
+            "shared_expenses": top["shared"],
+            "not_own_expenses": top["not_own"],
+        }
 
         response_data = {
-            "shared_expenses": [
-                {
-                    "payer": payer.id,
-                    "expense_sum": float(data["sum"]),
-                    "receipt_ids": list(data["receipt_ids"]),
-                    "top_outlier_receipts": data["top_outliers"],
-                }
-                for payer, data in sorted_shared_expenses
-            ],
-            "not_own_expenses": [
+            name: [
                 {
-                    "payer": payer.id,
+                    "payer": payer,
                     "expense_sum": float(data["sum"]),
-                    "receipt_ids": list(data["receipt_ids"]),
-                    "top_outlier_receipts": data["top_outliers"],
+                    "receipt_ids": data["receipt_ids"],
+                    "top_outlier_receipts": top_by_bucket[name].get(payer, []),
                 }
-                for payer, data in sorted_not_own_expenses
-            ],
+                for payer, data in sorted(
+                    bucket.items(), key=lambda kv: kv[1]["sum"], reverse=True
+                )
+            ]
+            for name, bucket in buckets.items()
         }
         return JsonResponse(response_data, safe=False, status=200)
 
@@ -231,7 +235,7 @@ def fetch_bar_persons(request):
         ),
         OpenApiParameter(
             name="period",
-            description="Wybrany okres (np. period=month).",
+            description="monthly | yearly | quarterly | weekly | custom (from/to)",
             required=True,
             type=str,
         ),
@@ -242,30 +246,15 @@ def fetch_bar_persons(request):
         500: OpenApiResponse(description="Internal server error"),
     },
 )
+@query_budget(3)
 @api_view(["GET"])
+@cached_response("bar-shops")
 def fetch_bar_shops(request):
-    # --- 1) Rok i okres ---
+    # --- 1) Okres jako zakres dat [start, end) ---
     try:
-        selected_year = int(request.GET.get("year"))
-    except (TypeError, ValueError):
-        return handle_error(
-            "Brak lub niepoprawny 'year'", 400, "Niepoprawne parametry zapytania"
-        )
-
-    period = request.GET.get("period", "monthly")
-    if period == "month":  # zgodność wsteczna
-        period = "monthly"
-
-    selected_month = None
-    if period == "monthly":
-        try:
-            selected_month = int(request.GET.get("month"))
-        except (TypeError, ValueError):
-            return handle_error(
-                "Brak lub niepoprawny 'month' dla monthly",
-                400,
-                "Niepoprawne parametry zapytania",
-            )
+        period = periods.resolve(request.GET)
+    except periods.PeriodError as e:
+        return handle_error(e, 400, "Niepoprawne parametry zapytania")
 
     # --- 2) Owners (wymagane co najmniej 1) ---
     owners_param = request.GET.getlist("owners[]")
@@ -289,63 +278,39 @@ def fetch_bar_shops(request):
     # --- 4) Kategorie (czytaj category[] i/lub category) ---
     categories = request.GET.getlist("category[]") or request.GET.getlist("category")
 
-    # Domyślne zestawy kategorii (z Twojej listy)
-    expense_defaults = [
-        "fuel",
-        "car_expenses",
-        "fastfood",
-        "alcohol",
-        "food_drinks",
-        "chemistry",
-        "clothes",
-        "electronics_games",
-        "tickets_entrance",
-        "delivery",
-        "other_shopping",
-        "flat_bills",
-        "monthly_subscriptions",
-        "other_cyclical_expenses",
-        "investments_savings",
-        "other",
-    ]
-    income_defaults = [
-        "for_study",
-        "work_income",
-        "family_income",
-        "investments_income",
-        "money_back",
-        "other",
-    ]
-
     if not categories:
-        if tx_type == "expense":
-            categories = expense_defaults
-        elif tx_type == "income":
-            categories = income_defaults
+        # domyślne kategorie z CategoryGroup (zestaw "bar-shops")
+        defaults = category_groups.groups(category_groups.BAR_SHOPS)
+        if tx_type in ("expense", "income"):
+            categories = list(defaults.get(tx_type, ()))
         else:
             # oba typy → domyślne obie listy
-            categories = expense_defaults + income_defaults
-
-    # --- 5) Budowa filtra czasu + reszta ---
-    time_filter = {"payment_date__year": selected_year}
-    if selected_month is not None:
-        time_filter["payment_date__month"] = selected_month
+            categories = [c for cats in defaults.values() for c in cats]
 
+    # --- 5) Reszta filtrów ---
     categories = [c for c in categories if c != "last_month_balance"]
 
     try:
-        base_filter = {
-            **tx_filter,
-            **time_filter,
-            "items__category__in": categories,
-            "items__owners__id__in": selected_owner_ids,
-        }
-
-        # Agregacja po stronie bazy — tu prefetch_related nie pomaga
+        # Agregacja po pozycjach: Item → Receipt to jeden join; ownerzy
+        # z maski bitowej (bez joinu po M2M i bez dublowania sum)
+        items = Item.objects.filter(
+            period.q("receipt__payment_date"),
+            category__in=categories,
+            **{f"receipt__{key}": value for key, value in tx_filter.items()},
+        )
+        if owner_mask.usable(selected_owner_ids):
+            items = items.filter(owner_mask.has_owner(selected_owner_ids))
+        else:
+            items = items.filter(
+                Exists(
+                    Item.owners.through.objects.filter(
+                        item_id=OuterRef("pk"), person_id__in=selected_owner_ids
+                    )
+                )
+            )
         queryset = (
-            Receipt.objects.filter(**base_filter)
-            .values("shop")
-            .annotate(expense_sum=Sum("items__value", output_field=FloatField()))
+            items.values(shop=F("receipt__shop"))
+            .annotate(expense_sum=Sum("value", output_field=FloatField()))
             .order_by("-expense_sum")
         )
 
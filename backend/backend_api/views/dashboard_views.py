@@ -0,0 +1,318 @@
+# backend_api/views/dashboard_views.py
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.http import Http404, JsonResponse
+from rest_framework.decorators import api_view
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+
+from backend_api.models import ItemShare, Person, Receipt
+from backend_api.services import category_groups, outliers, spending_ratio
+from backend_api.services.response_cache import cached_response
+from backend_api.services.query_budget import query_budget
+from backend_api.views.utils import get_all_dates_in_month, handle_error
+
+
+class MonthDataset:
+    """
+    Wszystkie udziały z ledgera dla miesiąca (plus 1. dzień kolejnego – tam
+    leży zapisane saldo), pobrane jednym zapytaniem. Payloady dashboardu są
+    wyliczane z tych samych wierszy w pamięci; bar-persons dokłada jedno
+    zapytanie o paragony, bo liczy też pozycje bez udziałów.
+    """
+
+    FIELDS = (
+        "receipt_id",
+        "item_id",
+        "owner_id",
+        "share",
+        "payment_date",
+        "category",
+        "transaction_type",
+        "receipt__payer_id",
+        "receipt__shop",
+        "item__value",
+    )
+
+    def __init__(self, year: int, month: int):
+        self.year, self.month = year, month
+        self.start = date(year, month, 1)
+        self.next_start = (
+            date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        )
+        rows = list(
+            ItemShare.objects.filter(
+                payment_date__gte=self.start, payment_date__lte=self.next_start
+            ).values_list(*self.FIELDS)
+        )
+        self.rows = [r for r in rows if r[4] < self.next_start]
+        self.next_rows = [r for r in rows if r[4] == self.next_start]
+
+        # pozycje w miesiącu: item -> (receipt, payer, shop, value, category, tx, owners)
+        self.items = {}
+        for r in self.rows:
+            entry = self.items.setdefault(
+                (r[0], r[1]),
+                {
+                    "receipt_id": r[0],
+                    "payer_id": r[7],
+                    "shop": r[8],
+                    "value": r[9],
+                    "category": r[5],
+                    "transaction_type": r[6],
+                    "owners": set(),
+                },
+            )
+            entry["owners"].add(r[2])
+
+    def shares_of(self, owner_ids, transaction_type=None):
+        for r in self.rows:
+            if r[2] not in owner_ids or r[5] == "last_month_balance":
+                continue
+            if transaction_type and r[6] != transaction_type:
+                continue
+            yield r
+
+    # --- payloady w kształcie istniejących endpointów ---
+
+    def line_sums(self, owner_id):
+        # sumy w Decimal, zaokrąglone raz na końcu – jak prefix_sums.series
+        days = get_all_dates_in_month(self.year, self.month)
+        daily = {d: {"expense": Decimal(0), "income": Decimal(0)} for d in days}
+        for r in self.shares_of({owner_id}):
+            daily[r[4].isoformat()][r[6]] += r[3]
+        results, cum_exp, cum_inc = [], Decimal(0), Decimal(0)
+        for day in days:
+            cum_exp += daily[day]["expense"]
+            cum_inc += daily[day]["income"]
+            results.append(
+                {
+                    "day": day,
+                    "expense": round(float(cum_exp), 2),
+                    "income": round(float(cum_inc), 2),
+                }
+            )
+        return results
+
+    def bar_persons(self, owner_ids, num_top=outliers.DEFAULT_TOP):
+        """
+        Jak /fetch/bar-persons/: paragony wydatków z Receipt/Item (LEFT JOIN,
+        jedno zapytanie), więc liczą się też pozycje bez ownerów i paragony
+        bez pozycji. Ownerzy pozycji – z udziałów ledgera.
+        """
+        owners_of = defaultdict(set)
+        for r in self.rows:
+            owners_of[r[1]].add(r[2])
+
+        receipts = Receipt.objects.filter(
+            payment_date__gte=self.start,
+            payment_date__lt=self.next_start,
+            transaction_type="expense",
+            payer__isnull=False,
+        )
+        if owner_ids:
+            receipts = receipts.filter(payer_id__in=owner_ids)
+        rows = receipts.order_by("payer_id", "id").values_list(
+            "id", "payer_id", "items__id", "items__value", "items__category"
+        )
+
+        totals = defaultdict(Decimal)
+        buckets = {"shared_expenses": {}, "not_own_expenses": {}}
+        for receipt_id, payer, item_id, value, category in rows:
+            for bucket in buckets.values():
+                bucket.setdefault(payer, {"sum": Decimal(0), "receipt_ids": []})
+            if item_id is None:
+                continue
+            # ranking outlierów po sumie wszystkich pozycji paragonu
+            totals[receipt_id] += value
+            if category == "last_month_balance":
+                continue
+            owners = owners_of[item_id]
+            if len(owners) > 1 and payer in owners:
+                target = buckets["shared_expenses"][payer]
+            elif payer not in owners:
+                target = buckets["not_own_expenses"][payer]
+            else:
+                continue
+            target["sum"] += value
+            # wiersze jednego paragonu idą po kolei (ORDER BY payer, id)
+            if target["receipt_ids"][-1:] != [receipt_id]:
+                target["receipt_ids"].append(receipt_id)
+
+        result = {}
+        for name, bucket in buckets.items():
+            result[name] = [
+                {
+                    "payer": payer,
+                    "expense_sum": float(data["sum"]),
+                    "receipt_ids": data["receipt_ids"],
+                    "top_outlier_receipts": sorted(
+                        data["receipt_ids"], key=lambda rid: (-totals[rid], rid)
+                    )[:num_top],
+                }
+                for payer, data in sorted(
+                    bucket.items(), key=lambda kv: kv[1]["sum"], reverse=True
+                )
+            ]
+        return result
+
+    def bar_shops(self, owner_ids, transaction_type="expense"):
+        defaults = category_groups.groups(category_groups.BAR_SHOPS)
+        if transaction_type in ("expense", "income"):
+            categories = set(defaults.get(transaction_type, ()))
+        else:
+            categories = {c for cats in defaults.values() for c in cats}
+
+        shops = defaultdict(Decimal)
+        for item in self.items.values():
+            if transaction_type and item["transaction_type"] != transaction_type:
+                continue
+            if item["category"] not in categories:
+                continue
+            if not item["owners"] & owner_ids:
+                continue
+            shops[item["shop"]] += item["value"]
+        return [
+            {"shop": shop, "expense_sum": round(float(total), 2)}
+            for shop, total in sorted(shops.items(), key=lambda kv: kv[1], reverse=True)
+        ]
+
+    def pie_categories(self, owner_ids, transaction_type="expense"):
+        totals = defaultdict(Decimal)
+        for r in self.shares_of(owner_ids, transaction_type):
+            totals[r[5]] += r[3]
+        return [
+            {
+                "category": cat,
+                "expense_sum": round(float(total), 2),
+                "fill": f"var(--color-{cat})",
+            }
+            for cat, total in sorted(totals.items())
+        ]
+
+    def balance(self, owner_ids):
+        totals = defaultdict(Decimal)
+        for r in self.shares_of(owner_ids):
+            totals[r[6]] += r[3]
+        computed = round(float(totals["income"]) - float(totals["expense"]), 2)
+        payload = {
+            "computed_balance": computed,
+            "create": True,
+            "year": self.year,
+            "month": self.month,
+        }
+        saved = sorted(
+            (
+                r
+                for r in self.next_rows
+                if r[5] == "last_month_balance"
+                and r[6] == "income"
+                and r[2] in owner_ids
+            ),
+            key=lambda r: r[0],
+        )
+        if saved:
+            saved_share = round(float(saved[0][3]), 2)
+            payload.update(
+                {
+                    "create": False,
+                    "saved_balance": saved_share,
+                    "difference": round(computed - saved_share, 2),
+                    "saved_item_id": saved[0][1],
+                }
+            )
+        return payload
+
+    def spending_ratio(self, owner_id):
+        groups = category_groups.groups(category_groups.SPENDING_RATIO)
+        return spending_ratio.summarize(
+            groups, ((r[5], r[3]) for r in self.shares_of({owner_id}, "expense"))
+        )
+
+
+@extend_schema(
+    methods=["GET"],
+    parameters=[
+        OpenApiParameter(
+            name="owners[]",
+            description="Lista ID właścicieli (line-sums i spending-ratio biorą pierwszego)",
+            required=True,
+            type=int,
+            many=True,
+        ),
+        OpenApiParameter(
+            name="year", description="Wybrany rok", required=True, type=int
+        ),
+        OpenApiParameter(
+            name="month", description="Wybrany miesiąc", required=True, type=int
+        ),
+        OpenApiParameter(
+            name="top",
+            description="Liczba outlierów na płatnika w bar-persons (0-50, domyślnie 3)",
+            required=False,
+            type=int,
+        ),
+        OpenApiParameter(
+            name="transactionType",
+            description="Typ transakcji dla bar-shops i pie-categories (domyślnie expense)",
+            required=False,
+            type=str,
+        ),
+    ],
+    responses={
+        200: OpenApiResponse(
+            description=(
+                "{ line_sums, bar_persons, bar_shops, pie_categories, balance, "
+                "spending_ratio } – każdy w kształcie odpowiedniego endpointu"
+            )
+        ),
+        400: OpenApiResponse(description="Bad request"),
+        404: OpenApiResponse(description="Nie ma takiej osoby"),
+        500: OpenApiResponse(description="Internal server error"),
+    },
+)
+@query_budget(4)
+@api_view(["GET"])
+@cached_response("dashboard", include_next=True)
+def fetch_dashboard(request):
+    try:
+        year = int(request.GET.get("year"))
+        month = int(request.GET.get("month"))
+        owner_ids = [int(o) for o in request.GET.getlist("owners[]")]
+        if not owner_ids or not 1 <= month <= 12:
+            raise ValueError("Podaj owners[], year i month")
+    except (TypeError, ValueError) as e:
+        return handle_error(e, 400, "Niepoprawne parametry zapytania")
+
+    try:
+        num_top = int(request.GET.get("top", outliers.DEFAULT_TOP))
+    except (ValueError, TypeError):
+        num_top = -1
+    if not 0 <= num_top <= outliers.MAX_TOP:
+        return JsonResponse(
+            {"error": f"Invalid 'top' parameter (0-{outliers.MAX_TOP})"}, status=400
+        )
+
+    # jak /spending-ratio/: nieznany pierwszy owner → 404
+    if not Person.objects.filter(id=owner_ids[0]).exists():
+        raise Http404("Nie ma takiej osoby.")
+
+    tx_type = request.GET.get("transactionType", "expense")
+    owners = set(owner_ids)
+
+    try:
+        data = MonthDataset(year, month)
+        return JsonResponse(
+            {
+                "line_sums": data.line_sums(owner_ids[0]),
+                "bar_persons": data.bar_persons(owners, num_top),
+                "bar_shops": data.bar_shops(owners, tx_type),
+                "pie_categories": data.pie_categories(owners, tx_type),
+                "balance": data.balance(owners),
+                "spending_ratio": data.spending_ratio(owner_ids[0]),
+            },
+            status=200,
+        )
+    except Exception as e:
+        return handle_error(e, 500, "Error while building dashboard")
@@ -1,36 +1,155 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
 from rest_framework import status
-from django.db.models import Count
-from backend_api.models import Receipt
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from backend_api.services import (
+    fingerprints,
+    item_gc,
+    metrics,
+    profiling,
+    response_cache,
+)
+from backend_api.services.query_budget import query_budget
 
 
+@query_budget(1)
 class DuplicateReceiptDebugView(APIView):
     """
-    Widok debugujący sprawdzający zduplikowane paragony
-    na podstawie tych samych pól (bez ID).
+    Widok debugujący sprawdzający zduplikowane paragony – grupy o tym samym
+    odcisku treści (sklep, data, płatnik, typ i pozycje), po indeksie.
     """
 
     def get(self, request, *args, **kwargs):
-        # Znajdowanie zduplikowanych paragonów na podstawie pól innych niż ID
-        duplicates = (
-            Receipt.objects.values("payment_date", "payer", "shop", "transaction_type")
-            .annotate(count=Count("*"))
-            .filter(count__gt=1)
-        )
+        duplicates = fingerprints.duplicates()
 
-        if duplicates.exists():
+        if duplicates:
             return Response(
                 {
                     "status": "Duplikaty znalezione",
-                    "duplicates": list(duplicates),
+                    "duplicates": duplicates,
                 },
-                status=status.HTTP_200_OK
+                status=status.HTTP_200_OK,
             )
         else:
             return Response(
                 {
                     "status": "Brak duplikatów",
                 },
-                status=status.HTTP_200_OK
+                status=status.HTTP_200_OK,
+            )
+
+
+@query_budget(4)
+class ItemConsistencyDebugView(APIView):
+    """
+    Liczniki niespójności tabeli Item: sieroty (bez paragonu) i pozycje
+    bez właścicieli. Parametr `sample` ogranicza liczbę zwracanych
+    przykładowych id.
+    """
+
+    def get(self, request, *args, **kwargs):
+        try:
+            sample = max(0, min(int(request.query_params.get("sample", 20)), 500))
+        except ValueError:
+            return Response(
+                {"error": "Niepoprawny parametr sample"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(item_gc.report(sample=sample), status=status.HTTP_200_OK)
+
+
+@query_budget(0)
+class AnalyticsCacheStatsView(APIView):
+    """
+    Liczniki trafień/chybień cache'u endpointów analitycznych (per proces).
+    DELETE zeruje liczniki.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "enabled": getattr(settings, "ANALYTICS_CACHE_ENABLED", True),
+                "alias": getattr(settings, "ANALYTICS_CACHE_ALIAS", "default"),
+                "endpoints": response_cache.stats(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def delete(self, request, *args, **kwargs):
+        response_cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@query_budget(0)
+class RequestMetricsView(APIView):
+    """
+    Histogramy czasu, zapytań SQL i rozmiaru odpowiedzi per widok
+    (RequestMetricsMiddleware) w formacie tekstowym Prometheusa.
+    DELETE zeruje metryki.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(
+            metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    def delete(self, request, *args, **kwargs):
+        metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@query_budget(1)
+class ProfileListView(APIView):
+    """
+    Profile żądań zapisane przez ProfilingMiddleware (od najnowszego):
+    id, widok, status, liczba zapytań i podział czasu SQL/ORM/app.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "enabled": getattr(settings, "PROFILING_ENABLED", False),
+                "profiles": profiling.listing(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+@query_budget(1)
+class ProfileDetailView(APIView):
+    """Metadane profilu z podsumowaniem top-N funkcji (tekst pstats)."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id, *args, **kwargs):
+        meta = profiling.load(profile_id)
+        if meta is None:
+            return Response(
+                {"error": "Nie ma takiego profilu"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(meta, status=status.HTTP_200_OK)
+
+
+@query_budget(1)
+class ProfileDumpView(APIView):
+    """Surowy zrzut cProfile (`python -m pstats`, snakeviz)."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id, *args, **kwargs):
+        path = profiling.dump_path(profile_id)
+        if path is None:
+            return Response(
+                {"error": "Nie ma takiego profilu"}, status=status.HTTP_404_NOT_FOUND
             )
+        return FileResponse(
+            open(path, "rb"), as_attachment=True, filename=f"{profile_id}.prof"
+        )
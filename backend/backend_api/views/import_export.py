@@ -21,16 +21,19 @@ from rest_framework.parsers import MultiPartParser
 
 from drf_spectacular.utils import (
     extend_schema,
+    OpenApiParameter,
     OpenApiResponse,
 )
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import serializers
 
 from backend_api.models import Item, Person, Receipt
-
+from backend_api.services import fingerprints, receipts_saved
+from backend_api.services.idempotency import idempotent
+from backend_api.services.query_budget import query_budget
 
 EXPORT_BATCH_SIZE = 2000
-IMPORT_BATCH_SIZE = 200  # tu powstają też Itemy + M2M → lepiej mniejsze batch
+IMPORT_BATCH_SIZE = 200  # tu powstają też Itemy + ownerzy → lepiej mniejsze batch
 MAX_ERROR_SAMPLES = 50
 
 
@@ -50,6 +53,12 @@ class ImportResultSerializer(serializers.Serializer):
     inserted = serializers.IntegerField(help_text="Ile Receipt utworzono")
     errors = serializers.IntegerField(help_text="Ile linii NDJSON miało błędy")
     errorSamples = serializers.ListField(child=serializers.DictField(), required=False)
+    duplicates = serializers.IntegerField(
+        help_text="Ile paragonów to duplikaty (warn: zapisane, reject: pominięte)"
+    )
+    duplicateSamples = serializers.ListField(
+        child=serializers.DictField(), required=False
+    )
 
 
 # -------------------------
@@ -70,7 +79,7 @@ def _receipt_to_dict(r: Receipt) -> Dict:
                 "value": str(it.value),
                 "description": it.description,
                 "quantity": str(it.quantity),
-                "ownerIds": list(it.owners.values_list("id", flat=True)),
+                "ownerIds": [owner.id for owner in it.owners.all()],
             }
         )
 
@@ -101,10 +110,14 @@ class ImportResult:
     inserted: int = 0
     errors: int = 0
     error_samples: List[Dict] = None
+    duplicates: int = 0
+    duplicate_samples: List[Dict] = None
 
     def __post_init__(self):
         if self.error_samples is None:
             self.error_samples = []
+        if self.duplicate_samples is None:
+            self.duplicate_samples = []
 
 
 def _validate_receipt_payload(payload: Dict) -> Dict:
@@ -175,17 +188,54 @@ def _create_item_from_payload(item_payload: Dict) -> Item:
     )
 
 
-def _flush_batch(batch: List[Tuple[Receipt, List[Dict]]], result: ImportResult) -> None:
+# (nr linii, paragon, [(pozycja, ownerIds)])
+BatchEntry = Tuple[int, Receipt, List[Tuple[Item, List]]]
+
+
+def _skip_duplicates(
+    batch: List[BatchEntry], result: ImportResult, duplicates: str
+) -> List[BatchEntry]:
+    """Raportuje duplikaty partii (baza + wcześniejsze linie); reject je pomija."""
+    report = fingerprints.find(
+        [
+            fingerprints.of_data(
+                receipt.shop,
+                receipt.payment_date,
+                receipt.payer_id,
+                receipt.transaction_type,
+                [(item.category, item.value) for item, _ in items],
+            )
+            for _, receipt, items in batch
+        ]
+    )
+    rejected = set()
+    for entry in report:
+        index = entry.pop("index")
+        result.duplicates += 1
+        if len(result.duplicate_samples) < MAX_ERROR_SAMPLES:
+            sample = {"line": batch[index][0], "duplicateOf": entry["duplicate_of"]}
+            if "duplicate_of_index" in entry:
+                sample["duplicateOfLine"] = batch[entry["duplicate_of_index"]][0]
+            result.duplicate_samples.append(sample)
+        if duplicates == "reject":
+            rejected.add(index)
+    return [entry for index, entry in enumerate(batch) if index not in rejected]
+
+
+def _flush_batch(
+    batch: List[BatchEntry], result: ImportResult, duplicates: str = "allow"
+) -> None:
     with transaction.atomic():
-        for receipt_obj, items_payload in batch:
+        if duplicates != "allow":
+            batch = _skip_duplicates(batch, result, duplicates)
+        saved_ids: List[int] = []
+        for _, receipt_obj, items in batch:
             receipt_obj.save()
 
-            created_items: List[Item] = []
-            for ip in items_payload:
-                item = _create_item_from_payload(ip)
+            for item, owner_ids in items:
+                item.receipt = receipt_obj
                 item.save()
 
-                owner_ids = ip.get("ownerIds", [])
                 if owner_ids:
                     owners = list(Person.objects.filter(id__in=owner_ids))
                     if len(owners) != len(set(owner_ids)):
@@ -195,13 +245,11 @@ def _flush_batch(batch: List[Tuple[Receipt, List[Dict]]], result: ImportResult)
                         )
                     item.owners.set(owners)
 
-                created_items.append(item)
-
-            if created_items:
-                receipt_obj.items.set(created_items)
-
+            saved_ids.append(receipt_obj.id)
             result.inserted += 1
 
+        receipts_saved(saved_ids)
+
 
 def _iter_ndjson_lines(stream: io.BufferedReader) -> Iterator[Tuple[int, str]]:
     for idx, raw in enumerate(stream, start=1):
@@ -210,19 +258,25 @@ def _iter_ndjson_lines(stream: io.BufferedReader) -> Iterator[Tuple[int, str]]:
             yield idx, line
 
 
-def _import_ndjson_stream(stream: io.BufferedReader) -> ImportResult:
+def _import_ndjson_stream(
+    stream: io.BufferedReader, duplicates: str = "allow"
+) -> ImportResult:
     result = ImportResult()
-    batch: List[Tuple[Receipt, List[Dict]]] = []
+    batch: List[BatchEntry] = []
 
     for line_no, line in _iter_ndjson_lines(stream):
         try:
             payload = json.loads(line)
             payload = _validate_receipt_payload(payload)
             receipt_obj, items_payload = _payload_to_receipt_and_items(payload)
+            items = [
+                (_create_item_from_payload(ip), ip.get("ownerIds", []))
+                for ip in items_payload
+            ]
 
-            batch.append((receipt_obj, items_payload))
+            batch.append((line_no, receipt_obj, items))
             if len(batch) >= IMPORT_BATCH_SIZE:
-                _flush_batch(batch, result)
+                _flush_batch(batch, result, duplicates)
                 batch.clear()
 
         except Exception as e:
@@ -231,7 +285,7 @@ def _import_ndjson_stream(stream: io.BufferedReader) -> ImportResult:
                 result.error_samples.append({"line": line_no, "error": str(e)})
 
     if batch:
-        _flush_batch(batch, result)
+        _flush_batch(batch, result, duplicates)
         batch.clear()
 
     return result
@@ -252,6 +306,7 @@ def _import_ndjson_stream(stream: io.BufferedReader) -> ImportResult:
         500: OpenApiResponse(description="Internal server error"),
     },
 )
+@query_budget(3)
 @api_view(["GET"])
 def export_receipts_zip(request: HttpRequest):
     """
@@ -325,6 +380,15 @@ def export_receipts_zip(request: HttpRequest):
 
 @extend_schema(
     methods=["POST"],
+    parameters=[
+        OpenApiParameter(
+            name="duplicates",
+            description="allow | warn | reject – paragony o istniejącym odcisku "
+            "treści (domyślnie settings.RECEIPT_DUPLICATES)",
+            required=False,
+            type=str,
+        ),
+    ],
     request=ImportFileSerializer,
     responses={
         200: ImportResultSerializer,
@@ -334,12 +398,19 @@ def export_receipts_zip(request: HttpRequest):
 )
 @api_view(["POST"])
 @parser_classes([MultiPartParser])
+@idempotent("receipt-import")
 def import_receipts(request: HttpRequest):
     """
     POST /api/receipts/import
     multipart/form-data: file (.ndjson lub .zip z .ndjson)
+    ?duplicates=warn|reject – raportuje / pomija duplikaty treści
     """
     try:
+        try:
+            duplicates = fingerprints.mode(request.query_params.get("duplicates", ""))
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
+
         f = request.FILES.get("file")
         if not f:
             return HttpResponseBadRequest("Brak pliku w polu 'file'")
@@ -360,10 +431,10 @@ def import_receipts(request: HttpRequest):
                     else ndjson_files[0]
                 )
                 with zf.open(chosen) as nd_stream:
-                    result = _import_ndjson_stream(nd_stream)
+                    result = _import_ndjson_stream(nd_stream, duplicates)
 
         elif name.endswith(".ndjson"):
-            result = _import_ndjson_stream(f.file)
+            result = _import_ndjson_stream(f.file, duplicates)
 
         else:
             return HttpResponseBadRequest(
@@ -376,6 +447,8 @@ def import_receipts(request: HttpRequest):
                 "inserted": result.inserted,
                 "errors": result.errors,
                 "errorSamples": result.error_samples,
+                "duplicates": result.duplicates,
+                "duplicateSamples": result.duplicate_samples,
             },
             status=200,
         )
@@ -5,18 +5,22 @@ from backend_api.serializers import (
     InvestSerializer,
     WalletSnapshotSerializer,
 )
+from backend_api.services.query_budget import query_budget
 
 
+@query_budget(1)
 class InstrumentViewSet(viewsets.ModelViewSet):
     queryset = Instrument.objects.all()
     serializer_class = InstrumentSerializer
 
 
+@query_budget(1)
 class InvestViewSet(viewsets.ModelViewSet):
-    queryset = Invest.objects.all()
+    queryset = Invest.objects.select_related("instrument")
     serializer_class = InvestSerializer
 
 
+@query_budget(1)
 class WalletSnapshotViewSet(viewsets.ModelViewSet):
     queryset = WalletSnapshot.objects.all()
     serializer_class = WalletSnapshotSerializer
@@ -4,10 +4,26 @@ from django_filters.rest_framework import DjangoFilterBackend
 from backend_api.models import Item
 from backend_api.serializers import ItemSerializer
 from backend_api.filters import ItemFilter  # zakładamy, że masz filtr ItemFilter
+from backend_api.services import items_deleted, receipts_saved
+from backend_api.services.query_budget import query_budget
 
 
+@query_budget(2)
 class ItemViewSet(viewsets.ModelViewSet):
-    queryset = Item.objects.all()
+    queryset = Item.objects.prefetch_related("owners")
     serializer_class = ItemSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = ItemFilter
+
+    def perform_create(self, serializer):
+        item = serializer.save()
+        receipts_saved([item.receipt_id])
+
+    def perform_update(self, serializer):
+        old_receipt_id = serializer.instance.receipt_id
+        item = serializer.save()
+        # edycja pozycji zmienia udziały na jej paragonie (starym i nowym)
+        receipts_saved([old_receipt_id, item.receipt_id])
+
+    def perform_destroy(self, instance):
+        items_deleted([instance.id])
@@ -1,8 +1,10 @@
 from rest_framework import viewsets
 from backend_api.models import Person
 from backend_api.serializers import PersonSerializer
+from backend_api.services.query_budget import query_budget
 
 
+@query_budget(1)
 class PersonViewSet(viewsets.ModelViewSet):
     queryset = Person.objects.all()
     serializer_class = PersonSerializer
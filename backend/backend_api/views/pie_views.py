@@ -3,8 +3,11 @@ from django.http import JsonResponse
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from django.db.models import Sum
 from django.core.exceptions import ValidationError
-from backend_api.views.utils import get_query_params, handle_error
-from backend_api.models import Receipt, Item
+from backend_api.views.utils import handle_error
+from backend_api.services import columnar, periods
+from backend_api.services.response_cache import cached_response
+from backend_api.services.query_budget import query_budget
+from backend_api.models import ItemShare, MonthlyRollup
 from backend_api.serializers import CategoryPieExpenseSerializer
 
 
@@ -32,7 +35,7 @@ from backend_api.serializers import CategoryPieExpenseSerializer
         ),
         OpenApiParameter(
             name="period",
-            description="Wybrany okres (np. period=month).",
+            description="monthly | yearly | quarterly | weekly | custom (from/to)",
             required=True,
             type=str,
         ),
@@ -43,21 +46,13 @@ from backend_api.serializers import CategoryPieExpenseSerializer
         500: OpenApiResponse(description="Internal server error"),
     },
 )
+@query_budget(2)
 @api_view(["GET"])
+@cached_response("pie-categories")
 def fetch_pie_categories(request):
     try:
-        # --- 1) Rok + period (alias 'month' => 'monthly') ---
-        params_y = get_query_params(request, "year")
-        selected_year = params_y["year"]
-
-        period = request.GET.get("period", "monthly")
-        if period == "month":
-            period = "monthly"
-
-        selected_month = None
-        if period == "monthly":
-            params_m = get_query_params(request, "month")
-            selected_month = params_m["month"]
+        # --- 1) Okres jako zakres dat [start, end) ---
+        period = periods.resolve(request.GET)
 
         # --- 2) Typ transakcji ("" = oba) ---
         tx_type = request.GET.get("transactionType", "expense")
@@ -66,40 +61,38 @@ def fetch_pie_categories(request):
         owners_param = request.GET.getlist("owners[]")
         selected_owner_ids = [int(o) for o in owners_param] if owners_param else []
 
-        # --- 4) Zbuduj queryset paragonów ---
-        time_filter = {"payment_date__year": selected_year}
-        if selected_month is not None:
-            time_filter["payment_date__month"] = selected_month
+        # --- 4) Źródło: silnik kolumnowy, ledger (miesiąc) lub rollupy (rok) ---
+        category_totals = None
+        if columnar.enabled():
+            try:
+                cols = columnar.PeriodColumns(period.start, period.end)
+                category_totals = cols.category_totals(selected_owner_ids, tx_type)
+            except columnar.MaskOverflow:
+                pass
 
-        receipts = Receipt.objects.filter(**time_filter)
-        if tx_type in ("expense", "income"):
-            receipts = receipts.filter(transaction_type=tx_type)
-        if selected_owner_ids:
-            # zawężamy do paragonów, które mają pozycje z co najmniej jednym z wybranych ownerów
-            receipts = receipts.filter(items__owners__id__in=selected_owner_ids)
-        receipts = receipts.distinct()
+        if category_totals is None:
+            if period.kind != "yearly":
+                shares = ItemShare.objects.filter(period.q())
+                value_field = "share"
+            else:
+                # max 12 × ownerzy × kategorie wierszy zamiast skanu całego roku
+                shares = MonthlyRollup.objects.filter(year=period.year)
+                value_field = "total"
 
-        # --- 5) Pobierz pozycje tych paragonów z ownerami (zero N+1) ---
-        items = (
-            Item.objects.filter(receipts__in=receipts)
-            .prefetch_related("owners")
-            .distinct()
-        )
+            shares = shares.exclude(category="last_month_balance")
+            if tx_type in ("expense", "income"):
+                shares = shares.filter(transaction_type=tx_type)
+            if selected_owner_ids:
+                # tylko udziały wybranych ownerów
+                shares = shares.filter(owner_id__in=selected_owner_ids)
 
-        # --- 6) Sumowanie per kategoria z udziałem per owner (value / owners_count) ---
-        category_totals = {}
-        for item in items:
-            if item.category == "last_month_balance":
-                continue
-            owners_count = item.owners.count()
-            if owners_count == 0:
-                # brak ownerów - traktujemy jako 0 udziału
-                continue
-            share = float(item.value) / owners_count
-            cat = item.category
-            category_totals[cat] = category_totals.get(cat, 0.0) + share
+            # --- 5) SUM ... GROUP BY category ---
+            category_totals = {
+                row["category"]: float(row["total"])
+                for row in shares.values("category").annotate(total=Sum(value_field))
+            }
 
-        # --- 7) Serializacja do oczekiwanego formatu ---
+        # --- 6) Serializacja do oczekiwanego formatu ---
         aggregated_data = [
             {
                 "category": cat,
@@ -119,5 +112,7 @@ def fetch_pie_categories(request):
 
     except ValidationError as e:
         return handle_error(e, 400, "Invalid category")
+    except periods.PeriodError as e:
+        return handle_error(e, 400, "Invalid period")
     except Exception as e:
         return handle_error(e, 500, f"Error while fetching pie categories: {str(e)}")
@@ -1,32 +1,112 @@
 # myapp/views/receipt_views.py
 from rest_framework import generics
 from rest_framework.response import Response
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django_filters.rest_framework import DjangoFilterBackend
-from backend_api.models import Receipt
-from backend_api.serializers import ReceiptSerializer
+from backend_api.models import Item, Receipt
+from backend_api.serializers import ReceiptSerializer, ReceiptSummarySerializer
 from backend_api.filters import ReceiptFilter
+from backend_api.pagination import ReceiptKeysetPagination
+from backend_api.services import etags, fingerprints, receipts_deleted, versions
+from backend_api.services.idempotency import idempotent
+from backend_api.services.query_budget import query_budget
 
 
+@query_budget(4)
 class ReceiptListCreateView(generics.ListCreateAPIView):
-    queryset = Receipt.objects.all().order_by("payment_date").distinct()
+    queryset = Receipt.objects.all().order_by("payment_date", "id").distinct()
     serializer_class = ReceiptSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = ReceiptFilter
+    pagination_class = ReceiptKeysetPagination
 
+    @idempotent("receipt-create")
     def create(self, request, *args, **kwargs):
-        serializer = ReceiptSerializer(
-            data=request.data, many=isinstance(request.data, list)
-        )
+        try:
+            duplicates = fingerprints.mode(request.query_params.get("duplicates", ""))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        many = isinstance(request.data, list)
+        serializer = ReceiptSerializer(data=request.data, many=many)
         serializer.is_valid(raise_exception=True)
+
+        # duplikaty po odcisku treści: jedno zapytanie po indeksie
+        report = []
+        if duplicates != "allow":
+            attrs = serializer.validated_data if many else [serializer.validated_data]
+            report = fingerprints.find([fingerprints.of_attrs(a) for a in attrs])
+        if report and duplicates == "reject":
+            return Response(
+                {"detail": "Paragon już istnieje.", "duplicates": report}, status=409
+            )
+
         serializer.save()
-        return Response(serializer.data, status=201)
+        data = serializer.data
+        for entry in report:
+            receipt = data[entry.pop("index")] if many else data
+            receipt.update(entry)
+        return Response(data, status=201)
 
     def list(self, request, *args, **kwargs):
+        # ETag z globalnego tokenu wersji – jedno zapytanie zamiast pełnej listy
+        etag = etags.make_etag(
+            etags.fingerprint("receipts", request.query_params, versions.global_token())
+        )
+        if etags.matches(request, etag):
+            return etags.not_modified(etag)
+
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = ReceiptSerializer(queryset, many=True)
-        return Response(serializer.data)
+        if request.query_params.get("view") == "summary":
+            queryset = self.annotate_summary(queryset)
+            serializer_class = ReceiptSummarySerializer
+        else:
+            queryset = queryset.select_related("payer").prefetch_related(
+                "items__owners"
+            )
+            serializer_class = ReceiptSerializer
+
+        if self.paginator.is_requested(request):
+            page = self.paginate_queryset(queryset)
+            serializer = serializer_class(page, many=True)
+            return etags.tag(self.get_paginated_response(serializer.data), etag)
+
+        serializer = serializer_class(queryset, many=True)
+        return etags.tag(Response(serializer.data), etag)
 
+    @staticmethod
+    def annotate_summary(queryset):
+        # podzapytania po Item.receipt – filtry po items__* nie zawyżają sum
+        links = (
+            Item.objects.filter(receipt_id=OuterRef("pk"))
+            .order_by()
+            .values("receipt_id")
+        )
+        return queryset.annotate(
+            total=Coalesce(
+                Subquery(links.annotate(s=Sum("value")).values("s")),
+                0,
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+            item_count=Coalesce(Subquery(links.annotate(c=Count("id")).values("c")), 0),
+        )
 
+
+@query_budget(3)
 class ReceiptUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Receipt.objects.all()
+    queryset = Receipt.objects.prefetch_related("items__owners")
     serializer_class = ReceiptSerializer
+
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        # raport uzgodnienia pozycji: id utworzonych, zmienionych i usuniętych
+        response.data["item_changes"] = self.item_changes
+        return response
+
+    def perform_update(self, serializer):
+        serializer.save()
+        self.item_changes = serializer.item_changes
+
+    def perform_destroy(self, instance):
+        receipts_deleted([instance.id])
+        instance.delete()
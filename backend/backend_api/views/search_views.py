@@ -5,8 +5,10 @@ from django.utils.timezone import now
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from rest_framework.views import APIView
 from backend_api.models import RecentShop, Receipt, ItemPrediction
+from backend_api.services.query_budget import query_budget
 
 
+@query_budget(1)
 class RecentShopSearchView(APIView):
     def get(self, request, *args, **kwargs):
         query = request.GET.get("q", "").strip()
@@ -57,6 +59,7 @@ class RecentShopSearchView(APIView):
         return JsonResponse({"message": "All recent shops have been deleted."})
 
 
+@query_budget(1)
 class ItemPredictionSearchView(APIView):
     def get(self, request, *args, **kwargs):
         query = request.GET.get("q", "").strip().lower()
@@ -49,15 +49,3 @@ def convert_sum_to_linear(daily_sums, all_dates):
         current_sum += daily_sums.get(date, 0)
         linear_sum.append(current_sum)
     return linear_sum
-
-
-def get_top_outlier_receipts(receipt_ids, num_top=3):
-    from backend_api.models import (
-        Receipt,
-    )  # importuj lokalnie, aby uniknąć cyklicznych zależności
-
-    receipts = Receipt.objects.filter(id__in=receipt_ids).prefetch_related("items")
-    sorted_receipts = sorted(
-        receipts, key=lambda r: sum(item.value for item in r.items.all()), reverse=True
-    )
-    return [r.id for r in sorted_receipts[:num_top]]
@@ -35,7 +35,7 @@ LOGGING = {
     "disable_existing_loggers": False,
     "handlers": {
         "file": {
-            "level": "ERROR",
+            "level": "WARNING",
             "class": "logging.FileHandler",
             "filename": "django_error.log",
         },
@@ -46,6 +46,12 @@ LOGGING = {
             "level": "ERROR",
             "propagate": True,
         },
+        # RequestMetricsMiddleware – żądania dłuższe niż SLOW_REQUEST_MS
+        "backend_api.slow_requests": {
+            "handlers": ["file"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
 }
 
@@ -71,6 +77,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # pierwszy – mierzy całe żądanie, łącznie z pozostałymi middleware
+    "backend_api.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -79,6 +87,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    # po AuthenticationMiddleware – sprawdza request.user.is_staff
+    "backend_api.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "expense_tracker.urls"
@@ -113,6 +123,56 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Cache odpowiedzi /fetch/*, balance/ i spending-ratio/ (klucz zawiera wersję
+    # miesiąca, więc zapis paragonu unieważnia wpisy bez ręcznego czyszczenia).
+    # Przy kilku workerach można przełączyć na cache plikowy:
+    #   "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    #   "LOCATION": BASE_DIR / "cache" / "analytics",
+    "analytics": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "analytics",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+
+ANALYTICS_CACHE_ENABLED = True
+ANALYTICS_CACHE_ALIAS = "analytics"
+ANALYTICS_CACHE_TIMEOUT = 60 * 60 * 24
+# "sql" – agregacje w bazie; "numpy" – kolumnowy silnik w pamięci
+# (services/columnar.py) dla line-sums, pie-categories i bar-persons
+ANALYTICS_ENGINE = "sql"
+# grupy kategorii (CategoryGroup) cache'owane w procesie przez tyle sekund
+CATEGORY_GROUPS_TTL = 300
+# duplikaty paragonów (ten sam odcisk treści) przy tworzeniu i imporcie:
+# "allow" | "warn" | "reject"; parametr ?duplicates= nadpisuje per request
+RECEIPT_DUPLICATES = "allow"
+# jak długo pamiętamy odpowiedź dla nagłówka Idempotency-Key (sekundy)
+IDEMPOTENCY_TTL = 60 * 60 * 24
+# klucz "w toku" starszy niż tyle sekund (proces padł) przejmuje ponowienie
+IDEMPOTENCY_CLAIM_TIMEOUT = 60
+
+# Metryki żądań (backend_api/middleware.py) – /api/debug/metrics
+REQUEST_METRICS_ENABLED = True
+# żądania wolniejsze niż próg (ms) logowane z najdłuższymi zapytaniami SQL;
+# None wyłącza log
+SLOW_REQUEST_MS = 500
+SLOW_REQUEST_TOP_SQL = 5
+
+# Profilowanie na życzenie (staff + ?_profile=1 albo nagłówek X-Profile: 1);
+# profile w buforze cyklicznym PROFILING_DIR, podgląd: /api/debug/profiles/
+PROFILING_ENABLED = False
+PROFILING_DIR = BASE_DIR / "profiles"
+PROFILING_KEEP = 20
+PROFILING_TOP = 30
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -189,4 +249,5 @@ SPECTACULAR_SETTINGS = {
 
 CRONJOBS = [
     ("0 0 * * *", "backend_api.cron.update_instruments_prices"),
+    ("30 3 * * *", "backend_api.cron.collect_orphan_items"),
 ]
@@ -429,9 +429,13 @@ export interface SpendingRatioResponse {
     spending: number;
     invest: number;
     fun: number;
-    invest_ids: number[];
-    spending_ids: number[];
-    fun_ids: number[];
+    invest_count: number;
+    spending_count: number;
+    fun_count: number;
+    // tylko przy ids=1 (strona ids_offset / ids_limit)
+    invest_ids?: number[];
+    spending_ids?: number[];
+    fun_ids?: number[];
 }
 
 export const fetchGetBalance = async (filters: Params) => {
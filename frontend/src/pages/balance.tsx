@@ -62,36 +62,38 @@ const Balance: React.FC = () => {
                 year: summaryFilters.year,
                 month: summaryFilters.month,
                 owners: summaryFilters.owners,
+                ids: 1,
+                ids_limit: 5000,
             } as Params),
         enabled: hasFilters,
     });
 
     // after you have balanceTab and ratioData:
     const investItemsQuery = useQuery<Item[], Error>({
-        queryFn: () => fetchGetItemsByID({ id: ratioData!.invest_ids }),
+        queryFn: () => fetchGetItemsByID({ id: ratioData!.invest_ids! }),
         queryKey: ["items", "invest", ratioData?.invest_ids],
         enabled:
             balanceTab === "pozycje" &&
             Array.isArray(ratioData?.invest_ids) &&
-            ratioData!.invest_ids.length > 0,
+            ratioData!.invest_ids!.length > 0,
     });
 
     const spendingItemsQuery = useQuery<Item[], Error>({
-        queryFn: () => fetchGetItemsByID({ id: ratioData!.spending_ids }),
+        queryFn: () => fetchGetItemsByID({ id: ratioData!.spending_ids! }),
         queryKey: ["items", "spending", ratioData?.spending_ids],
         enabled:
             balanceTab === "pozycje" &&
             Array.isArray(ratioData?.spending_ids) &&
-            ratioData!.spending_ids.length > 0,
+            ratioData!.spending_ids!.length > 0,
     });
 
     const funItemsQuery = useQuery<Item[], Error>({
-        queryFn: () => fetchGetItemsByID({ id: ratioData!.fun_ids }),
+        queryFn: () => fetchGetItemsByID({ id: ratioData!.fun_ids! }),
         queryKey: ["items", "fun", ratioData?.fun_ids],
         enabled:
             balanceTab === "pozycje" &&
             Array.isArray(ratioData?.fun_ids) &&
-            ratioData!.fun_ids.length > 0,
+            ratioData!.fun_ids!.length > 0,
     });
 
     const updateMutation = useMutation<BalanceResponse>({
@@ -294,7 +296,7 @@ const Balance: React.FC = () => {
                                 <AccordionItem value="invest">
                                     <AccordionTrigger>
                                         Inwestycje (
-                                        {ratioData?.invest_ids.length})
+                                        {ratioData?.invest_count})
                                     </AccordionTrigger>
                                     <AccordionContent>
                                         {investItemsQuery.isLoading ? (
@@ -330,7 +332,7 @@ const Balance: React.FC = () => {
                                 <AccordionItem value="spending">
                                     <AccordionTrigger>
                                         Wydatki (
-                                        {ratioData?.spending_ids.length})
+                                        {ratioData?.spending_count})
                                     </AccordionTrigger>
                                     <AccordionContent>
                                         {spendingItemsQuery.isLoading ? (
@@ -366,7 +368,7 @@ const Balance: React.FC = () => {
                                 {/* Fun */}
                                 <AccordionItem value="fun">
                                     <AccordionTrigger>
-                                        Fun ({ratioData?.fun_ids.length})
+                                        Fun ({ratioData?.fun_count})
                                     </AccordionTrigger>
                                     <AccordionContent>
                                         {funItemsQuery.isLoading ? (